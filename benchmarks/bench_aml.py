@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+AML benchmark - parsing a binary table vs. parsing its disassembly
+
+No assembler ships with the project, so the AML is built from the
+namespace of a parsed DSL file: every object is encoded with its opcode
+and each method gets a body of ordinary statements (If, Store, Add,
+method calls), padded until the table is about 1/7 of the DSL size, the
+usual ratio of iasl output to its input. The namespace read back from the
+AML is checked against the one from the DSL. With --aml, an existing compiled
+table (e.g. tests/data/DSDT.aml for tests/data/DSDT.dsl) is used instead.
+The legacy parser, which only reads DSL, is timed on the DSL file.
+
+Usage: python -m benchmarks.bench_aml [file.dsl] [--aml file.aml] [--repeat N] [--ratio R]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.acpi_parser import ACPIParser
+from core.aml_reader import TABLE_HEADER, TABLE_HEADER_SIZE
+from benchmarks.legacy_parser import LegacyACPIParser
+
+
+DEFAULT_DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+# If (LEqual (Arg0, One)) { Store (0x1234, Local0) } Add (Local0, 0x10, Local1)
+METHOD_STATEMENTS = (
+    bytes([0xA0, 0x09, 0x93, 0x68, 0x01, 0x70, 0x0B, 0x34, 0x12, 0x60])
+    + bytes([0x72, 0x60, 0x0A, 0x10, 0x61])
+)
+
+
+def pkg_length(body_size):
+    """Encode the PkgLength of a package whose contents are body_size bytes"""
+    for count in range(4):
+        total = body_size + 1 + count
+        if count == 0 and total < 0x40:
+            return bytes([total])
+        if count and total < 1 << (4 + 8 * count):
+            return bytes([(count << 6) | (total & 0x0F)]) + (total >> 4).to_bytes(count, 'little')
+    raise ValueError("package too large")
+
+
+def name_seg(name):
+    return name.ljust(4, '_').encode('ascii')
+
+
+def eisa_id(text):
+    """Compress PNP0A08 style IDs into their dword encoding"""
+    value = ((ord(text[0]) - 0x40) << 26 | (ord(text[1]) - 0x40) << 21
+             | (ord(text[2]) - 0x40) << 16 | int(text[3:], 16))
+    return int.from_bytes(value.to_bytes(4, 'big'), 'little')
+
+
+def encode_value(value):
+    """Encode a _HID/_ADR value the way iasl would"""
+    if value in (None, 'Zero'):
+        return b'\x00'
+    if value == 'One':
+        return b'\x01'
+    if value == 'Ones':
+        return b'\xFF'
+    if value.startswith('0x'):
+        number = int(value, 16)
+        if number <= 0xFF:
+            return b'\x0A' + number.to_bytes(1, 'little')
+        if number <= 0xFFFF:
+            return b'\x0B' + number.to_bytes(2, 'little')
+        if number <= 0xFFFFFFFF:
+            return b'\x0C' + number.to_bytes(4, 'little')
+        return b'\x0E' + number.to_bytes(8, 'little')
+    if len(value) == 7 and value[:3].isalpha() and value[:3].isupper():
+        try:
+            return b'\x0C' + struct.pack('<I', eisa_id(value))
+        except ValueError:
+            pass
+    return b'\x0D' + value.encode('ascii', 'replace') + b'\x00'
+
+
+def encode_node(node, method_body):
+    """Encode a namespace node and its children as AML"""
+    children = b''.join(encode_node(child, method_body) for child in node.children.values())
+    seg = name_seg(node.name)
+    kind = node.kind
+
+    if kind == 'Method':
+        body = seg + b'\x01' + children + method_body
+        return b'\x14' + pkg_length(len(body)) + body
+    if kind == 'Name':
+        value = None
+        if node.parent is not None and node.name in ('_HID', '_ADR'):
+            value = node.parent.hid if node.name == '_HID' else node.parent.adr
+        return b'\x08' + seg + encode_value(value)
+    if kind == 'OperationRegion':
+        return b'\x5B\x80' + seg + b'\x00\x0C\x00\x00\x00\xE0\x0B\x00\x01'
+    if kind == 'Device':
+        body = seg + children
+        return b'\x5B\x82' + pkg_length(len(body)) + body
+    if kind == 'Processor':
+        body = seg + b'\x00\x10\x04\x00\x00\x06' + children
+        return b'\x5B\x83' + pkg_length(len(body)) + body
+    if kind == 'PowerResource':
+        body = seg + b'\x00\x00\x00' + children
+        return b'\x5B\x84' + pkg_length(len(body)) + body
+    if kind == 'ThermalZone':
+        body = seg + children
+        return b'\x5B\x85' + pkg_length(len(body)) + body
+    declaration = b'\x15' + seg + b'\x00\x00' if kind == 'External' else b''
+    if children:
+        body = seg + children
+        return declaration + b'\x10' + pkg_length(len(body)) + body
+    return declaration
+
+
+def build_table(namespace, method_body):
+    """Build a DSDT from the namespace tree"""
+    body = b''.join(encode_node(child, method_body) for child in namespace.root.children.values())
+    length = TABLE_HEADER_SIZE + len(body)
+    header = TABLE_HEADER.pack(b'DSDT', length, 2, 0, b'BENCH ', b'BENCHTBL', 1, b'PY  ', 1)
+    return header + body
+
+
+def namespace_shape(parser):
+    """Paths and kinds of the objects the parser declared
+
+    Scope and External only refer to objects, and objects declared inside
+    methods are not part of the namespace read from AML.
+    """
+    return {node.path: node.kind for node in parser.namespace.nodes.values()
+            if node.offset is not None and node.kind not in ('Scope', 'External')
+            and not _in_method(node)}
+
+
+def _in_method(node):
+    node = node.parent
+    while node is not None:
+        if node.kind == 'Method':
+            return True
+        node = node.parent
+    return False
+
+
+def best_of(filepath, repeat, use_mmap=False, parser_class=ACPIParser):
+    """Best parse-plus-detect time of several runs and the last parser"""
+    best = None
+    parser = None
+    for _ in range(repeat):
+        parser = parser_class()
+        start = time.perf_counter()
+        if parser_class is LegacyACPIParser:
+            ok = parser.parse_file(filepath)
+        else:
+            ok = parser.parse_file(filepath, use_mmap=use_mmap)
+        if not ok:
+            raise SystemExit(f"failed to parse {filepath}")
+        parser.get_device_paths()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+        if hasattr(parser, 'close'):
+            parser.close()
+    return best, parser
+
+
+def main(argv=None):
+    """Run the AML benchmark"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--aml', help='compiled AML of file to time instead of a built table')
+    arg_parser.add_argument('--repeat', type=int, default=10)
+    arg_parser.add_argument('--ratio', type=float, default=7.0,
+                            help='DSL size / AML size to pad method bodies to')
+    args = arg_parser.parse_args(argv)
+
+    source = ACPIParser()
+    if not source.parse_file(args.file):
+        return 1
+    dsl_size = os.path.getsize(args.file)
+
+    if args.aml:
+        with open(args.aml, 'rb') as f:
+            table = f.read()
+    else:
+        # Pad method bodies so the table has the requested size ratio
+        bare = build_table(source.namespace, b'')
+        method_count = sum(1 for node in source.namespace.nodes.values() if node.kind == 'Method')
+        spare = max(0, dsl_size / args.ratio - len(bare))
+        repeats = int(spare / len(METHOD_STATEMENTS) / max(method_count, 1))
+        table = build_table(source.namespace, METHOD_STATEMENTS * repeats)
+
+    with tempfile.TemporaryDirectory() as directory:
+        aml_path = os.path.join(directory, 'dsdt.aml')
+        with open(aml_path, 'wb') as f:
+            f.write(table)
+
+        print(f"DSL: {args.file} ({dsl_size / 1024:.1f} KB), "
+              f"AML: {len(table) / 1024:.1f} KB, best of {args.repeat}")
+        print(f"{'input':<12}{'time (ms)':>12}{'devices':>10}{'methods':>10}{'nodes':>8}")
+        results = {}
+        for label, path, use_mmap, parser_class in (
+                ('legacy dsl', args.file, False, LegacyACPIParser),
+                ('dsl', args.file, False, ACPIParser),
+                ('aml', aml_path, False, ACPIParser),
+                ('aml (mmap)', aml_path, True, ACPIParser)):
+            elapsed, parser = best_of(path, args.repeat, use_mmap, parser_class)
+            results[label] = (elapsed, parser)
+            nodes = len(parser.namespace) if hasattr(parser, 'namespace') else '-'
+            print(f"{label:<12}{elapsed * 1000:>12.2f}{len(parser.devices):>10}"
+                  f"{len(parser.methods):>10}{nodes:>8}")
+
+        dsl_parser = results['dsl'][1]
+        aml_parser = results['aml'][1]
+        print(f"Speedup: {results['dsl'][0] / results['aml'][0]:.2f}x over dsl, "
+              f"{results['legacy dsl'][0] / results['aml'][0]:.2f}x over legacy dsl")
+
+        dsl_shape = namespace_shape(dsl_parser)
+        aml_shape = namespace_shape(aml_parser)
+        missing = sorted(set(dsl_shape) - set(aml_shape))
+        extra = sorted(set(aml_shape) - set(dsl_shape))
+        same_paths = dsl_parser.get_device_paths() == aml_parser.get_device_paths()
+        print(f"Namespace match: {not missing and not extra} "
+              f"(missing {len(missing)}, extra {len(extra)}), "
+              f"detected paths match: {same_paths}")
+        for path in (missing + extra)[:10]:
+            print(f"  {path}")
+        return 0 if same_paths and not missing and not extra else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Export benchmark - streaming JSON/NDJSON writer vs. export_to_dict + json.dump
+
+Parses the bundled DSDT and a generated machine (see synthetic_dsdt),
+then exports each in every format. Each export is timed, then run again
+under tracemalloc for the peak memory it allocates (the parse is not
+traced). The old path builds the whole export dict and dumps it with
+indent=2, so its peak grows with the table; the streaming writer's
+should stay flat.
+
+Usage: python -m benchmarks.bench_export [file.dsl] [--devices N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.acpi_parser import ACPIParser
+from core.export import export_file
+from benchmarks.synthetic_dsdt import SyntheticMachine, write_machine
+
+
+DEFAULT_DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+# (label, file name) of the streamed exports
+STREAMED = (
+    ('stream json', 'export.json'),
+    ('stream json.gz', 'export.json.gz'),
+    ('stream ndjson', 'export.ndjson'),
+    ('stream ndjson.gz', 'export.ndjson.gz'),
+)
+
+
+def dict_export(parser, path):
+    """The previous export path: one dict, dumped with indent=2"""
+    data = parser.export_to_dict()
+    data['paths'] = parser.get_device_paths()
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def measure(run):
+    """Seconds run() takes, and the peak bytes it allocates in a second, traced run"""
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def report(label, path, directory):
+    """Export one input every way and print a table"""
+    parser = ACPIParser()
+    parser.parse_file(path)
+    parser.get_device_paths()
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"{label}: {size_mb:.1f} MB, {len(parser.devices)} devices, "
+          f"{len(parser.methods)} methods, {len(parser.namespace)} nodes")
+    print(f"{'export':<18}{'time (ms)':>11}{'peak (MB)':>11}{'file (MB)':>11}")
+
+    runs = [('dict + indent=2', 'dict.json', lambda output: dict_export(parser, output))]
+    runs += [(name, filename, lambda output: export_file(parser, output))
+             for name, filename in STREAMED]
+    for name, filename, run in runs:
+        output = os.path.join(directory, filename)
+        elapsed, peak = measure(lambda: run(output))
+        print(f"{name:<18}{elapsed * 1000:>11.1f}{peak / (1024 * 1024):>11.2f}"
+              f"{os.path.getsize(output) / (1024 * 1024):>11.2f}")
+        os.remove(output)
+    print()
+
+
+def main(argv=None):
+    """Run the export benchmark"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--devices', type=int, default=20000,
+                            help='filler devices of the generated machine')
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        report(Path(args.file).name, args.file, directory)
+        machine = SyntheticMachine(devices=args.devices)
+        table = write_machine(Path(directory) / 'machine', machine)[0]
+        report(f"synthetic ({args.devices} devices)", table, directory)
+
+
+if __name__ == "__main__":
+    main()
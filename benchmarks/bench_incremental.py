@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Incremental re-parse benchmark - refresh() after an edit vs. a full parse
+
+Simulates saving a DSL file from an editor: each round adds one Name()
+declaration at a different place in the file, writes it, and updates a
+parser with refresh(). The result is checked against a fresh full parse
+of the same file (namespace, records and detected paths).
+
+Usage: python -m benchmarks.bench_incremental [file.dsl] [--edits N]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.acpi_parser import ACPIParser
+
+
+DEFAULT_DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+
+def parse_state(parser):
+    """Everything refresh() has to keep equal to a full parse"""
+    nodes = {(node.path, node.kind, node.offset, node.hid, node.adr)
+             for node in parser.namespace.nodes.values()}
+    return (nodes, list(parser.devices), list(parser.methods), list(parser.scopes),
+            list(parser.processors), parser.get_device_paths())
+
+
+def edit_positions(content, count):
+    """Offsets just after count opening-brace lines spread over the file"""
+    lines = [match.end() for match in re.finditer(r'\{\n', content)]
+    step = max(len(lines) // count, 1)
+    return lines[step // 2::step][:count]
+
+
+def main(argv=None):
+    """Run the incremental re-parse benchmark"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--edits', type=int, default=20)
+    args = arg_parser.parse_args(argv)
+
+    with open(args.file, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'dsdt.dsl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        parser = ACPIParser(track_blocks=True)
+        if not parser.parse_file(path):
+            return 1
+        parser.get_device_paths()
+
+        print(f"File: {args.file} ({len(content) / 1024:.0f} KB), "
+              f"{len(parser.blocks)} top-level blocks")
+        print(f"{'edit':>5}{'offset':>10}{'mode':>13}{'blocks':>8}"
+              f"{'refresh (ms)':>14}{'full (ms)':>11}")
+
+        incremental = []
+        full = []
+        mismatches = 0
+        # Later offsets first, so earlier ones stay valid as the file grows
+        for number, offset in enumerate(reversed(edit_positions(content, args.edits)), 1):
+            content = f"{content[:offset]}Name (BN{number:02d}, One)\n{content[offset:]}"
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+            start = time.perf_counter()
+            summary = parser.refresh()
+            refresh_time = time.perf_counter() - start
+
+            reference = ACPIParser()
+            start = time.perf_counter()
+            reference.parse_file(path)
+            reference.get_device_paths()
+            full_time = time.perf_counter() - start
+
+            same = parse_state(parser) == parse_state(reference)
+            mismatches += not same
+            incremental.append(refresh_time)
+            full.append(full_time)
+            print(f"{number:>5}{offset:>10}{summary['mode']:>13}{summary.get('blocks', '-'):>8}"
+                  f"{refresh_time * 1000:>14.2f}{full_time * 1000:>11.2f}"
+                  + ("" if same else "  MISMATCH"))
+
+    print(f"Median: refresh {statistics.median(incremental) * 1000:.2f} ms, "
+          f"full parse {statistics.median(full) * 1000:.2f} ms "
+          f"({statistics.median(full) / statistics.median(incremental):.1f}x)")
+    print(f"Results match a full parse: {mismatches == 0}")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
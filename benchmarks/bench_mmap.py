@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark - decoded text parsing vs. memory-mapped bytes parsing
+
+Builds a concatenated table dump from copies of a DSL file and parses it
+in a fresh child process per mode, reporting wall time and peak RSS.
+
+Usage: python -m benchmarks.bench_mmap [file.dsl] [--size-mb N]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+DEFAULT_DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def run_child(mode, path):
+    """Parse path in this process and print timings as JSON"""
+    from core.acpi_parser import ACPIParser
+
+    baseline = peak_rss_mb()
+    parser = ACPIParser()
+    start = time.perf_counter()
+    ok = parser.parse_file(path, use_mmap=(mode == 'mmap'))
+    paths = parser.get_device_paths()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'ok': ok,
+        'seconds': elapsed,
+        'baseline_rss_mb': baseline,
+        'peak_rss_mb': peak_rss_mb(),
+        'devices': len(parser.devices),
+        'methods': len(parser.methods),
+        'paths': sum(1 for p in paths.values() if p)
+    }))
+
+
+def build_dump(source, size_mb, directory):
+    """Concatenate copies of source until the dump reaches size_mb"""
+    data = Path(source).read_bytes()
+    target = size_mb * 1024 * 1024
+    path = os.path.join(directory, 'concatenated.dsl')
+    written = 0
+    with open(path, 'wb') as f:
+        while written < target:
+            f.write(data)
+            written += len(data)
+    return path, written
+
+
+def main(argv=None):
+    """Run the memory benchmark"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--size-mb', type=int, default=100)
+    arg_parser.add_argument('--child', choices=['text', 'mmap'], help=argparse.SUPPRESS)
+    args = arg_parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.file)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path, size = build_dump(args.file, args.size_mb, directory)
+        size_mb = size / (1024 * 1024)
+        print(f"Dump: {size_mb:.1f} MB from copies of {args.file}")
+        print(f"{'mode':<8}{'time (s)':>10}{'MB/s':>8}{'peak RSS (MB)':>15}"
+              f"{'over baseline':>15}{'devices':>10}{'methods':>10}")
+        for mode in ('text', 'mmap'):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_mmap', path, '--child', mode],
+                cwd=str(Path(__file__).resolve().parent.parent),
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            growth = result['peak_rss_mb'] - result['baseline_rss_mb']
+            print(f"{mode:<8}{result['seconds']:>10.2f}{size_mb / result['seconds']:>8.1f}"
+                  f"{result['peak_rss_mb']:>15.1f}{growth:>15.1f}"
+                  f"{result['devices']:>10}{result['methods']:>10}")
+        print("Note: mapped pages count towards RSS once read; they are shared"
+              " page cache and can be dropped by the OS.")
+
+
+if __name__ == "__main__":
+    main()
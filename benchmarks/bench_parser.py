@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark - current parser vs. the original regex-sweep parser
+
+The two do not do the same work: the original lists Device, Method and
+Scope names with three literal sweeps, while the current parser also
+builds the namespace tree (absolute paths, nesting, _HID/_CID/_ADR of
+each device) that detection and table merging use. The last line gives
+the speedup of the current parser over the original, for parse and
+detect together and for the parse alone; below 1x it is slower.
+
+Usage: python -m benchmarks.bench_parser [file.dsl] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.acpi_parser import ACPIParser
+from benchmarks.legacy_parser import LegacyACPIParser
+
+
+DEFAULT_DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+
+def run_parser(parser_class, content):
+    """Extract declarations, then run device path detection; return timings"""
+    parser = parser_class()
+    parser.content = content
+    
+    start = time.perf_counter()
+    if hasattr(parser, '_extract_declarations'):
+        parser._extract_declarations(content)
+    else:
+        parser._extract_devices(content)
+        parser._extract_methods(content)
+        parser._extract_scopes(content)
+    parsed = time.perf_counter()
+    paths = parser.get_device_paths()
+    detected = time.perf_counter()
+    return parsed - start, detected - parsed, parser, paths
+
+
+def best_of(parser_classes, content, repeat):
+    """Best parse and detect times of each parser class, and its last result
+
+    Runs of the parsers alternate, so drifting machine load affects both.
+    """
+    best = {parser_class: [None, None, None] for parser_class in parser_classes}
+    for _ in range(repeat):
+        for parser_class in parser_classes:
+            parse_time, detect_time, parser, paths = run_parser(parser_class, content)
+            entry = best[parser_class]
+            if entry[0] is None or parse_time < entry[0]:
+                entry[0] = parse_time
+            if entry[1] is None or detect_time < entry[1]:
+                entry[1] = detect_time
+            entry[2] = (parser, paths)
+    return best
+
+
+def main(argv=None):
+    """Run the parser benchmark"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--repeat', type=int, default=10)
+    args = arg_parser.parse_args(argv)
+    
+    with open(args.file, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+    size_mb = len(content) / (1024 * 1024)
+    
+    print(f"File: {args.file} ({size_mb:.2f} MB, best of {args.repeat})")
+    print(f"{'parser':<10}{'parse (ms)':>12}{'detect (ms)':>13}{'total (ms)':>12}"
+          f"{'devices':>10}{'methods':>10}{'scopes':>10}{'paths':>8}")
+    parses = {}
+    totals = {}
+    best = best_of((LegacyACPIParser, ACPIParser), content, args.repeat)
+    for label, parser_class in (('legacy', LegacyACPIParser), ('current', ACPIParser)):
+        parse_time, detect_time, (parser, paths) = best[parser_class]
+        parses[label] = parse_time
+        totals[label] = parse_time + detect_time
+        print(f"{label:<10}{parse_time * 1000:>12.2f}{detect_time * 1000:>13.2f}"
+              f"{totals[label] * 1000:>12.2f}{len(parser.devices):>10}"
+              f"{len(parser.methods):>10}{len(parser.scopes):>10}{len(paths):>8}")
+    print(f"Speedup: {totals['legacy'] / totals['current']:.2f}x "
+          f"(parse only: {parses['legacy'] / parses['current']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Record memory benchmark - slotted Records vs. one dict per declaration
+
+Parses the bundled DSDT and a synthetic table with 100k devices, then
+measures (with tracemalloc) what the device, method, scope and processor
+records take as Records and what the same values take as plain dicts.
+Field values are shared between both, so the numbers are the container
+overhead that differs. Only the record builds are traced; tracing the
+parse itself would slow it down several times.
+
+Usage: python -m benchmarks.bench_records [file.dsl] [--devices N]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.acpi_parser import ACPIParser
+from core.incremental import RECORD_LISTS
+
+
+DEFAULT_DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+# _HID values cycled through by the synthetic devices
+SYNTHETIC_HIDS = ('PNP0C0A', 'PNP0C09', 'PNP0A08', 'ACPI0007', 'INT33D5')
+
+# Devices per parent scope in the synthetic table
+SYNTHETIC_FANOUT = 1000
+
+
+def synthetic_table(devices):
+    """DSL text of a DSDT with the given number of leaf devices"""
+    lines = ['DefinitionBlock ("", "DSDT", 2, "BENCH", "RECORDS", 0x00000001)', '{',
+             '    Scope (_SB)', '    {']
+    for parent in range((devices + SYNTHETIC_FANOUT - 1) // SYNTHETIC_FANOUT):
+        lines += [f'        Device (P{parent:03d})', '        {']
+        count = min(SYNTHETIC_FANOUT, devices - parent * SYNTHETIC_FANOUT)
+        for child in range(count):
+            hid = SYNTHETIC_HIDS[child % len(SYNTHETIC_HIDS)]
+            lines += [
+                f'            Device (C{child:03d})',
+                '            {',
+                f'                Name (_HID, "{hid}")',
+                f'                Name (_ADR, 0x{child:08X})',
+                '                Method (_STA, 0, NotSerialized)',
+                '                {',
+                '                    Return (0x0F)',
+                '                }',
+                '            }',
+            ]
+        lines.append('        }')
+    lines += ['    }', '}', '']
+    return '\n'.join(lines)
+
+
+def traced(build):
+    """Bytes still allocated after build() returns, and its result"""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - before, result
+
+
+def measure(path):
+    """Parse path and measure its records both ways"""
+    parser = ACPIParser()
+    parser.parse_file(path)
+
+    tracemalloc.start()
+    rows = []
+    for name in RECORD_LISTS:
+        records = getattr(parser, name)
+        as_records, _ = traced(lambda: [
+            type(record)(*(getattr(record, field) for field in record.FIELDS))
+            for record in records])
+        as_dicts, _ = traced(lambda: [dict(record) for record in records])
+        rows.append((name, len(records), as_records, as_dicts))
+    tracemalloc.stop()
+
+    method_names = len({id(record.name) for record in parser.methods})
+    return rows, len(parser.methods), method_names
+
+
+def report(label, path):
+    """Print the measurements for one input"""
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    rows, methods, method_names = measure(path)
+    print(f"{label}: {size_mb:.1f} MB")
+    print(f"{'records':<12}{'count':>10}{'Records (MB)':>15}{'dicts (MB)':>13}{'saved':>8}")
+    total_records = total_dicts = 0
+    for name, count, as_records, as_dicts in rows:
+        total_records += as_records
+        total_dicts += as_dicts
+        saved = 1 - as_records / as_dicts if as_dicts else 0
+        print(f"{name:<12}{count:>10}{as_records / (1024 * 1024):>15.2f}"
+              f"{as_dicts / (1024 * 1024):>13.2f}{saved:>8.0%}")
+    print(f"{'total':<12}{'':>10}{total_records / (1024 * 1024):>15.2f}"
+          f"{total_dicts / (1024 * 1024):>13.2f}{1 - total_records / total_dicts:>8.0%}")
+    print(f"Method names: {method_names} distinct string objects for {methods} methods")
+    print()
+
+
+def main(argv=None):
+    """Run the record memory benchmark"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--devices', type=int, default=100000)
+    args = arg_parser.parse_args(argv)
+
+    report(Path(args.file).name, args.file)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'synthetic.dsl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(synthetic_table(args.devices))
+        report(f"synthetic ({args.devices} devices)", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - cold start time of the headless CLI
+
+Runs each command in a fresh interpreter, reports the best wall time and
+fails if tkinter gets imported or a command exceeds --max-ms.
+
+Usage: python -m benchmarks.bench_startup [file.dsl] [--repeat N] [--max-ms MS]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DSDT = ROOT / "dsdt.dsl"
+
+
+def time_command(args, repeat):
+    """Best wall time of a command in ms, and its -X importtime log"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=str(ROOT), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = (time.perf_counter() - start) * 1000
+        if best is None or elapsed < best:
+            best = elapsed
+    
+    imports = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=str(ROOT),
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             text=True).stderr
+    return best, imports
+
+
+def main(argv=None):
+    """Run the startup benchmark"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--max-ms', type=float, default=None,
+                            help='fail if a CLI command (excluding interpreter start) is slower')
+    args = arg_parser.parse_args(argv)
+    
+    commands = [
+        ('python (baseline)', ['-c', 'pass']),
+        ('cli --help', ['-m', 'cli', '--help']),
+        ('cli detect', ['-m', 'cli', 'detect', args.file, '--no-cache']),
+        ('cli detect (cached)', ['-m', 'cli', 'detect', args.file]),
+        ('cli analyze', ['-m', 'cli', 'analyze', args.file, '--no-cache']),
+    ]
+    
+    # Warm the parse cache so the cached row measures a hit
+    subprocess.run([sys.executable, '-m', 'cli', 'detect', args.file], cwd=str(ROOT),
+                   check=True, stdout=subprocess.DEVNULL)
+    
+    print(f"Best of {args.repeat} runs")
+    print(f"{'command':<22}{'wall (ms)':>12}{'over baseline':>15}{'tkinter':>10}")
+    baseline = None
+    failures = []
+    for label, command in commands:
+        elapsed, imports = time_command(command, args.repeat)
+        if baseline is None:
+            baseline = elapsed
+        overhead = elapsed - baseline
+        tk_loaded = 'tkinter' in imports
+        print(f"{label:<22}{elapsed:>12.1f}{overhead:>15.1f}{'yes' if tk_loaded else 'no':>10}")
+        
+        if command[:2] == ['-m', 'cli']:
+            if tk_loaded:
+                failures.append(f"{label} imported tkinter")
+            if args.max_ms is not None and overhead > args.max_ms:
+                failures.append(f"{label} took {overhead:.1f} ms (limit {args.max_ms:.1f} ms)")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
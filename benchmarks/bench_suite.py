@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite - parse, detect, recommend, export and Generate All
+
+Runs the whole pipeline on the bundled DSDT and on table dumps scaled up
+from it (copies concatenated to 1, 10, 100 and 500 MB by default), each
+input in a fresh child process. With --synthetic the scaled inputs are
+generated DSDTs of those sizes instead (see synthetic_dsdt), whose
+namespace grows with them, and detection is also scored against their
+ground truth. Reports wall time, throughput and peak RSS per phase, and
+saves the results as JSON. Given an earlier result file with --baseline,
+phases that got slower (or bigger) by more than --threshold are listed
+and the exit status is 1.
+
+Usage: python -m benchmarks.bench_suite [file.dsl] [--sizes MB ...] [--synthetic]
+           [--repeat N] [--output results.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_mmap import build_dump, peak_rss_mb
+from benchmarks.synthetic_dsdt import (ROLES, SyntheticMachine, devices_for_size,
+                                       read_ground_truth, score, write_machine)
+
+
+DEFAULT_DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+# Sizes of the scaled table dumps, in MB
+DEFAULT_SIZES = (1, 10, 100, 500)
+
+# Pipeline phases, in the order they run
+PHASES = ('parse', 'detect', 'recommend', 'export', 'generate_all')
+
+# Phases that work through the input, so MB/s is meaningful for them
+THROUGHPUT_PHASES = ('parse', 'export')
+
+# Bump when the layout of the result file changes
+RESULT_FORMAT = 1
+
+# Slowdowns smaller than this many seconds are timer noise, not regressions
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def timed(run, repeat):
+    """Best wall time of repeat calls to run(), and the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_child(path, repeat):
+    """Run every phase on path in this process and print the results as JSON"""
+    from core.acpi_parser import ACPIParser
+    from core.dsdt_context import DSDTContext
+    from core.hardware_detector import HardwareDetector
+    from core.generators import REGISTRY, generate_patches
+    from core.export import export_file
+
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    phases = {}
+    baseline_rss = peak_rss_mb()
+
+    def record(phase, seconds):
+        phases[phase] = {
+            'seconds': round(seconds, 6),
+            'mb_per_s': (round(size_mb / seconds, 3)
+                         if seconds and phase in THROUGHPUT_PHASES else None),
+            'peak_rss_mb': round(peak_rss_mb(), 1)
+        }
+
+    def parse():
+        parser = ACPIParser()
+        if not parser.parse_file(path):
+            raise RuntimeError(f"failed to parse {path}")
+        return parser
+
+    seconds, parser = timed(parse, repeat)
+    record('parse', seconds)
+
+    def detect():
+        # Detection results are cached per parse; drop them to time a fresh run
+        parser.detection_index = None
+        parser.device_index = None
+        parser.device_paths = None
+        context = DSDTContext(parser)
+        context.analyze()
+        return context
+
+    seconds, context = timed(detect, repeat)
+    record('detect', seconds)
+
+    seconds, hardware = timed(lambda: HardwareDetector(parser).detect(), repeat)
+    record('recommend', seconds)
+
+    with tempfile.TemporaryDirectory() as directory:
+        def export():
+            export_file(parser, os.path.join(directory, 'export.json'))
+
+        seconds, _ = timed(export, repeat)
+        record('export', seconds)
+        export_mb = os.path.getsize(os.path.join(directory, 'export.json')) / (1024 * 1024)
+
+        names = list(REGISTRY)
+        output = Path(directory) / 'ssdt'
+        output.mkdir()
+
+        def generate_all():
+            results = list(generate_patches(names, output, context, incremental=False))
+            return sum(1 for result in results if result.get('ok'))
+
+        seconds, generated = timed(generate_all, repeat)
+        record('generate_all', seconds)
+
+    truth = read_ground_truth(path)
+    print(json.dumps({
+        'size_mb': round(size_mb, 3),
+        'devices': len(parser.devices),
+        'methods': len(parser.methods),
+        'namespace_nodes': len(parser.namespace),
+        'detected': sum(1 for value in parser.get_device_paths().values() if value),
+        'roles_correct': (len(ROLES) - len(score(parser.get_device_paths(), truth))
+                          if truth else None),
+        'recommended': len(hardware['recommended_patches']),
+        'export_mb': round(export_mb, 3),
+        'generated': generated,
+        'patches': len(names),
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'phases': phases
+    }))
+
+
+def run_input(label, path, repeat):
+    """Benchmark one input in a child process; returns its result dict"""
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_suite', str(path),
+         '--child', '--repeat', str(repeat)],
+        cwd=str(Path(__file__).resolve().parent.parent),
+        capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['input'] = label
+    return result
+
+
+def print_result(result):
+    """Print one input's phases as table rows"""
+    if result['roles_correct'] is not None:
+        print(f"{result['input']}: {result['roles_correct']}/{len(ROLES)} roles detected correctly")
+    for phase in PHASES:
+        timing = result['phases'][phase]
+        throughput = f"{timing['mb_per_s']:.1f}" if timing['mb_per_s'] else '-'
+        print(f"{result['input']:<16}{phase:<14}{timing['seconds'] * 1000:>12.1f}"
+              f"{throughput:>10}{timing['peak_rss_mb']:>15.1f}")
+
+
+def compare(current, baseline, threshold):
+    """Phases whose time or peak RSS grew by more than threshold (a fraction)"""
+    previous = {result['input']: result for result in baseline['inputs']}
+    regressions = []
+    for result in current['inputs']:
+        old = previous.get(result['input'])
+        if old is None:
+            continue
+        for phase in PHASES:
+            new_timing = result['phases'].get(phase)
+            old_timing = old['phases'].get(phase)
+            if not new_timing or not old_timing:
+                continue
+            for metric in ('seconds', 'peak_rss_mb'):
+                before = old_timing[metric]
+                after = new_timing[metric]
+                if metric == 'seconds' and after - before < MIN_REGRESSION_SECONDS:
+                    continue
+                if before and after > before * (1 + threshold):
+                    regressions.append((result['input'], phase, metric, before, after))
+    return regressions
+
+
+def main(argv=None):
+    """Run the benchmark suite"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('file', nargs='?', default=str(DEFAULT_DSDT))
+    arg_parser.add_argument('--sizes', type=int, nargs='*', default=list(DEFAULT_SIZES),
+                            help='sizes of the scaled dumps in MB (none to skip them)')
+    arg_parser.add_argument('--synthetic', action='store_true',
+                            help='scale with generated DSDTs instead of copies of file')
+    arg_parser.add_argument('--repeat', type=int, default=3,
+                            help='runs per phase; the best time is kept')
+    arg_parser.add_argument('--output', default='bench_suite.json',
+                            help='where to save the results')
+    arg_parser.add_argument('--baseline', help='earlier results to check for regressions')
+    arg_parser.add_argument('--threshold', type=float, default=0.2,
+                            help='allowed growth over the baseline (0.2 = 20%%)')
+    arg_parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.file, args.repeat)
+        return 0
+
+    results = {
+        'format': RESULT_FORMAT,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeat': args.repeat,
+        'inputs': []
+    }
+
+    print(f"{'input':<16}{'phase':<14}{'time (ms)':>12}{'MB/s':>10}{'peak RSS (MB)':>15}")
+    results['inputs'].append(run_input(Path(args.file).name, args.file, args.repeat))
+    print_result(results['inputs'][-1])
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in args.sizes:
+            if args.synthetic:
+                label = f"synthetic-{size_mb}mb"
+                machine = SyntheticMachine(devices=devices_for_size(size_mb))
+                path = write_machine(Path(directory) / label, machine)[0]
+            else:
+                label = f"dump-{size_mb}mb"
+                path, _ = build_dump(args.file, size_mb, directory)
+            results['inputs'].append(run_input(label, path, args.repeat))
+            print_result(results['inputs'][-1])
+            os.remove(path)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for label, phase, metric, before, after in regressions:
+            print(f"REGRESSION {label} {phase} {metric}: {before} -> {after} "
+                  f"(+{(after / before - 1):.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions over {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Synthetic DSDT generator - large, valid DSL tables with known device roles
+
+Writes a DSDT (and optionally SSDTs) for a made-up machine: a PCI root
+with the usual role devices (LPC bridge, GPU, USB, SMBus, EC, battery,
+HPET, GPIO, CPUs) named in one vendor style, plus any number of filler
+devices nested under the PCI root with _ADR/_HID, Methods and
+OperationRegion/Field declarations. The paths every detection role
+should resolve to are written to ground_truth.json and, as comments, at
+the top of the DSDT. A machine directory loads as a table set; DSDT.dsl
+alone parses with ACPIParser, and a directory of machines feeds the batch
+runner (python -m cli batch).
+
+Usage: python -m benchmarks.synthetic_dsdt OUTPUT [--devices N] [--depth N]
+           [--methods N] [--regions P] [--ssdts N] [--style NAME]
+           [--platform laptop|desktop] [--machines N] [--seed N] [--check]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# Role device names per vendor style. cpu is (declaration, scope, name):
+# Processor() objects under a scope, or ACPI0007 Devices
+STYLES = {
+    'intel': {
+        'pci_root': 'PCI0', 'lpc_bridge': 'LPCB', 'gpu_device': 'GFX0',
+        'usb_controller': 'XHC', 'smbus': 'SBUS', 'ec_device': 'EC0',
+        'battery_device': 'BAT0', 'hpet_device': 'HPET', 'gpio_device': 'GPI0',
+        'cpu': ('Processor', '_PR', 'CPU'), 'gpio_hid': 'INT344B', 'battery_in_ec': False,
+    },
+    'intel-modern': {
+        'pci_root': 'PC00', 'lpc_bridge': 'LPC0', 'gpu_device': 'IGPU',
+        'usb_controller': 'XHCI', 'smbus': 'SMBU', 'ec_device': 'H_EC',
+        'battery_device': 'BAT1', 'hpet_device': 'HPET', 'gpio_device': 'GPIO',
+        'cpu': ('Device', '_SB', 'PR'), 'gpio_hid': 'INT34C5', 'battery_in_ec': False,
+    },
+    'amd': {
+        'pci_root': 'PCI0', 'lpc_bridge': 'SBRG', 'gpu_device': 'VGA',
+        'usb_controller': 'XHC0', 'smbus': 'SMBS', 'ec_device': 'EC',
+        'battery_device': 'BATT', 'hpet_device': 'HPET', 'gpio_device': 'GPIO',
+        'cpu': ('Processor', '_PR', 'C'), 'gpio_hid': 'AMDI0030', 'battery_in_ec': True,
+    },
+}
+
+# Detection roles, in the order of core.detection.DETECTION_RULES
+ROLES = ('pci_root', 'lpc_bridge', 'gpu_device', 'cpu_path', 'usb_controller',
+         'smbus', 'ec_device', 'battery_device', 'hpet_device', 'gpio_device')
+
+# First letters of filler device names; no role candidate name starts with them
+FILLER_LETTERS = 'DJKNQWYZ'
+NAME_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+NAMES_PER_SCOPE = len(FILLER_LETTERS) * len(NAME_DIGITS) ** 3
+
+# Method names given to filler devices, in order; M001... after these
+METHOD_NAMES = ('_STA', '_PS0', '_PS3', '_DSW', '_RMV', '_DSM', '_S0W', '_PRW')
+
+# _HID values of filler devices; none of them is a role HID
+FILLER_HIDS = ('INT33D5', 'PNP0C02', 'ELAN0000', 'SYNA2B31', 'INT3472', 'PNP0C14')
+
+# Share of filler devices that get a _HID, and chance to start a new branch
+FILLER_HID_SHARE = 0.1
+BRANCH_SHARE = 0.05
+
+# Filler devices generated to estimate the size of one device
+CALIBRATION_DEVICES = 2000
+
+CPU_COUNT = 8
+INDENT = '    '
+
+
+class SyntheticMachine:
+    """One generated machine: its options, filler tree and ground truth"""
+
+    def __init__(self, devices=1000, depth=3, methods=2, regions=0.1, ssdts=0,
+                 style='intel', platform='laptop', seed=0):
+        if style not in STYLES:
+            raise ValueError(f"unknown style {style!r}; choose from {', '.join(STYLES)}")
+        self.devices = devices
+        self.depth = max(depth, 1)
+        self.methods = methods
+        self.regions = regions
+        self.ssdts = ssdts
+        self.style = style
+        self.platform = platform
+        self.seed = seed
+        self.names = STYLES[style]
+        self.random = random.Random(seed)
+        self.children = self._build_tree()
+
+    def _build_tree(self):
+        """Place filler devices: children[i] lists the children of device i
+
+        Index 0 is the PCI root; filler devices are 1..devices.
+        """
+        rng = self.random
+        children = [[]]
+        levels = [0]
+        open_parents = []
+        for index in range(1, self.devices + 1):
+            if not open_parents or rng.random() < BRANCH_SHARE:
+                parent = 0
+            else:
+                parent = open_parents[rng.randrange(len(open_parents))]
+            if len(children[parent]) >= NAMES_PER_SCOPE:
+                parent = 0
+                if len(children[0]) >= NAMES_PER_SCOPE:
+                    raise ValueError("too many filler devices for one PCI root")
+            children[parent].append(index)
+            children.append([])
+            levels.append(levels[parent] + 1)
+            if levels[index] < self.depth:
+                open_parents.append(index)
+        return children
+
+    @property
+    def ground_truth(self):
+        """Dotted path each detection role should resolve to (None if absent)"""
+        names = self.names
+        pci = f"_SB.{names['pci_root']}"
+        lpc = f"{pci}.{names['lpc_bridge']}"
+        laptop = self.platform == 'laptop'
+        ec = f"{lpc}.{names['ec_device']}" if laptop else None
+        battery = None
+        if laptop:
+            parent = ec if names['battery_in_ec'] else '_SB'
+            battery = f"{parent}.{names['battery_device']}"
+        declaration, scope, prefix = names['cpu']
+        return {
+            'pci_root': pci,
+            'lpc_bridge': lpc,
+            'gpu_device': f"{pci}.{names['gpu_device']}",
+            'cpu_path': f"{scope}.{cpu_name(prefix, 0)}",
+            'usb_controller': f"{pci}.{names['usb_controller']}",
+            'smbus': f"{pci}.{names['smbus']}",
+            'ec_device': ec,
+            'battery_device': battery,
+            'hpet_device': f"{lpc}.{names['hpet_device']}",
+            'gpio_device': f"{pci}.{names['gpio_device']}",
+        }
+
+    def info(self):
+        """Options and ground truth, as written to ground_truth.json"""
+        return {
+            'style': self.style,
+            'platform': self.platform,
+            'seed': self.seed,
+            'devices': self.devices,
+            'depth': self.depth,
+            'methods': self.methods,
+            'regions': self.regions,
+            'ssdts': self.ssdts,
+            'roles': self.ground_truth,
+        }
+
+    def tables(self):
+        """(table name, iterator of text chunks) for the DSDT and each SSDT"""
+        # Branches keep their slot under the PCI root, so names stay unique across tables
+        branches = list(enumerate(self.children[0]))
+        if not self.ssdts:
+            yield 'DSDT', self._dsdt(branches)
+            return
+        yield 'DSDT', self._dsdt([])
+        for number in range(self.ssdts):
+            yield f"SSDT{number + 1}", self._ssdt(number + 1, branches[number::self.ssdts])
+
+    def _dsdt(self, branches):
+        names = self.names
+        laptop = self.platform == 'laptop'
+        yield f'// Synthetic DSDT: style {self.style}, platform {self.platform}, seed {self.seed}\n'
+        yield '// Ground truth:\n'
+        for role, path in self.ground_truth.items():
+            yield f'//   {role:<16}{path or "-"}\n'
+        yield 'DefinitionBlock ("", "DSDT", 2, "SYNTH", "SYNTHDSD", 0x00000001)\n{\n'
+
+        declaration, scope, prefix = names['cpu']
+        if declaration == 'Processor':
+            yield from block(1, f'Scope ({scope})', [
+                line for number in range(CPU_COUNT) for line in (
+                    f'Processor ({cpu_name(prefix, number)}, 0x{number + 1:02X}, 0x00001810, 0x06)',
+                    '{', '}')])
+
+        lpc = ['Name (_ADR, 0x001F0000)']
+        if laptop:
+            ec = ['Name (_HID, EisaId ("PNP0C09"))', 'Name (_UID, One)',
+                  'Method (_REG, 2, NotSerialized)', '{', '}']
+            if names['battery_in_ec']:
+                ec += device_lines(names['battery_device'], ['Name (_HID, EisaId ("PNP0C0A"))',
+                                                              'Name (_UID, Zero)'])
+            lpc += device_lines(names['ec_device'], ec)
+        lpc += device_lines(names['hpet_device'], ['Name (_HID, EisaId ("PNP0103"))',
+                                                   'Name (_UID, Zero)'])
+        pci = ['Name (_HID, EisaId ("PNP0A08"))', 'Name (_CID, EisaId ("PNP0A03"))',
+               'Name (_ADR, Zero)']
+        pci += device_lines(names['lpc_bridge'], lpc)
+        pci += device_lines(names['gpu_device'], ['Name (_ADR, 0x00020000)'])
+        pci += device_lines(names['usb_controller'], ['Name (_ADR, 0x00140000)'])
+        pci += device_lines(names['smbus'], ['Name (_ADR, 0x001F0004)'])
+        pci += device_lines(names['gpio_device'], [f'Name (_HID, "{names["gpio_hid"]}")'])
+
+        # Scope (_SB) and the PCI root stay open for the filler devices
+        yield f'{INDENT}Scope (_SB)\n{INDENT}{{\n'
+        yield from block(2, f"Device ({names['pci_root']})", pci, close=False)
+        yield from self._filler(branches, 3)
+        yield f'{INDENT * 2}}}\n'
+        if laptop and not names['battery_in_ec']:
+            yield from indented(2, device_lines(names['battery_device'], [
+                'Name (_HID, EisaId ("PNP0C0A"))', 'Name (_UID, Zero)']))
+        if declaration == 'Device':
+            for number in range(CPU_COUNT):
+                yield from indented(2, device_lines(cpu_name(prefix, number), [
+                    'Name (_HID, "ACPI0007")', f'Name (_UID, 0x{number:02X})']))
+        yield f'{INDENT}}}\n'
+
+        yield from block(1, 'Scope (_GPE)', ['Method (_L6F, 0, NotSerialized)', '{', '}'])
+        yield from block(1, 'Scope (_TZ)', [
+            'ThermalZone (TZ00)', '{',
+            f'{INDENT}Method (_TMP, 0, Serialized)', f'{INDENT}{{',
+            f'{INDENT * 2}Return (0x0BB8)', f'{INDENT}}}', '}'])
+        yield '}\n'
+
+    def _ssdt(self, number, branches):
+        pci = f"\\_SB.{self.names['pci_root']}"
+        yield f'DefinitionBlock ("", "SSDT", 2, "SYNTH", "SYNTH{number:03d}", 0x00000001)\n{{\n'
+        yield f'{INDENT}External ({pci}, DeviceObj)\n\n'
+        yield f'{INDENT}Scope ({pci})\n{INDENT}{{\n'
+        yield from self._filler(branches, 2)
+        yield f'{INDENT}}}\n}}\n'
+
+    def _filler(self, branches, level):
+        """Text of the filler devices in branches ((slot, index) pairs) and below"""
+        rng = self.random
+        children = self.children
+        # (device index, slot among its siblings, level), or a closing brace
+        stack = [(index, slot, level) for slot, index in reversed(branches)]
+        while stack:
+            entry = stack.pop()
+            if type(entry) is str:
+                yield entry
+                continue
+            index, slot, depth = entry
+            pad = INDENT * depth
+            inner = pad + INDENT
+            lines = [f'{pad}Device ({filler_name(slot)})', f'{pad}{{',
+                     f'{inner}Name (_ADR, 0x{slot % 0x20:04X}{index % 8:04X})']
+            if rng.random() < FILLER_HID_SHARE:
+                lines.append(f'{inner}Name (_HID, "{FILLER_HIDS[index % len(FILLER_HIDS)]}")')
+            if rng.random() < self.regions:
+                lines += [f'{inner}OperationRegion (PCFG, PCI_Config, Zero, 0x0100)',
+                          f'{inner}Field (PCFG, AnyAcc, NoLock, Preserve)', f'{inner}{{',
+                          f'{inner}{INDENT}VDID,   32,', f'{inner}{INDENT}Offset (0x10),',
+                          f'{inner}{INDENT}BAR0,   32', f'{inner}}}']
+            for number in range(self.methods):
+                name = METHOD_NAMES[number] if number < len(METHOD_NAMES) else f'M{number:03d}'
+                lines += [f'{inner}Method ({name}, 0, NotSerialized)', f'{inner}{{',
+                          f'{inner}{INDENT}Return (0x0F)', f'{inner}}}']
+            yield '\n'.join(lines) + '\n'
+
+            # Children come next, then this device's closing brace
+            stack.append(f'{pad}}}\n')
+            stack.extend((child, child_slot, depth + 1) for child_slot, child
+                         in reversed(list(enumerate(children[index]))))
+
+
+def filler_name(slot):
+    """NameSeg of the filler device at slot among its siblings (D000, D001, ...)"""
+    base = len(NAME_DIGITS)
+    letter, rest = divmod(slot, base ** 3)
+    return (FILLER_LETTERS[letter] + NAME_DIGITS[rest // base ** 2]
+            + NAME_DIGITS[rest // base % base] + NAME_DIGITS[rest % base])
+
+
+def cpu_name(prefix, number):
+    """NameSeg of CPU number for a style prefix (CPU0, PR00, C000)"""
+    return f"{prefix}{number:0{4 - len(prefix)}X}"
+
+
+def device_lines(name, body):
+    """Lines of a Device() with body indented one level"""
+    return [f'Device ({name})', '{'] + [INDENT + line for line in body] + ['}']
+
+
+def indented(level, lines):
+    """Yield lines indented by level, one chunk"""
+    pad = INDENT * level
+    yield ''.join(f'{pad}{line}\n' for line in lines)
+
+
+def block(level, header, body, close=True):
+    """Yield header { body } at level; body one level deeper"""
+    pad = INDENT * level
+    yield f'{pad}{header}\n{pad}{{\n'
+    yield from indented(level + 1, body)
+    if close:
+        yield f'{pad}}}\n'
+
+
+def devices_for_size(size_mb, **options):
+    """Filler device count that makes a machine's tables about size_mb in total"""
+    sample = SyntheticMachine(devices=CALIBRATION_DEVICES, **options)
+    empty = SyntheticMachine(devices=0, **options)
+    sample_size = sum(len(chunk) for _, chunks in sample.tables() for chunk in chunks)
+    empty_size = sum(len(chunk) for _, chunks in empty.tables() for chunk in chunks)
+    per_device = (sample_size - empty_size) / CALIBRATION_DEVICES
+    return max(int((size_mb * 1024 * 1024 - empty_size) / per_device), 0)
+
+
+def write_machine(directory, machine):
+    """Write machine's tables and ground_truth.json into directory
+
+    Returns the paths of the tables written, DSDT first.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, chunks in machine.tables():
+        path = directory / f"{name}.dsl"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(chunks)
+        paths.append(path)
+    with open(directory / 'ground_truth.json', 'w') as f:
+        json.dump(machine.info(), f, indent=2)
+    return paths
+
+
+def read_ground_truth(path):
+    """Role paths from the ground_truth.json next to a table (or in a directory)"""
+    path = Path(path)
+    truth = (path if path.is_dir() else path.parent) / 'ground_truth.json'
+    if not truth.is_file():
+        return None
+    with open(truth) as f:
+        return json.load(f)['roles']
+
+
+def score(detected, truth):
+    """Roles whose detected path differs from the ground truth, as {role: (expected, got)}"""
+    return {role: (truth[role], detected.get(role)) for role in ROLES
+            if detected.get(role) != truth[role]}
+
+
+def check_machine(directory):
+    """Parse a generated machine and score its detected paths
+
+    A single DSDT is parsed with ACPIParser, several tables as a table set.
+    """
+    from core.acpi_parser import ACPIParser
+    from core.table_set import TableSet
+
+    directory = Path(directory)
+    tables = sorted(directory.glob('*.dsl'))
+    start = time.perf_counter()
+    if len(tables) == 1:
+        parser = ACPIParser()
+        if not parser.parse_file(tables[0]):
+            parser = None
+    else:
+        parser = TableSet(use_cache=False).load(directory)
+    parsed = time.perf_counter()
+    if parser is None:
+        return {'machine': directory.name, 'ok': False}
+    detected = parser.get_device_paths()
+    detect_seconds = time.perf_counter() - parsed
+
+    misses = score(detected, read_ground_truth(directory))
+    return {
+        'machine': directory.name,
+        'ok': True,
+        'tables': len(tables),
+        'size_mb': sum(table.stat().st_size for table in tables) / (1024 * 1024),
+        'devices': len(parser.devices),
+        'parse_seconds': parsed - start,
+        'detect_seconds': detect_seconds,
+        'correct': len(ROLES) - len(misses),
+        'misses': misses,
+    }
+
+
+def main(argv=None):
+    """Generate synthetic machines, optionally parsing them to score detection"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('output', help='directory to write the tables to')
+    arg_parser.add_argument('--devices', type=int, default=1000,
+                            help='filler devices per machine')
+    arg_parser.add_argument('--depth', type=int, default=3,
+                            help='nesting depth of filler devices below the PCI root')
+    arg_parser.add_argument('--methods', type=int, default=2, help='Methods per filler device')
+    arg_parser.add_argument('--regions', type=float, default=0.1,
+                            help='share of filler devices with an OperationRegion/Field')
+    arg_parser.add_argument('--ssdts', type=int, default=0,
+                            help='SSDTs to move the filler devices into (0 keeps them in the DSDT)')
+    arg_parser.add_argument('--style', choices=sorted(STYLES) + ['random'], default='random',
+                            help='role device naming style')
+    arg_parser.add_argument('--platform', choices=['laptop', 'desktop', 'random'],
+                            default='random', help='desktops have no EC or battery')
+    arg_parser.add_argument('--machines', type=int, default=1,
+                            help='machines to write, each in its own subdirectory')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--check', action='store_true',
+                            help='parse each machine and compare detection with the ground truth')
+    args = arg_parser.parse_args(argv)
+
+    chooser = random.Random(args.seed)
+    directories = []
+    for number in range(args.machines):
+        style = chooser.choice(sorted(STYLES)) if args.style == 'random' else args.style
+        platform = (chooser.choice(['laptop', 'desktop']) if args.platform == 'random'
+                    else args.platform)
+        machine = SyntheticMachine(args.devices, args.depth, args.methods, args.regions,
+                                   args.ssdts, style, platform, args.seed + number)
+        directory = Path(args.output)
+        if args.machines > 1:
+            directory = directory / f"machine-{number:03d}"
+        paths = write_machine(directory, machine)
+        size_mb = sum(os.path.getsize(path) for path in paths) / (1024 * 1024)
+        print(f"{directory}: {style}, {platform}, {len(paths)} table(s), {size_mb:.1f} MB")
+        directories.append(directory)
+
+    if not args.check:
+        return 0
+
+    print(f"{'machine':<14}{'MB':>8}{'devices':>10}{'parse (ms)':>12}{'detect (ms)':>13}{'roles':>8}")
+    correct = 0
+    for directory in directories:
+        result = check_machine(directory)
+        if not result['ok']:
+            print(f"{result['machine']:<14} failed to parse")
+            continue
+        correct += result['correct']
+        print(f"{result['machine']:<14}{result['size_mb']:>8.1f}{result['devices']:>10}"
+              f"{result['parse_seconds'] * 1000:>12.1f}{result['detect_seconds'] * 1000:>13.2f}"
+              f"{result['correct']:>5}/{len(ROLES)}")
+        for role, (expected, got) in result['misses'].items():
+            print(f"  {role}: expected {expected}, detected {got}")
+    total = len(directories) * len(ROLES)
+    print(f"Detection accuracy: {correct}/{total} roles ({correct / total:.0%})")
+    return 0 if correct == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Headless command line interface for Acpi Analyzer"""
+
+from .commands import main
+
+__all__ = ['main']
@@ -0,0 +1,9 @@
+"""Entry point for python -m cli"""
+
+import sys
+
+from .commands import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+"""CLI subcommands - analyze, detect, generate, export, batch
+
+Only argparse and json are imported at startup; the parser, detectors and
+generators are imported inside each command, and tkinter never is.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_parser(filepath, use_cache=True):
+    """Parse a DSDT file, going through the parse cache unless disabled
+
+    A directory of tables or an acpidump text file is loaded as a table
+    set: every DSDT/SSDT is parsed and merged into one namespace.
+    """
+    from core.acpi_parser import ACPIParser
+    from core.table_set import TableSet, is_table_set
+    
+    if is_table_set(filepath):
+        parser = TableSet(use_cache=use_cache).load(filepath)
+        if parser is None:
+            raise CommandError(f"Failed to load ACPI tables: {filepath}")
+        return parser
+    
+    parser = ACPIParser()
+    if use_cache:
+        from core.parse_cache import ParseCache
+        ok = ParseCache().parse_file(parser, filepath)
+    else:
+        ok = parser.parse_file(filepath)
+    
+    if not ok:
+        raise CommandError(f"Failed to parse ACPI file: {filepath}")
+    return parser
+
+
+def load_context(parser):
+    """Build an analyzed DSDTContext for parser"""
+    from core.dsdt_context import DSDTContext
+    
+    context = DSDTContext(parser)
+    context.analyze()
+    return context
+
+
+def write_trace(args, stats):
+    """Save stats as a Chrome trace-event file if --trace was given"""
+    if not args.trace:
+        return
+    try:
+        stats.write_chrome_trace(args.trace)
+    except OSError as e:
+        raise CommandError(f"Failed to write trace {args.trace}: {e}")
+
+
+class CommandError(Exception):
+    """A command failed with a message for the user"""
+
+
+def cmd_analyze(args):
+    """Parse a DSDT and report statistics, detected paths and recommendations"""
+    from core.hardware_detector import HardwareDetector
+    
+    parser = load_parser(args.file, not args.no_cache)
+    context = load_context(parser)
+    hardware = HardwareDetector(parser).detect()
+    stats = parser.get_stats()
+    write_trace(args, parser.stats)
+    
+    return {
+        'file': str(args.file),
+        'stats': stats,
+        'paths': parser.get_device_paths(),
+        'detected': sum(1 for path in parser.get_device_paths().values() if path),
+        'hardware': {
+            'cpu': hardware['cpu'],
+            'platform': hardware['platform'],
+            'chipset': hardware['chipset'],
+        },
+        'recommended_patches': hardware['recommended_patches'],
+        'summary': context.get_detection_summary(),
+        'instrumentation': parser.stats.to_dict()
+    }
+
+
+def cmd_detect(args):
+    """Report detected device paths and per-patch compatibility"""
+    from core.patch_info import PatchManager
+    
+    parser = load_parser(args.file, not args.no_cache)
+    context = load_context(parser)
+    result = {
+        'file': str(args.file),
+        'paths': parser.get_device_paths(),
+        'compatibility': {
+            patch.name: context.get_compatibility_status(patch.name)
+            for patch in PatchManager().patches
+        }
+    }
+    write_trace(args, parser.stats)
+    return result
+
+
+def cmd_generate(args):
+    """Generate SSDT patches into an output directory or zip bundle"""
+    from pathlib import Path
+    from core.generators import REGISTRY, GenerationSummary, generate_patches, render_patch, write_bundle
+    from core.instrumentation import RunStats
+    
+    context = None
+    parser = None
+    stats = RunStats()
+    if args.dsdt:
+        parser = load_parser(args.dsdt, not args.no_cache)
+        context = load_context(parser)
+        stats = parser.stats
+    
+    if args.all:
+        names = list(REGISTRY)
+    elif args.patches:
+        unknown = [name for name in args.patches if name not in REGISTRY]
+        if unknown:
+            raise CommandError(f"Unknown patches: {', '.join(unknown)}")
+        names = args.patches
+    else:
+        from core.hardware_detector import HardwareDetector
+        detector = HardwareDetector(parser)
+        detector.detect_platform()
+        detector.detect_chipset()
+        names = detector.get_recommended_patches()
+    
+    output = Path(args.output)
+    if not args.bundle:
+        output.mkdir(parents=True, exist_ok=True)
+        summary = GenerationSummary()
+        with stats.phase('generate', 'generate', patches=len(names)):
+            for _ in generate_patches(names, output, context, args.workers, summary,
+                                      incremental=not args.force):
+                pass
+        stats.count('patches_written', len(summary.written))
+        stats.count('patches_skipped', len(summary.skipped))
+        stats.count('patches_failed', len(summary.failed))
+        write_trace(args, stats)
+        return {
+            'output': str(output),
+            'dsdt': str(args.dsdt) if args.dsdt else None,
+            'generated': summary.generated,
+            'written': len(summary.written),
+            'skipped': len(summary.skipped),
+            'failed': [{'patch': result['patch'], 'error': result.get('error')}
+                       for result in summary.failed],
+            'timing': summary.summary()
+        }
+    
+    # Render everything in memory, then write a single archive
+    rendered = {}
+    failed = []
+    with stats.phase('render', 'generate', patches=len(names)):
+        for name in names:
+            try:
+                content = render_patch(name, context)
+            except Exception as e:
+                failed.append({'patch': name, 'error': str(e)})
+                continue
+            if content:
+                rendered[name] = content
+            else:
+                failed.append({'patch': name, 'error': 'template not found'})
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with stats.phase('bundle', 'generate'):
+        write_bundle(output, rendered)
+    stats.count('patches_written', len(rendered))
+    stats.count('patches_failed', len(failed))
+    write_trace(args, stats)
+    generated = list(rendered)
+    
+    return {
+        'output': str(output),
+        'dsdt': str(args.dsdt) if args.dsdt else None,
+        'generated': generated,
+        'failed': failed
+    }
+
+
+def cmd_export(args):
+    """Export the full parse result (devices, methods, scopes, stats)"""
+    import os
+    from core.export import export_file, write_export
+    
+    parser = load_parser(args.file, not args.no_cache)
+    nodes = True if args.nodes else None
+    
+    if args.output:
+        fmt, compressed, _ = export_file(parser, args.output, args.format,
+                                         True if args.gzip else None, nodes)
+        write_trace(args, parser.stats)
+        return {
+            'file': str(args.file),
+            'output': str(args.output),
+            'format': fmt,
+            'gzip': compressed,
+            'bytes': os.path.getsize(args.output),
+            'stats': parser.get_stats()
+        }
+    
+    # Stream to stdout; nothing is returned for main() to print
+    fmt = args.format or 'json'
+    if args.gzip:
+        import gzip
+        with gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8') as f:
+            write_export(parser, f, fmt, nodes)
+    else:
+        write_export(parser, sys.stdout, fmt, nodes)
+    sys.stdout.flush()
+    write_trace(args, parser.stats)
+    return None
+
+
+def cmd_batch(args):
+    """Analyze every table under a directory, one JSON line per table"""
+    from core.batch import DEFAULT_PATTERNS, BatchStats, find_tables, run_batch
+    
+    patterns = args.pattern or list(DEFAULT_PATTERNS)
+    paths = find_tables(args.directory, patterns, recursive=not args.no_recursive)
+    if not paths:
+        raise CommandError(f"No files matching {', '.join(patterns)} in {args.directory}")
+    
+    stats = BatchStats()
+    profile_dir = args.profile_dir if args.profile else None
+    for result in run_batch(paths, args.workers, args.max_in_flight,
+                            not args.no_cache, stats, profile_dir):
+        sys.stdout.write(json.dumps(result))
+        sys.stdout.write('\n')
+        sys.stdout.flush()
+    
+    # Summary goes to stderr so stdout stays valid NDJSON
+    summary = stats.summary()
+    print(f"{summary['tables']} tables ({summary['failed']} failed), "
+          f"{summary['megabytes']} MB in {summary['seconds']} s: "
+          f"{summary['tables_per_second']} tables/s, "
+          f"{summary['megabytes_per_second']} MB/s", file=sys.stderr)
+    return None
+
+
+TABLE_HELP = 'DSDT .dsl/.aml file, table directory or acpidump output'
+
+
+def build_parser():
+    """Build the argument parser with all subcommands"""
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description='Acpi Analyzer - headless DSDT analysis and SSDT generation'
+    )
+    subparsers = arg_parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+    
+    analyze = subparsers.add_parser('analyze', help=cmd_analyze.__doc__)
+    analyze.add_argument('file', help=TABLE_HELP)
+    analyze.set_defaults(func=cmd_analyze)
+    
+    detect = subparsers.add_parser('detect', help=cmd_detect.__doc__)
+    detect.add_argument('file', help=TABLE_HELP)
+    detect.set_defaults(func=cmd_detect)
+    
+    generate = subparsers.add_parser('generate', help=cmd_generate.__doc__)
+    generate.add_argument('patches', nargs='*',
+                          help='patch names (default: recommended patches)')
+    generate.add_argument('-o', '--output', required=True,
+                          help='output directory (or .zip file with --bundle)')
+    generate.add_argument('--bundle', action='store_true',
+                          help='write all patches into one zip archive at --output')
+    generate.add_argument('--dsdt', help=TABLE_HELP + ' used for path detection')
+    generate.add_argument('--all', action='store_true', help='generate every known patch')
+    generate.add_argument('--force', action='store_true',
+                          help='rewrite every file, even if its content is unchanged')
+    generate.add_argument('-j', '--workers', type=int, default=None,
+                          help='writer threads (default: 8)')
+    generate.set_defaults(func=cmd_generate)
+    
+    export = subparsers.add_parser('export', help=cmd_export.__doc__)
+    export.add_argument('file', help=TABLE_HELP)
+    export.add_argument('-o', '--output', help='write JSON to this file instead of stdout')
+    export.add_argument('--format', choices=('json', 'ndjson'),
+                        help='JSON object or one record per line '
+                             '(default: from the --output extension, else json)')
+    export.add_argument('--gzip', action='store_true',
+                        help='gzip the output (implied by an --output ending in .gz)')
+    export.add_argument('--nodes', action='store_true',
+                        help='include every namespace node (always included in NDJSON)')
+    export.set_defaults(func=cmd_export)
+    
+    batch = subparsers.add_parser('batch', help=cmd_batch.__doc__)
+    batch.add_argument('directory', help='directory containing .dsl or .aml files')
+    batch.add_argument('--pattern', action='append',
+                       help='glob pattern for table files (repeatable, default *.dsl and *.aml)')
+    batch.add_argument('--no-recursive', action='store_true', help='do not descend into subdirectories')
+    batch.add_argument('-j', '--workers', type=int, default=None,
+                       help='worker processes (default: CPU count)')
+    batch.add_argument('--max-in-flight', type=int, default=None,
+                       help='tables queued at once (default: 4 per worker)')
+    batch.set_defaults(func=cmd_batch)
+    
+    for subparser in (analyze, detect, generate, export, batch):
+        subparser.add_argument('--no-cache', action='store_true',
+                               help='always parse, bypassing the parse cache')
+    
+    # Commands that print one JSON result; batch prints NDJSON lines
+    for subparser in (analyze, detect, generate, export):
+        subparser.add_argument('--compact', action='store_true',
+                               help='print JSON on a single line')
+        subparser.add_argument('--trace', metavar='FILE',
+                               help='save per-phase timings as a Chrome trace-event JSON file')
+    
+    for subparser in (analyze, detect, generate, export, batch):
+        subparser.add_argument('--profile', action='store_true',
+                               help='run under cProfile; save .pstats and .collapsed stacks')
+        subparser.add_argument('--profile-dir', default='profiles',
+                               help='directory for --profile output (default: ./profiles)')
+    
+    return arg_parser
+
+
+def run_command(args):
+    """Run the chosen command, under the profiler with --profile
+
+    Profiles are named after the command and a hash of its input file
+    (the DSDT, table folder or batch directory).
+    """
+    if not args.profile:
+        return args.func(args)
+    
+    from core.profiling import Profiler
+    
+    source = getattr(args, 'file', None) or getattr(args, 'dsdt', None) or getattr(args, 'directory', None)
+    with Profiler(args.command, source, args.profile_dir) as profiler:
+        result = args.func(args)
+    for path in profiler.paths:
+        print(f"Profile saved to {path}", file=sys.stderr)
+    return result
+
+
+def main(argv=None):
+    """Run the CLI; returns the process exit code
+
+    The code is 1 if the command raised CommandError, or if its result
+    lists anything under 'failed' (patches that could not be generated).
+    """
+    args = build_parser().parse_args(argv)
+    
+    try:
+        result = run_command(args)
+    except CommandError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    if result is not None:
+        json.dump(result, sys.stdout, indent=None if getattr(args, 'compact', False) else 2)
+        sys.stdout.write('\n')
+        if result.get('failed'):
+            return 1
+    return 0
@@ -0,0 +1,243 @@
+"""Single-pass tokenizer for ACPI DSL files"""
+
+import re
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+
+# Declaration keywords emitted by the lexer
+TOKEN_KINDS = (
+    'Device', 'Method', 'Scope', 'Name', 'Processor',
+    'OperationRegion', 'Field', 'External', 'ThermalZone', 'PowerResource',
+)
+
+Token = namedtuple('Token', ['kind', 'name', 'offset', 'value'])
+
+# The pattern is anchored on the literal "(" so the regex engine can use its
+# fast literal search. A single fixed-width lookbehind then checks the last
+# three letters of the keyword in front of it (unique for every keyword); the
+# rest of the keyword and the word boundary are verified in tokenize(),
+# which is much cheaper than a full lookbehind per keyword. The first
+# literal argument after the name (the value of Name(_HID, ...)) is read
+# by the same match.
+_KIND_BY_SUFFIX = {kind[-3:]: kind for kind in TOKEN_KINDS}
+
+_TOKEN_PATTERN = r'''
+    \((?:(?<=%s)|(?<=%s))
+    \s*(?P<name>[\\^]*[A-Z0-9_.]*)(?=\s*[,)])
+    (?:\s*,\s*(?:EisaId\s*\(\s*)?
+       (?P<value>"[^"\n]*"|0x[0-9A-Fa-f]+|(?:Zero|Ones|One)\b))?
+''' % (
+    '|'.join(r'%s\ \(' % suffix for suffix in _KIND_BY_SUFFIX),
+    '|'.join(r'%s\(' % suffix for suffix in _KIND_BY_SUFFIX),
+)
+
+# Name argument following the "(" of a declaration
+_NAME_PATTERN = r'\s*([\\^]*[A-Z0-9_.]*)'
+
+TOKEN_RE = re.compile(_TOKEN_PATTERN, re.VERBOSE)
+NAME_RE = re.compile(_NAME_PATTERN)
+
+# Bytes variants, used on memory-mapped files without decoding them
+TOKEN_BYTES_RE = re.compile(_TOKEN_PATTERN.encode('ascii'), re.VERBOSE)
+NAME_BYTES_RE = re.compile(_NAME_PATTERN.encode('ascii'))
+
+_KIND_BY_SUFFIX_BYTES = {suffix.encode('ascii'): kind for suffix, kind in _KIND_BY_SUFFIX.items()}
+_KEYWORD_BYTES = {kind: kind.encode('ascii') for kind in TOKEN_KINDS}
+_WORD_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_'
+_WORD = frozenset(_WORD_CHARS)
+_WORD_BYTES = frozenset(_WORD_CHARS.encode('ascii'))
+
+_OPEN_BRACE_RE = re.compile(r'\{')
+_CLOSE_BRACE_RE = re.compile(r'\}')
+_OPEN_BRACE_BYTES_RE = re.compile(rb'\{')
+_CLOSE_BRACE_BYTES_RE = re.compile(rb'\}')
+_match_start = re.Match.start
+
+
+def tokenize(content, counters=None, braces=None):
+    """Yield (kind, name, offset, value) tokens from DSL content in one regex pass
+
+    content may be a str or a bytes-like buffer (bytes, mmap); buffers are
+    scanned with bytes patterns and only the matched names are decoded.
+    Given the content's BraceIndex, the scan jumps over method bodies, like
+    AMLReader does: objects a method creates only exist while it runs.
+    With a counters dict (RunStats.counters), the bytes scanned and the
+    regex scans and matches are added to it once all tokens are read.
+    """
+    close_after = braces.close_after if braces is not None else None
+    if isinstance(content, str):
+        return _tokenize_text(content, counters, close_after)
+    return _tokenize_bytes(content, counters, close_after)
+
+
+def _add_counts(counters, scanned, token_matches, value_matches):
+    """Add one tokenizer pass to a counters dict"""
+    for name, amount in (('bytes_scanned', scanned), ('regex_scans', 1),
+                         ('token_matches', token_matches), ('value_matches', value_matches)):
+        counters[name] = counters.get(name, 0) + amount
+
+
+def _tokenize_text(content, counters=None, close_after=None):
+    """Tokenize decoded DSL text"""
+    search = TOKEN_RE.search
+    find = content.find
+    rfind = content.rfind
+    startswith = content.startswith
+    kind_by_suffix = _KIND_BY_SUFFIX
+    word = _WORD
+    token_matches = value_matches = skipped = 0
+    position = 0
+
+    while True:
+        match = search(content, position)
+        if match is None:
+            break
+        token_matches += 1
+        end = match.start()
+        position = match.end()
+        if content[end - 1] == ' ':
+            end -= 1
+        kind = kind_by_suffix[content[end - 3:end]]
+        offset = end - len(kind)
+
+        # Keyword must start a word, not end a longer identifier
+        if not startswith(kind, offset) or (offset and content[offset - 1] in word):
+            continue
+
+        # Skip declarations that are commented out with //
+        if find('//', rfind('\n', 0, offset) + 1, offset) != -1:
+            continue
+
+        name, value = match.groups()
+        if kind == 'Name':
+            if value is not None:
+                value_matches += 1
+                if value[0] == '"':
+                    value = value[1:-1]
+        else:
+            value = None
+            if kind == 'Method' and close_after is not None:
+                close = close_after(offset)
+                if close is not None and close > position:
+                    skipped += close - position
+                    position = close
+
+        yield (kind, name, offset, value)
+
+    if counters is not None:
+        _add_counts(counters, len(content) - skipped, token_matches, value_matches)
+
+
+def _tokenize_bytes(buffer, counters=None, close_after=None):
+    """Tokenize an undecoded DSL buffer (bytes or mmap)"""
+    search = TOKEN_BYTES_RE.search
+    find = buffer.find
+    rfind = buffer.rfind
+    kind_by_suffix = _KIND_BY_SUFFIX_BYTES
+    keywords = _KEYWORD_BYTES
+    word_bytes = _WORD_BYTES
+    token_matches = value_matches = skipped = 0
+    position = 0
+
+    while True:
+        match = search(buffer, position)
+        if match is None:
+            break
+        token_matches += 1
+        end = match.start()
+        position = match.end()
+        if buffer[end - 1] == 0x20:
+            end -= 1
+        kind = kind_by_suffix[buffer[end - 3:end]]
+        offset = end - len(kind)
+        if buffer[offset:end] != keywords[kind]:
+            continue
+
+        if offset and buffer[offset - 1] in word_bytes:
+            continue
+
+        if find(b'//', rfind(b'\n', 0, offset) + 1, offset) != -1:
+            continue
+
+        name, value = match.groups()
+        if kind == 'Name':
+            if value is not None:
+                value_matches += 1
+                value = value.decode('ascii', 'ignore')
+                if value[0] == '"':
+                    value = value[1:-1]
+        else:
+            value = None
+            if kind == 'Method' and close_after is not None:
+                close = close_after(offset)
+                if close is not None and close > position:
+                    skipped += close - position
+                    position = close
+
+        yield (kind, name.decode('ascii'), offset, value)
+
+    if counters is not None:
+        _add_counts(counters, len(buffer) - skipped, token_matches, value_matches)
+
+
+def read_name(content, offset):
+    """Read the name argument of the declaration starting at offset"""
+    if isinstance(content, str):
+        return NAME_RE.match(content, content.find('(', offset) + 1).group(1)
+    match = NAME_BYTES_RE.match(content, content.find(b'(', offset) + 1)
+    return match.group(1).decode('ascii')
+
+
+class BraceIndex:
+    """Offsets of every '{' and of its matching '}'
+
+    Both brace kinds are located with literal searches and paired in one
+    merge pass. Unbalanced opening braces close at the end of the content.
+    Text keeps them in lists, which pair faster; byte buffers, used for
+    files too large to decode, in flat arrays.
+    """
+
+    __slots__ = ('opens', 'closes')
+
+    def __init__(self, content):
+        end = len(content)
+        if isinstance(content, str):
+            opens = list(map(_match_start, _OPEN_BRACE_RE.finditer(content)))
+            closes = [end] * len(opens)
+            close_re = _CLOSE_BRACE_RE
+        else:
+            opens = array('q', map(_match_start, _OPEN_BRACE_BYTES_RE.finditer(content)))
+            closes = array('q', [end]) * len(opens)
+            close_re = _CLOSE_BRACE_BYTES_RE
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        open_count = len(opens)
+        i = 0
+        for close in map(_match_start, close_re.finditer(content)):
+            while i < open_count and opens[i] < close:
+                push(i)
+                i += 1
+            if stack:
+                closes[pop()] = close
+
+        self.opens = opens
+        self.closes = closes
+
+    def close_after(self, offset):
+        """Offset of the '}' matching the first '{' at or after offset, or None"""
+        i = bisect_left(self.opens, offset)
+        if i == len(self.opens):
+            return None
+        return self.closes[i]
+
+    def __len__(self):
+        return len(self.opens)
+
+
+def match_braces(content):
+    """Build the BraceIndex of content (str or bytes-like buffer)"""
+    return BraceIndex(content)
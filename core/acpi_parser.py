@@ -1,92 +1,367 @@
 """ACPI file parsing and analysis"""
 
-import re
+import mmap
+import os
+import sys
+from functools import partial
+
+from .acpi_lexer import tokenize, match_braces, read_name
+from .aml_reader import AMLReader, is_aml
+from .namespace import Namespace, SCOPE_KINDS
+from .detection import DetectionIndex
+from .device_index import DeviceIndex
+from .records import LazyRecords, DeviceRecord, MethodRecord, ScopeRecord, ProcessorRecord
+from .incremental import BlockTracker, reparse
+from .instrumentation import RunStats
+
+
+# Files at least this large are memory-mapped and parsed as bytes
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# Extensions of binary AML tables (iasl/acpidump output)
+AML_EXTENSIONS = ('.aml', '.dat')
+
+# Bump whenever parse results change, so cached results are not reused
+PARSER_VERSION = '6'
+
+# Device attributes set by Name() objects in the device's scope
+DEVICE_VALUES = {'_HID': 'hid', '_CID': 'cid', '_ADR': 'adr'}
+
+# Tokens between progress callbacks / cancellation checks
+PROGRESS_INTERVAL = 256
+
+
+class ParseCancelled(Exception):
+    """Raised when a parse is cancelled through its cancel event"""
 
 
 class ACPIParser:
-    """Parse and analyze ACPI tables"""
+    """Parse and analyze ACPI tables
+
+    With track_blocks, text parses also cut the file into top-level
+    blocks, so refresh() can re-parse only the blocks an edit touched.
+    """
     
-    def __init__(self):
+    def __init__(self, track_blocks=False):
+        self.track_blocks = track_blocks
         self.devices = []
         self.methods = []
         self.scopes = []
+        self.processors = []
+        self.namespace = Namespace()
+        self.detection_index = None
+        self.device_index = None
+        self.device_paths = None
+        self.tables = []
+        self.aml_errors = []
+        self.blocks = None
+        self.revision = 0
         self.current_file = None
         self.content = None
+        self.stats = RunStats()
     
-    def parse_file(self, filepath):
-        """Parse an ACPI DSL file"""
-        self.current_file = filepath
-        self.devices = []
-        self.methods = []
-        self.scopes = []
-        
+    def parse_file(self, filepath, use_mmap=None, progress=None, cancel=None):
+        """Parse an ACPI DSL file or a binary AML table (DSDT/SSDT)
+
+        AML is recognized by its .aml/.dat extension or table header and
+        is read directly, without disassembling it. With use_mmap=None,
+        files of MMAP_THRESHOLD bytes or more are memory-mapped and
+        scanned as bytes instead of being decoded.
+        progress(offset, total) is called periodically with the current
+        byte offset; setting the cancel event (threading.Event) aborts the
+        parse with ParseCancelled. Phase timings go to a new self.stats.
+        """
+        self._reset(filepath)
+        
+        parsed = False
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                self.content = f.read()
+            size = os.path.getsize(filepath)
+            if use_mmap is None:
+                use_mmap = size >= MMAP_THRESHOLD
+            
+            binary = self._is_aml_file(filepath)
+            with self.stats.phase('read', bytes=size, mmap=bool(use_mmap and size)):
+                if use_mmap and size:
+                    with open(filepath, 'rb') as f:
+                        self.content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                elif binary:
+                    with open(filepath, 'rb') as f:
+                        self.content = f.read()
+                else:
+                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                        self.content = f.read()
+            self.stats.count('bytes_read', size)
             
-            self._extract_devices(self.content)
-            self._extract_methods(self.content)
-            self._extract_scopes(self.content)
+            if binary:
+                self._extract_aml(self.content, progress, cancel)
+            else:
+                self._extract_declarations(self.content, progress, cancel)
             
+            parsed = True
+            return True
+        except ParseCancelled:
+            raise
+        except Exception as e:
+            print(f"Error parsing {filepath}: {e}", file=sys.stderr)
+            return False
+        finally:
+            # A failed or cancelled parse must not keep the file mapped
+            if not parsed:
+                self.close()
+    
+    def parse_bytes(self, data, source=None):
+        """Parse a table already in memory: AML if it has a table header, else DSL"""
+        self._reset(source)
+        try:
+            if is_aml(data):
+                self.content = data
+                self._extract_aml(data)
+            else:
+                self.content = bytes(data).decode('utf-8', errors='ignore')
+                self._extract_declarations(self.content)
             return True
         except Exception as e:
-            print(f"Error parsing {filepath}: {e}")
+            print(f"Error parsing {source or 'table'}: {e}", file=sys.stderr)
             return False
     
-    def _extract_devices(self, content):
-        """Extract device definitions"""
-        # Match Device (NAME) { ... }
-        device_pattern = r'Device\s*\(([A-Z0-9_]+)\)'
-        matches = re.finditer(device_pattern, content)
+    def _reset(self, filepath):
+        """Drop the results of the previous parse"""
+        self.close()
+        self.current_file = filepath
+        self.devices = []
+        self.methods = []
+        self.scopes = []
+        self.processors = []
+        self.namespace = Namespace()
+        self.detection_index = None
+        self.device_index = None
+        self.device_paths = None
+        self.tables = []
+        self.aml_errors = []
+        self.blocks = None
+        self.stats = RunStats()
+    
+    def refresh(self, full=True):
+        """Bring the parse up to date with current_file after it changed on disk
+        
+        A text parse made with track_blocks is updated in place: only the
+        top-level blocks whose text changed are parsed again, and only the
+        detection roles their objects take part in are resolved again.
+        Other parses, and edits
+        that cannot be spliced, get a full parse, or none with full=False.
+        Returns a summary dict whose 'mode' is 'incremental' or 'full', or
+        None if the file was not parsed.
+        """
+        filepath = self.current_file
+        summary = None
+        if self.blocks is not None and isinstance(self.content, str):
+            try:
+                if os.path.getsize(filepath) < MMAP_THRESHOLD and not self._is_aml_file(filepath):
+                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read()
+                    self.stats = RunStats()
+                    with self.stats.phase('refresh', bytes=len(content)):
+                        summary = reparse(self, content)
+            except Exception as e:
+                # The splice may have stopped halfway; only a full parse is safe now
+                print(f"Incremental parse of {filepath} failed: {e}", file=sys.stderr)
+                self.blocks = None
+                summary = None
+            if summary is not None:
+                self.content = content
+                self.device_index = None
+                self.revision += 1
+                summary['mode'] = 'incremental'
+                return summary
+        
+        if not full or not self.parse_file(filepath):
+            return None
+        self.revision += 1
+        return {'mode': 'full'}
+    
+    def close(self):
+        """Release the memory-mapped file of the last parse, if any"""
+        if isinstance(self.content, mmap.mmap):
+            self.content.close()
+        self.content = None
+    
+    @staticmethod
+    def _is_aml_file(filepath):
+        """Check the extension, then the table header, for binary AML"""
+        if str(filepath).lower().endswith(AML_EXTENSIONS):
+            return True
+        with open(filepath, 'rb') as f:
+            return is_aml(f.read(64))
+    
+    def _extract_aml(self, content, progress=None, cancel=None):
+        """Extract declarations from binary AML tables"""
+        reader = AMLReader(content)
+        self.stats.count('aml_bytes_decoded', len(content))
+        self._extract_declarations(content, progress, cancel, tokens=reader.tokens(),
+                                   close_after=reader.ends.get)
+        self.tables = reader.tables
+        self.aml_errors = reader.errors
+        if reader.errors:
+            start, end, error = reader.errors[0]
+            print(f"Skipped {len(reader.errors)} undecodable AML block(s), "
+                  f"first at offsets {start}-{end}: {error}", file=sys.stderr)
+    
+    def _extract_declarations(self, content, progress=None, cancel=None, tokens=None,
+                              close_after=None):
+        """Extract declarations and build the namespace tree in one token pass
+
+        Text content produces Records. Byte buffers (mmap) produce
+        LazyRecords holding offsets or nodes; names are decoded on access.
+        For AML, tokens and close_after (offset -> end of body) come from
+        the AMLReader, and records are always Records. With track_blocks,
+        text content is also cut into top-level SourceBlocks for refresh().
+        """
+        lazy = tokens is None and not isinstance(content, str)
+        tracker = None
+        if tokens is None:
+            with self.stats.phase('braces', bytes=len(content)):
+                braces = match_braces(content)
+            self.stats.count('regex_scans', 2)
+            tokens = tokenize(content, self.stats.counters, braces)
+            close_after = braces.close_after
+            if self.track_blocks and not lazy:
+                tracker = BlockTracker(self)
+        
+        index = None
+        if lazy:
+            self.devices = LazyRecords(_device_record)
+            self.methods = LazyRecords(partial(_method_record, content), offsets=True)
+            self.scopes = LazyRecords(partial(_scope_record, content), offsets=True)
+        else:
+            index = DeviceIndex(self.devices)
+        
+        if progress is not None or cancel is not None:
+            tokens = _track_progress(tokens, len(content), progress, cancel)
         
-        for match in matches:
-            device_name = match.group(1)
-            start_pos = match.start()
+        try:
+            # Tokens are produced as they are consumed, so this includes the
+            # regex (or AML decoding) pass
+            with self.stats.phase('declare', bytes=len(content)) as phase:
+                self._declare(tokens, close_after, len(content), lazy, tracker, index=index)
+                if tracker is not None:
+                    self.blocks = tracker.finish(len(content))
+                phase['nodes'] = len(self.namespace)
+        finally:
+            self.namespace.journal = None
+        self.device_index = index
+    
+    def _declare(self, tokens, close_after, end, lazy=False, tracker=None, device_records=None,
+                 index=None):
+        """Declare tokens that start at the root scope and add their records
+        
+        end is the offset where the root scope closes. With a BlockTracker,
+        top-level tokens start new blocks and every _HID/_CID/_ADR Name() is noted.
+        With a DeviceIndex, new device records and their values are indexed.
+        """
+        namespace = self.namespace
+        intern = sys.intern
+        if device_records is None:
+            device_records = {}
+        
+        # Open scopes as (offset of closing brace, node); the root never closes
+        open_scopes = [(end, namespace.root)]
+        
+        for kind, name, offset, value in tokens:
+            if kind == 'Field':
+                # Field units are declared inside the braces; not tracked
+                continue
+            while open_scopes[-1][0] < offset:
+                open_scopes.pop()
+            scope = open_scopes[-1][1]
+            if tracker is not None and len(open_scopes) == 1:
+                tracker.split(offset)
             
-            # Try to find _HID or _ADR
-            context = content[start_pos:start_pos+500]
-            hid_match = re.search(r'_HID,?\s*"?([A-Z0-9]+)"?', context)
-            adr_match = re.search(r'_ADR,?\s*(0x[0-9A-Fa-f]+)', context)
+            # Names and values repeat a lot (_STA, _HID, Zero); keep one copy
+            name = intern(name)
+            if value is not None:
+                value = intern(value)
+            node = namespace.declare(kind, name, scope, offset)
+            # Method bodies are skipped by every token source, so nothing
+            # is ever declared inside one
+            if kind in SCOPE_KINDS and kind != 'Method':
+                close = close_after(offset)
+                if close is not None:
+                    open_scopes.append((close, node))
             
-            device_info = {
-                'name': device_name,
-                'hid': hid_match.group(1) if hid_match else None,
-                'adr': adr_match.group(1) if adr_match else None,
-                'position': start_pos
-            }
-            self.devices.append(device_info)
-    
-    def _extract_methods(self, content):
-        """Extract method definitions"""
-        # Match Method (NAME, ...) { ... }
-        method_pattern = r'Method\s*\(([A-Z0-9_]+)'
-        matches = re.finditer(method_pattern, content)
-        
-        for match in matches:
-            self.methods.append({
-                'name': match.group(1),
-                'position': match.start()
-            })
-    
-    def _extract_scopes(self, content):
-        """Extract scope definitions"""
-        # Match Scope (\_SB.PCI0.XXX) { ... }
-        scope_pattern = r'Scope\s*\(([\\._A-Z0-9]+)\)'
-        matches = re.finditer(scope_pattern, content)
-        
-        for match in matches:
-            self.scopes.append({
-                'path': match.group(1),
-                'position': match.start()
-            })
+            if kind == 'Device' and lazy:
+                self.devices.append(node)
+            
+            elif kind == 'Device':
+                device = DeviceRecord(name, None, None, None, offset, node.path)
+                device_records[node] = device
+                self.devices.append(device)
+                if index is not None:
+                    index.add(device)
+            
+            elif kind == 'Name':
+                if tracker is not None and name in DEVICE_VALUES:
+                    tracker.value(scope, DEVICE_VALUES[name], value, offset)
+                # _HID/_CID/_ADR describe the enclosing Device
+                field = DEVICE_VALUES.get(name)
+                if field is not None and scope.kind == 'Device' and getattr(scope, field) is None:
+                    setattr(scope, field, value)
+                    # Lazy device records read their values from the node
+                    device = device_records.get(scope)
+                    if device is not None:
+                        device[field] = value
+                        if index is not None:
+                            index.set(device, field, value)
+            
+            elif kind == 'Method' and lazy:
+                self.methods.append(offset)
+            
+            elif kind == 'Method':
+                self.methods.append(MethodRecord(name, offset))
+            
+            elif kind == 'Scope' and lazy:
+                self.scopes.append(offset)
+            
+            elif kind == 'Scope':
+                self.scopes.append(ScopeRecord(name, offset))
+            
+            elif kind == 'Processor':
+                self.processors.append(ProcessorRecord(name, offset, node.path))
+    
+    def get_device_index(self):
+        """Get the HID/CID/name/_ADR index of device records
+        
+        Text and AML parses build it in the declaration pass. Memory-mapped
+        parses (whose records are decoded on access), table sets, cache hits
+        and refresh() leave it to be built here, on first use.
+        """
+        if self.device_index is None:
+            with self.stats.phase('device_index', 'analyze'):
+                self.device_index = DeviceIndex(self.devices)
+        return self.device_index
     
     def find_device_by_hid(self, hid):
         """Find devices with specific HID"""
-        return [d for d in self.devices if d.get('hid') == hid]
+        return self.get_device_index().find('hid', hid)
+    
+    def find_device_by_cid(self, cid):
+        """Find devices with specific compatible ID (first _CID)"""
+        return self.get_device_index().find('cid', cid)
     
     def find_device_by_name(self, name):
         """Find device by name"""
-        return [d for d in self.devices if d.get('name') == name]
+        return self.get_device_index().find('name', name)
+    
+    def find_device_by_adr(self, adr):
+        """Find devices with specific _ADR, as written (0x001F0000, Zero)"""
+        return self.get_device_index().find('adr', adr)
+    
+    def find_device_by_hid_prefix(self, prefix):
+        """Find devices whose HID starts with prefix (e.g. a vendor ID)"""
+        return self.get_device_index().find_hid_prefix(prefix)
+    
+    def find_device_by_name_part(self, part):
+        """Find devices whose name contains part (e.g. BAT)"""
+        return self.get_device_index().find_name_part(part)
     
     def get_all_devices(self):
         """Get all discovered devices"""
@@ -96,232 +371,113 @@ class ACPIParser:
         """Get total device count"""
         return len(self.devices)
     
+    def get_stats(self):
+        """Get device, method, scope and namespace node counts"""
+        return {
+            'device_count': len(self.devices),
+            'method_count': len(self.methods),
+            'scope_count': len(self.scopes),
+            'namespace_node_count': len(self.namespace)
+        }
+    
     def export_to_dict(self):
-        """Export parsed data to dictionary"""
+        """Export parsed data to dictionary, with the run's phase timings
+        
+        Builds every record as a dict at once; core.export streams the
+        same data to a file instead.
+        """
         return {
             'file': str(self.current_file) if self.current_file else None,
-            'devices': self.devices,
-            'methods': self.methods,
-            'scopes': self.scopes,
-            'stats': {
-                'device_count': len(self.devices),
-                'method_count': len(self.methods),
-                'scope_count': len(self.scopes)
-            }
+            'devices': [dict(d) for d in self.devices],
+            'methods': [dict(m) for m in self.methods],
+            'scopes': [dict(s) for s in self.scopes],
+            'tables': list(self.tables),
+            'stats': self.get_stats(),
+            'instrumentation': self.stats.to_dict()
         }
     
+    def get_detection_index(self):
+        """Get the name/HID detection index, built once per parse"""
+        if self.detection_index is None:
+            with self.stats.phase('detection_index', 'analyze'):
+                self.detection_index = DetectionIndex(self.namespace, self.tables)
+        return self.detection_index
+    
     def find_pci_root(self):
         """Find PCI root device (PCI0, PC00, PCIO, etc.)"""
-        if not self.content:
-            return None
-        
-        # Common PCI root names
-        pci_names = ['PCI0', 'PC00', 'PCIO', 'PCI1', 'PCIE']
-        
-        for name in pci_names:
-            # Look for Device (NAME) or Scope (\_SB.NAME)
-            pattern = rf'(?:Device|Scope)\s*\((?:[\\._]*SB[\\._])?({name})\)'
-            match = re.search(pattern, self.content)
-            if match:
-                return f"_SB.{name}"
-        
-        return None
+        return self.get_device_paths()['pci_root']
     
     def find_lpc_bridge(self):
         """Find LPC bridge device (LPCB, LPC0, SBRG, etc.)"""
-        if not self.content:
-            return None
-        
-        # Common LPC bridge names
-        lpc_names = ['LPCB', 'LPC0', 'LPC', 'SBRG', 'LPCB0']
-        pci_root = self.find_pci_root()
-        
-        if not pci_root:
-            return None
-        
-        for name in lpc_names:
-            # Look for Device under PCI root
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return f"{pci_root}.{name}"
-        
-        return None
+        return self.get_device_paths()['lpc_bridge']
     
     def find_gpu_device(self):
         """Find GPU device (GFX0, IGPU, VID, VGA, etc.)"""
-        if not self.content:
-            return None
-        
-        # Common GPU names
-        gpu_names = ['GFX0', 'IGPU', 'VID', 'VGA', 'GFX', 'VID0']
-        pci_root = self.find_pci_root()
-        
-        if not pci_root:
-            return None
-        
-        for name in gpu_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return f"{pci_root}.{name}"
-        
-        return None
+        return self.get_device_paths()['gpu_device']
     
     def find_cpu_path(self):
         """Find CPU processor path (_PR.CPU0, _SB.PR00, _SB.CP00, etc.)"""
-        if not self.content:
-            return None
-        
-        # Look for Processor declarations
-        # Pattern: Processor (CPU0, 0x01, 0x00000410, 0x06)
-        processor_pattern = r'Processor\s*\(([A-Z0-9]+),'
-        match = re.search(processor_pattern, self.content)
-        if match:
-            cpu_name = match.group(1)
-            # Check if it's under _PR or _SB
-            if re.search(rf'Scope\s*\([\\._]*PR\)', self.content):
-                return f"_PR.{cpu_name}"
-            elif re.search(rf'Scope\s*\([\\._]*SB\)', self.content):
-                return f"_SB.{cpu_name}"
-            return f"_PR.{cpu_name}"
-        
-        # Look for Device-based CPU (newer ACPI)
-        cpu_names = ['CPU0', 'CP00', 'PR00', 'C000', 'P000']
-        for name in cpu_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                if re.search(rf'Scope\s*\([\\._]*PR\)', self.content):
-                    return f"_PR.{name}"
-                return f"_SB.{name}"
-        
-        return None
+        return self.get_device_paths()['cpu_path']
     
     def find_usb_controller(self):
         """Find USB controller (XHC, XHCI, XHC1, EHC1, EHC2, etc.)"""
-        if not self.content:
-            return None
-        
-        # Common USB controller names
-        usb_names = ['XHC', 'XHCI', 'XHC1', 'XHC0', 'XHCX', 'EHC1', 'EHC2']
-        pci_root = self.find_pci_root()
-        
-        if not pci_root:
-            return None
-        
-        for name in usb_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return f"{pci_root}.{name}"
-        
-        return None
+        return self.get_device_paths()['usb_controller']
     
     def find_smbus(self):
         """Find SMBus device (SBUS, SMBU, SMBS, etc.)"""
-        if not self.content:
-            return None
-        
-        # Common SMBus names
-        smbus_names = ['SBUS', 'SMBU', 'SMBS', 'SBUS0', 'SMBU0']
-        pci_root = self.find_pci_root()
-        
-        if not pci_root:
-            return None
-        
-        for name in smbus_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return f"{pci_root}.{name}"
-        
-        return None
+        return self.get_device_paths()['smbus']
     
     def find_ec_device(self):
-        """Find existing Embedded Controller device"""
-        if not self.content:
-            return None
-        
-        # Look for devices with EC-related HID
-        ec_hids = ['PNP0C09']
-        for hid in ec_hids:
-            devices = self.find_device_by_hid(hid)
-            if devices:
-                return devices[0]['name']
-        
-        # Look for common EC device names
-        ec_names = ['EC0', 'EC', 'H_EC', 'ECDV', 'PGEC']
-        for name in ec_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return name
+        """Find existing Embedded Controller device
         
-        return None
+        Returns its full path (_SB.PCI0.LPCB.EC0), like every other role;
+        the regex parser returned only the name (EC0).
+        """
+        return self.get_device_paths()['ec_device']
     
     def find_battery_device(self):
-        """Find battery device"""
-        if not self.content:
-            return None
-        
-        # Look for devices with battery HID
-        battery_hids = ['PNP0C0A']
-        for hid in battery_hids:
-            devices = self.find_device_by_hid(hid)
-            if devices:
-                return devices[0]['name']
-        
-        # Look for common battery names
-        battery_names = ['BAT0', 'BAT1', 'BATC', 'BATT']
-        for name in battery_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return name
-        
-        return None
+        """Find battery device, as a full path (_SB.BAT0) like find_ec_device"""
+        return self.get_device_paths()['battery_device']
     
     def find_hpet_device(self):
         """Find HPET device"""
-        if not self.content:
-            return None
-        
-        lpc_bridge = self.find_lpc_bridge()
-        if not lpc_bridge:
-            return None
-        
-        # Look for HPET device
-        hpet_names = ['HPET', 'HPE0', 'HPET0']
-        for name in hpet_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return f"{lpc_bridge}.{name}"
-        
-        return None
+        return self.get_device_paths()['hpet_device']
     
     def find_gpio_device(self):
         """Find GPIO device (GPI0, GPIO, etc.)"""
-        if not self.content:
-            return None
-        
-        pci_root = self.find_pci_root()
-        if not pci_root:
-            return None
-        
-        # Common GPIO names
-        gpio_names = ['GPI0', 'GPIO', 'GPI1']
-        for name in gpio_names:
-            pattern = rf'Device\s*\({name}\)'
-            if re.search(pattern, self.content):
-                return f"{pci_root}.{name}"
-        
-        return None
+        return self.get_device_paths()['gpio_device']
     
     def get_device_paths(self):
-        """Get all detected device paths"""
-        return {
-            'pci_root': self.find_pci_root(),
-            'lpc_bridge': self.find_lpc_bridge(),
-            'gpu_device': self.find_gpu_device(),
-            'cpu_path': self.find_cpu_path(),
-            'usb_controller': self.find_usb_controller(),
-            'smbus': self.find_smbus(),
-            'ec_device': self.find_ec_device(),
-            'battery_device': self.find_battery_device(),
-            'hpet_device': self.find_hpet_device(),
-            'gpio_device': self.find_gpio_device()
-        }
+        """Get all detected device paths (computed once per parse)"""
+        if self.device_paths is None:
+            with self.stats.phase('detect', 'analyze'):
+                self.device_paths = self.get_detection_index().detect()
+        return dict(self.device_paths)
+
+
+def _track_progress(tokens, total, progress, cancel):
+    """Pass tokens through, reporting progress and checking for cancellation"""
+    for count, token in enumerate(tokens):
+        if count % PROGRESS_INTERVAL == 0:
+            if cancel is not None and cancel.is_set():
+                raise ParseCancelled()
+            if progress is not None:
+                progress(token[2], total)
+        yield token
+    if progress is not None:
+        progress(total, total)
+
+
+def _device_record(node):
+    """Build a device record from its namespace node"""
+    return DeviceRecord(node.name, node.hid, node.cid, node.adr, node.offset, node.path)
+
+
+def _method_record(content, offset):
+    """Build a method record, decoding its name from the buffer"""
+    return MethodRecord(read_name(content, offset), offset)
+
+
+def _scope_record(content, offset):
+    """Build a scope record, decoding its path from the buffer"""
+    return ScopeRecord(read_name(content, offset), offset)
@@ -0,0 +1,474 @@
+"""Reader for binary AML tables (DSDT/SSDT) without disassembling them
+
+Walks the AML opcode stream of each DefinitionBlock and produces the same
+declaration tokens as the DSL lexer, so ACPIParser builds its records and
+namespace the same way for .aml and .dsl input. Works on bytes and on
+memory-mapped files; only names and _HID/_CID/_ADR values are decoded.
+"""
+
+import struct
+
+from .acpi_lexer import Token
+from .namespace import normalize_segment
+
+
+# Standard ACPI table header (ACPI spec 5.2.6)
+TABLE_HEADER = struct.Struct('<4sIBB6s8sI4sI')
+TABLE_HEADER_SIZE = TABLE_HEADER.size
+
+# Tables whose body is an AML TermList
+AML_SIGNATURES = (b'DSDT', b'SSDT', b'PSDT')
+
+EXT_OP_PREFIX = 0x5B
+ROOT_CHAR = 0x5C
+PARENT_PREFIX_CHAR = 0x5E
+DUAL_NAME_PREFIX = 0x2E
+MULTI_NAME_PREFIX = 0x2F
+
+# ExternalOp object type for methods
+METHOD_OBJECT_TYPE = 8
+
+# Operand layouts of opcodes that are only skipped. T = TermArg,
+# S = SuperName, R = Target, N = NameString, B/W/D/Q = 1/2/4/8 data bytes
+_OPERANDS = {
+    0x00: '', 0x01: '', 0xFF: '',                               # Zero, One, Ones
+    0x06: 'NN',                                                 # Alias
+    0x70: 'TS', 0x71: 'S', 0x72: 'TTR', 0x73: 'TTR', 0x74: 'TTR',
+    0x75: 'S', 0x76: 'S', 0x77: 'TTR', 0x78: 'TTRR', 0x79: 'TTR',
+    0x7A: 'TTR', 0x7B: 'TTR', 0x7C: 'TTR', 0x7D: 'TTR', 0x7E: 'TTR',
+    0x7F: 'TTR', 0x80: 'TR', 0x81: 'TR', 0x82: 'TR', 0x83: 'T',
+    0x84: 'TTR', 0x85: 'TTR', 0x86: 'ST', 0x87: 'S', 0x88: 'TTR',
+    0x89: 'TBTBTT', 0x8A: 'TTN', 0x8B: 'TTN', 0x8C: 'TTN', 0x8D: 'TTN',
+    0x8E: 'S', 0x8F: 'TTN', 0x90: 'TT', 0x91: 'TT', 0x92: 'T',
+    0x93: 'TT', 0x94: 'TT', 0x95: 'TT', 0x96: 'TR', 0x97: 'TR',
+    0x98: 'TR', 0x99: 'TR', 0x9C: 'TTR', 0x9D: 'TS', 0x9E: 'TTTR',
+    0x9F: '', 0xA3: '', 0xA4: 'T', 0xA5: '', 0xCC: '',
+}
+for _opcode in range(0x60, 0x6F):                               # Local0-7, Arg0-6
+    _OPERANDS[_opcode] = ''
+
+_EXT_OPERANDS = {
+    0x01: 'NB', 0x02: 'N', 0x12: 'SR', 0x13: 'TTTN', 0x1F: 'TTTTTT',
+    0x20: 'NS', 0x21: 'T', 0x22: 'T', 0x23: 'SW', 0x24: 'S', 0x25: 'ST',
+    0x26: 'S', 0x27: 'S', 0x28: 'TR', 0x29: 'TR', 0x2A: 'S', 0x30: '',
+    0x31: '', 0x32: 'BDT', 0x33: '', 0x88: 'NTTT',
+}
+
+_DATA_SIZES = {'B': 1, 'W': 2, 'D': 4, 'Q': 8}
+
+# Opcodes followed by a PkgLength that covers the whole object
+_PACKAGE_OPS = frozenset((0x11, 0x12, 0x13))
+_EXT_PACKAGE_OPS = frozenset((0x81, 0x86, 0x87))               # Field, IndexField, BankField
+_BLOCK_OPS = frozenset((0x10, 0x14, 0xA0, 0xA1, 0xA2))          # Scope, Method, If, Else, While
+
+# Scope-like named objects: (kind, fixed bytes between name and TermList)
+_EXT_SCOPE_OPS = {
+    0x82: ('Device', 0),
+    0x83: ('Processor', 6),
+    0x84: ('PowerResource', 3),
+    0x85: ('ThermalZone', 0),
+}
+
+# Integer constants and how iasl prints them
+_INTEGER_SIZES = {0x0A: 1, 0x0B: 2, 0x0C: 4, 0x0E: 8}
+_INTEGER_NAMES = {0x00: 'Zero', 0x01: 'One', 0xFF: 'Ones'}
+
+# Bytes that start a NameSeg
+_LEAD_NAME_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ_')
+
+# Names whose integer value is a compressed EISA ID
+EISA_ID_NAMES = ('_HID', '_CID')
+
+
+class AMLError(Exception):
+    """Raised for malformed or truncated AML"""
+
+
+def read_table_header(buffer, offset=0):
+    """Decode the ACPI table header at offset into a dict"""
+    if len(buffer) < offset + TABLE_HEADER_SIZE:
+        raise AMLError(f"truncated table header at offset {offset}")
+    (signature, length, revision, checksum, oem_id, oem_table_id,
+     oem_revision, creator_id, creator_revision) = TABLE_HEADER.unpack_from(buffer, offset)
+    return {
+        'signature': signature.decode('ascii', 'replace'),
+        'length': length,
+        'revision': revision,
+        'checksum': checksum,
+        'oem_id': oem_id.decode('ascii', 'replace').rstrip('\0 '),
+        'oem_table_id': oem_table_id.decode('ascii', 'replace').rstrip('\0 '),
+        'oem_revision': oem_revision,
+        'creator_id': creator_id.decode('ascii', 'replace'),
+        'creator_revision': creator_revision,
+        'offset': offset
+    }
+
+
+def is_aml(buffer):
+    """Check whether buffer starts with an AML table (DSDT/SSDT/PSDT) header
+
+    buffer may be just the start of a file.
+    """
+    if len(buffer) < TABLE_HEADER_SIZE or bytes(buffer[:4]) not in AML_SIGNATURES:
+        return False
+    return TABLE_HEADER.unpack_from(buffer, 0)[1] >= TABLE_HEADER_SIZE
+
+
+def decode_eisa_id(value):
+    """Decode a compressed EISA ID (0x080AD041 -> PNP0A08), or None"""
+    swapped = int.from_bytes(value.to_bytes(4, 'little'), 'big')
+    letters = [((swapped >> shift) & 0x1F) + 0x40 for shift in (26, 21, 16)]
+    if not all(0x41 <= letter <= 0x5A for letter in letters):
+        return None
+    return ''.join(map(chr, letters)) + f"{swapped & 0xFFFF:04X}"
+
+
+class AMLReader:
+    """Walk the AML tables in a buffer and collect declaration Tokens
+
+    Token offsets are byte offsets of the declaring opcode. ends maps the
+    offset of every Scope/Device/Method/... token to the last byte of its
+    body, which is what the DSL parser gets from brace matching.
+
+    By default method bodies are skipped by their PkgLength, which gives
+    the namespace as loaded from the table (ACPI creates objects declared
+    inside a method only while it runs). With method_bodies=True those
+    objects are read as well, like the DSL parser does; method calls have
+    no length marker, so argument counts are then collected in a first
+    pass. A body that fails to decode is skipped up to its PkgLength end
+    and listed in errors; the rest of the table is unaffected.
+    """
+
+    def __init__(self, buffer, method_bodies=False):
+        self.buffer = buffer
+        self.method_bodies = method_bodies
+        self.tables = []
+        self.ends = {}
+        self.errors = []
+        self._methods = []
+        self._externals = []
+        self._method_args = None
+        self._collect = False
+
+    def tokens(self):
+        """Read every table in the buffer; returns its Tokens in offset order"""
+        buffer = self.buffer
+        spans = []
+        offset = 0
+        while offset + TABLE_HEADER_SIZE <= len(buffer):
+            header = read_table_header(buffer, offset)
+            length = header['length']
+            if length < TABLE_HEADER_SIZE:
+                raise AMLError(f"bad table length {length} at offset {offset}")
+            self.tables.append(header)
+            end = offset + length
+            if end > len(buffer):
+                # Truncated dump: read what is there
+                self._note_error(offset, end, AMLError(f"table truncated at {len(buffer)} bytes"))
+                end = len(buffer)
+            if header['signature'].encode('ascii') in AML_SIGNATURES:
+                spans.append((offset + TABLE_HEADER_SIZE, end))
+            offset = end
+
+        if self.method_bodies:
+            # First pass: method and External argument counts, bodies skipped
+            self._collect = True
+            for start, end in spans:
+                self._guarded_term_list(start, end, [])
+            self._collect = False
+            self.ends.clear()
+            del self.errors[:]
+
+        tokens = []
+        for start, end in spans:
+            self._guarded_term_list(start, end, tokens)
+        return tokens
+
+    def _term_list(self, pos, end, scope, tokens):
+        """Append declarations from a TermList to tokens, skipping other terms"""
+        buffer = self.buffer
+        collect = self._collect
+        # Argument counts are recorded once, in the first pass if there is one
+        record = collect or not self.method_bodies
+        while pos < end:
+            start = pos
+            opcode = buffer[pos]
+
+            if opcode == 0x10:                                  # Scope
+                body_end, pos = self._pkg_length(pos + 1)
+                name, pos = self._name_string(pos)
+                self._block('Scope', name, start, pos, body_end, end, scope, tokens)
+                pos = body_end
+
+            elif opcode == 0x14:                                # Method
+                body_end, pos = self._pkg_length(pos + 1)
+                name, pos = self._name_string(pos)
+                if record:
+                    self._methods.append((scope, name, buffer[pos] & 0x07))
+                    self._method_args = None
+                if self.method_bodies and not collect:
+                    self._block('Method', name, start, pos + 1, body_end, end, scope, tokens)
+                elif body_end > end:
+                    raise AMLError(f"method at offset {start} has a bad PkgLength")
+                elif not collect:
+                    self.ends[start] = body_end - 1
+                    tokens.append(Token('Method', name, start, None))
+                pos = body_end
+
+            elif opcode == 0x08:                                # Name
+                name, pos = self._name_string(pos + 1)
+                value, pos = self._data_object(pos, name)
+                if not collect:
+                    tokens.append(Token('Name', name, start, value))
+
+            elif opcode == 0x15:                                # External
+                name, pos = self._name_string(pos + 1)
+                object_type, arg_count = buffer[pos], buffer[pos + 1]
+                pos += 2
+                if object_type == METHOD_OBJECT_TYPE and record:
+                    self._externals.append((scope, name, arg_count & 0x07))
+                    self._method_args = None
+                if not collect:
+                    tokens.append(Token('External', name, start, None))
+
+            elif opcode in (0xA0, 0xA1, 0xA2):                  # If, Else, While
+                body_end, pos = self._pkg_length(pos + 1)
+                self._block(None, None, start, pos, body_end, end, scope, tokens, scope)
+                pos = body_end
+
+            elif opcode == EXT_OP_PREFIX:
+                ext = buffer[pos + 1]
+                if ext in _EXT_SCOPE_OPS:
+                    kind, fixed = _EXT_SCOPE_OPS[ext]
+                    body_end, pos = self._pkg_length(pos + 2)
+                    name, pos = self._name_string(pos)
+                    self._block(kind, name, start, pos + fixed, body_end, end, scope, tokens)
+                    pos = body_end
+                elif ext == 0x80:                               # OperationRegion
+                    name, pos = self._name_string(pos + 2)
+                    pos = self._operands('BTT', pos, scope)
+                    if not collect:
+                        tokens.append(Token('OperationRegion', name, start, None))
+                else:
+                    pos = self._term(pos, scope)
+            else:
+                pos = self._term(pos, scope)
+
+            if pos > end:
+                raise AMLError(f"term at offset {start} overruns its block")
+
+    def _block(self, kind, name, start, body_start, body_end, limit, scope, tokens, path=None):
+        """Append a scope-like declaration and the declarations in its body
+
+        kind None is an If/Else/While block: no declaration of its own, and
+        an If or While predicate comes before the body. The block must end
+        within limit, the end of the enclosing block. On bad AML the rest
+        of the block is skipped and noted in errors.
+        """
+        if body_end > limit or body_start > body_end:
+            raise AMLError(f"block at offset {start} has a bad PkgLength")
+        if kind is not None and not self._collect:
+            self.ends[start] = body_end - 1
+            tokens.append(Token(kind, name, start, None))
+        try:
+            if kind is None and self.buffer[start] != 0xA1:
+                body_start = self._term(body_start, scope)
+            self._term_list(body_start, body_end, path or self._join(scope, name), tokens)
+        except (AMLError, IndexError, KeyError) as e:
+            self._note_error(start, body_end, e)
+
+    def _guarded_term_list(self, start, end, tokens):
+        """Read a table body; on bad AML keep what was read and note the error"""
+        try:
+            self._term_list(start, end, '\\', tokens)
+        except (AMLError, IndexError, KeyError) as e:
+            self._note_error(start, end, e)
+
+    def _note_error(self, start, end, error):
+        if not self._collect:
+            self.errors.append((start, end, str(error) or type(error).__name__))
+
+    def _term(self, pos, scope):
+        """Skip one TermArg/statement starting at pos; return the next offset"""
+        buffer = self.buffer
+        opcode = buffer[pos]
+
+        operands = _OPERANDS.get(opcode)
+        if operands is not None:
+            return self._operands(operands, pos + 1, scope)
+        if opcode in _INTEGER_SIZES:
+            return pos + 1 + _INTEGER_SIZES[opcode]
+        if opcode == 0x0D:                                      # String
+            return self._string_end(pos + 1)
+        if opcode in _PACKAGE_OPS or opcode in _BLOCK_OPS:
+            return self._pkg_length(pos + 1)[0]
+        if opcode == 0x08:
+            name, pos = self._name_string(pos + 1)
+            return self._data_object(pos, name)[1]
+        if opcode == 0x15:
+            return self._name_string(pos + 1)[1] + 2
+        if opcode == EXT_OP_PREFIX:
+            ext = buffer[pos + 1]
+            operands = _EXT_OPERANDS.get(ext)
+            if operands is not None:
+                return self._operands(operands, pos + 2, scope)
+            if ext in _EXT_SCOPE_OPS or ext in _EXT_PACKAGE_OPS:
+                return self._pkg_length(pos + 2)[0]
+            if ext == 0x80:
+                name, pos = self._name_string(pos + 2)
+                return self._operands('BTT', pos, scope)
+            raise AMLError(f"unknown opcode 0x5B 0x{ext:02X} at offset {pos}")
+        if self._is_name_start(opcode):
+            # A name used as a value: either a reference or a method call
+            name, pos = self._name_string(pos)
+            for _ in range(self._arg_count(scope, name)):
+                pos = self._term(pos, scope)
+            return pos
+        raise AMLError(f"unknown opcode 0x{opcode:02X} at offset {pos}")
+
+    def _operands(self, layout, pos, scope):
+        """Skip the operands described by layout"""
+        buffer = self.buffer
+        for operand in layout:
+            if operand == 'T':
+                pos = self._term(pos, scope)
+            elif operand in 'SR':
+                opcode = buffer[pos]
+                if opcode == 0x00:                              # NullName target
+                    pos += 1
+                elif self._is_name_start(opcode):
+                    pos = self._name_string(pos)[1]
+                else:
+                    pos = self._term(pos, scope)
+            elif operand == 'N':
+                pos = self._name_string(pos)[1]
+            else:
+                pos += _DATA_SIZES[operand]
+        return pos
+
+    def _data_object(self, pos, name):
+        """Read the value of a Name(); returns (value as iasl prints it, next offset)"""
+        buffer = self.buffer
+        opcode = buffer[pos]
+        if opcode in _INTEGER_SIZES:
+            size = _INTEGER_SIZES[opcode]
+            value = int.from_bytes(buffer[pos + 1:pos + 1 + size], 'little')
+            text = None
+            if size == 4 and name.rsplit('.', 1)[-1] in EISA_ID_NAMES:
+                text = decode_eisa_id(value)
+            return text or f"0x{value:0{size * 2}X}", pos + 1 + size
+        if opcode in _INTEGER_NAMES:
+            return _INTEGER_NAMES[opcode], pos + 1
+        if opcode == 0x0D:
+            end = self._string_end(pos + 1)
+            return bytes(buffer[pos + 1:end - 1]).decode('ascii', 'replace'), end
+        if opcode in _PACKAGE_OPS:
+            return None, self._pkg_length(pos + 1)[0]
+        if opcode == EXT_OP_PREFIX and buffer[pos + 1] == 0x30:   # Revision
+            return None, pos + 2
+        # Names can also refer to other objects
+        return None, self._term(pos, '\\')
+
+    def _pkg_length(self, pos):
+        """Decode a PkgLength; returns (end offset of the package, next offset)"""
+        buffer = self.buffer
+        lead = buffer[pos]
+        count = lead >> 6
+        if count == 0:
+            return pos + (lead & 0x3F), pos + 1
+        length = lead & 0x0F
+        for i in range(count):
+            length |= buffer[pos + 1 + i] << (4 + 8 * i)
+        return pos + length, pos + 1 + count
+
+    def _name_string(self, pos):
+        """Decode a NameString; returns (name like \\_SB.PCI0, next offset)"""
+        buffer = self.buffer
+        if buffer[pos] in _LEAD_NAME_BYTES:
+            # Common case: a single NameSeg
+            raw = buffer[pos:pos + 4]
+            if len(raw) != 4:
+                raise AMLError(f"truncated name at offset {pos}")
+            name = raw.decode('ascii', 'replace')
+            if name[3] == '_':
+                name = normalize_segment(name)
+            return name, pos + 4
+
+        prefix = ''
+        if buffer[pos] == ROOT_CHAR:
+            prefix = '\\'
+            pos += 1
+        else:
+            while buffer[pos] == PARENT_PREFIX_CHAR:
+                prefix += '^'
+                pos += 1
+
+        lead = buffer[pos]
+        if lead == DUAL_NAME_PREFIX:
+            count = 2
+            pos += 1
+        elif lead == MULTI_NAME_PREFIX:
+            count = buffer[pos + 1]
+            pos += 2
+        elif lead == 0x00:                                      # NullName
+            return prefix, pos + 1
+        else:
+            count = 1
+
+        end = pos + 4 * count
+        raw = buffer[pos:end]
+        if len(raw) != 4 * count:
+            raise AMLError(f"truncated name at offset {pos}")
+        segments = [normalize_segment(raw[i:i + 4].decode('ascii', 'replace'))
+                    for i in range(0, len(raw), 4)]
+        return prefix + '.'.join(segments), end
+
+    def _string_end(self, pos):
+        """Offset just past the NUL terminating a String at pos"""
+        end = self.buffer.find(b'\0', pos)
+        if end < 0:
+            raise AMLError(f"unterminated string at offset {pos}")
+        return end + 1
+
+    @staticmethod
+    def _is_name_start(byte):
+        return (0x41 <= byte <= 0x5A or byte == 0x5F or byte == ROOT_CHAR
+                or byte == PARENT_PREFIX_CHAR or byte == DUAL_NAME_PREFIX
+                or byte == MULTI_NAME_PREFIX)
+
+    @staticmethod
+    def _join(scope, name):
+        """Absolute path of name declared in scope"""
+        if name.startswith('\\'):
+            return name if len(name) > 1 else '\\'
+        while name.startswith('^'):
+            scope = scope.rsplit('.', 1)[0] if '.' in scope else '\\'
+            name = name[1:]
+        if not name:
+            return scope
+        return scope + name if scope == '\\' else scope + '.' + name
+
+    def method_args(self):
+        """Argument counts of declared and External methods by absolute path"""
+        if self._method_args is None:
+            method_args = {}
+            for scope, name, count in self._externals:
+                method_args[self._join(scope, name)] = count
+            for scope, name, count in self._methods:
+                method_args[self._join(scope, name)] = count
+            self._method_args = method_args
+        return self._method_args
+
+    def _arg_count(self, scope, name):
+        """Argument count of the method name refers to from scope (0 if not a method)"""
+        method_args = self.method_args()
+        if name.startswith(('\\', '^')):
+            return method_args.get(self._join(scope, name), 0)
+        # Search rules: try the scope and then each enclosing scope
+        while True:
+            count = method_args.get(self._join(scope, name))
+            if count is not None:
+                return count
+            if scope == '\\':
+                return 0
+            scope = scope.rsplit('.', 1)[0] if '.' in scope else '\\'
@@ -0,0 +1,148 @@
+"""Batch analysis of many ACPI tables on a process pool"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+from .acpi_parser import ACPIParser
+from .dsdt_context import DSDTContext
+from .hardware_detector import HardwareDetector
+
+
+DEFAULT_PATTERNS = ('*.dsl', '*.aml')
+
+
+def find_tables(directory, patterns=DEFAULT_PATTERNS, recursive=True):
+    """Sorted list of the table files under directory matching any of patterns"""
+    directory = Path(directory)
+    found = set()
+    for pattern in patterns:
+        matches = directory.rglob(pattern) if recursive else directory.glob(pattern)
+        found.update(path for path in matches if path.is_file())
+    return sorted(found)
+
+
+def analyze_table(filepath, use_cache=True, profile_dir=None):
+    """Parse, detect and recommend patches for one table (runs in a worker)
+
+    With profile_dir, the table is profiled there as operation 'batch-table'
+    and the result lists the profile files under 'profile'.
+    """
+    if profile_dir is not None:
+        from .profiling import Profiler
+        with Profiler('batch-table', filepath, profile_dir) as profiler:
+            result = analyze_table(filepath, use_cache)
+        result['profile'] = [str(path) for path in profiler.paths]
+        return result
+    
+    start = time.perf_counter()
+    result = {'file': str(filepath), 'ok': False}
+    parser = None
+    try:
+        result['size'] = os.path.getsize(filepath)
+        
+        parser = ACPIParser()
+        if use_cache:
+            from .parse_cache import ParseCache
+            ok = ParseCache().parse_file(parser, filepath)
+        else:
+            ok = parser.parse_file(filepath)
+        if not ok:
+            result['error'] = 'parse failed'
+            return result
+        
+        context = DSDTContext(parser)
+        context.analyze()
+        
+        detector = HardwareDetector(parser)
+        detector.detect_platform()
+        detector.detect_chipset()
+        
+        paths = parser.get_device_paths()
+        result.update({
+            'ok': True,
+            'devices': parser.get_device_count(),
+            'methods': len(parser.methods),
+            'scopes': len(parser.scopes),
+            'paths': paths,
+            'detected': sum(1 for path in paths.values() if path),
+            'platform': detector.platform_type,
+            'recommended_patches': detector.get_recommended_patches()
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        # Release the mmap of large tables, also when parsing failed
+        if parser is not None:
+            parser.close()
+        result['seconds'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+class BatchStats:
+    """Running totals for a batch run"""
+    
+    def __init__(self):
+        self.tables = 0
+        self.failed = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+    
+    def add(self, result):
+        self.tables += 1
+        self.bytes += result.get('size', 0)
+        if not result['ok']:
+            self.failed += 1
+        self.elapsed = time.perf_counter() - self.start
+    
+    def summary(self):
+        """Totals and throughput as a dict"""
+        elapsed = self.elapsed or 1e-9
+        return {
+            'tables': self.tables,
+            'failed': self.failed,
+            'megabytes': round(self.bytes / (1024 * 1024), 2),
+            'seconds': round(self.elapsed, 3),
+            'tables_per_second': round(self.tables / elapsed, 2),
+            'megabytes_per_second': round(self.bytes / (1024 * 1024) / elapsed, 2)
+        }
+
+
+def run_batch(paths, workers=None, max_in_flight=None, use_cache=True, stats=None,
+              profile_dir=None):
+    """Analyze paths on a process pool, yielding results as they complete
+
+    At most max_in_flight tables (default: 4 per worker) are submitted at
+    once, so memory stays bounded however many paths are given. With
+    profile_dir, every worker profiles its tables there (see analyze_table).
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    paths = iter(paths)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                else:
+                    pending[executor.submit(analyze_table, str(path), use_cache, profile_dir)] = str(path)
+            
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. out of memory)
+                    result = {'file': path, 'ok': False, 'error': f"worker failed: {e}"}
+                if stats is not None:
+                    stats.add(result)
+                yield result
@@ -0,0 +1,218 @@
+"""Declarative device role detection over the parsed namespace"""
+
+from bisect import bisect_right
+
+
+# Candidate names per role, most common spelling first
+PCI_ROOT_NAMES = ('PCI0', 'PC00', 'PCIO', 'PCI1', 'PCIE')
+LPC_NAMES = ('LPCB', 'LPC0', 'LPC', 'SBRG', 'LPCB0')
+GPU_NAMES = ('GFX0', 'IGPU', 'VID', 'VGA', 'GFX', 'VID0')
+CPU_NAMES = ('CPU0', 'CP00', 'PR00', 'C000', 'P000')
+USB_NAMES = ('XHC', 'XHCI', 'XHC1', 'XHC0', 'XHCX', 'EHC1', 'EHC2')
+SMBUS_NAMES = ('SBUS', 'SMBU', 'SMBS', 'SBUS0', 'SMBU0')
+EC_NAMES = ('EC0', 'EC', 'H_EC', 'ECDV', 'PGEC')
+BATTERY_NAMES = ('BAT0', 'BAT1', 'BATC', 'BATT')
+HPET_NAMES = ('HPET', 'HPE0', 'HPET0')
+GPIO_NAMES = ('GPI0', 'GPIO', 'GPI1')
+
+# Detection rules, evaluated in order. Each step is one of:
+#   ('child', parent)  - first candidate name declared as a Device directly
+#                        under parent; parent is an absolute scope or an
+#                        earlier role
+#   ('hid', hid)       - first Device with this _HID anywhere
+#   ('name', None)     - first Device with a candidate name anywhere
+#   ('processor', None) - first Processor() declaration
+# Every role resolves to a full path without the root backslash
+# (_SB.PCI0.LPCB.EC0), also ec_device and battery_device, which the
+# regex parser reported as a bare name (EC0)
+DETECTION_RULES = (
+    ('pci_root', PCI_ROOT_NAMES, (('child', '_SB'),)),
+    ('lpc_bridge', LPC_NAMES, (('child', 'pci_root'),)),
+    ('gpu_device', GPU_NAMES, (('child', 'pci_root'),)),
+    ('cpu_path', CPU_NAMES, (
+        ('processor', None),
+        ('hid', 'ACPI0007'),
+        ('child', '_PR'),
+        ('child', '_SB'),
+    )),
+    ('usb_controller', USB_NAMES, (('child', 'pci_root'),)),
+    ('smbus', SMBUS_NAMES, (('child', 'pci_root'),)),
+    ('ec_device', EC_NAMES, (('hid', 'PNP0C09'), ('name', None))),
+    ('battery_device', BATTERY_NAMES, (('hid', 'PNP0C0A'), ('name', None))),
+    ('hpet_device', HPET_NAMES, (
+        ('child', 'lpc_bridge'),
+        ('hid', 'PNP0103'),
+        ('name', None),
+    )),
+    ('gpio_device', GPIO_NAMES, (('child', 'pci_root'), ('name', None))),
+)
+
+# Node kinds that can stand for a device in a 'child' lookup. Scope and
+# External nodes only refer to an object (or are the leading segments of
+# such a path), so they do not show that a device exists
+CHILD_KINDS = ('Device',)
+
+
+class DetectionIndex:
+    """Name and HID index over a namespace, built once per parse
+
+    tables lists the parser's tables in load order; nodes of a merged
+    table set are ordered by their table first, then by offset.
+    """
+
+    def __init__(self, namespace, tables=()):
+        self.namespace = namespace
+        self.table_order = {table.get('table'): index for index, table in enumerate(tables)}
+        self.devices_by_name = {}
+        self.devices_by_hid = {}
+        self.device_children = None
+        processors = []
+
+        for node in namespace.nodes.values():
+            if node.kind == 'Device':
+                self.devices_by_name.setdefault(node.name, []).append(node)
+                if node.hid is not None:
+                    self.devices_by_hid.setdefault(node.hid, []).append(node)
+            elif node.kind == 'Processor':
+                processors.append(node)
+
+        # Declaration order, so "first" matches the order in the file
+        for nodes in self.devices_by_name.values():
+            nodes.sort(key=self.order_key)
+        for nodes in self.devices_by_hid.values():
+            nodes.sort(key=self.order_key)
+        self.first_processor = min(processors, key=self.order_key) if processors else None
+
+    def order_key(self, node):
+        """Sort key: load order of the node's table, then offset; placeholders last"""
+        if node.offset is None:
+            return (float('inf'), 0)
+        return (self.table_order.get(node.table, 0), node.offset)
+
+    def get_device_children(self):
+        """Map nodes to their children that are Devices or contain Devices
+
+        Children keep namespace order. Built on first use, for tree views.
+        """
+        if self.device_children is None:
+            branch = set()
+            for nodes in self.devices_by_name.values():
+                for node in nodes:
+                    while node.parent is not None and node not in branch:
+                        branch.add(node)
+                        node = node.parent
+
+            parents = {node.parent for node in branch}
+            self.device_children = {
+                parent: [child for child in parent.children.values() if child in branch]
+                for parent in parents
+            }
+        return self.device_children
+
+    def child(self, parent_path, names):
+        """First of names declared directly under parent_path"""
+        for name in names:
+            node = self.namespace.get(f"{parent_path}.{name}")
+            if node is not None and node.kind in CHILD_KINDS:
+                return node
+        return None
+
+    def by_hid(self, hid):
+        """First device with the given _HID"""
+        nodes = self.devices_by_hid.get(hid)
+        return nodes[0] if nodes else None
+
+    def by_name(self, names):
+        """First device named after the first matching candidate"""
+        for name in names:
+            nodes = self.devices_by_name.get(name)
+            if nodes:
+                return nodes[0]
+        return None
+
+    def update(self, changes, rules=DETECTION_RULES):
+        """Apply namespace changes to the index; return the roles they affect
+
+        changes maps every added, removed or modified node to its previous
+        (kind, hid), or to None for new nodes. Nodes that are no longer in
+        the namespace count as removed.
+        """
+        names = set()
+        hids = set()
+        processors = False
+        for node, previous in changes.items():
+            names.add(node.name)
+            if previous is not None:
+                kind, hid = previous
+                if kind == 'Device':
+                    _discard(self.devices_by_name, node.name, node)
+                    if hid is not None:
+                        _discard(self.devices_by_hid, hid, node)
+                        hids.add(hid)
+                elif kind == 'Processor':
+                    processors = True
+            if self.namespace.nodes.get(node.path) is not node:
+                continue
+            if node.kind == 'Device':
+                self._insert(self.devices_by_name, node.name, node)
+                if node.hid is not None:
+                    self._insert(self.devices_by_hid, node.hid, node)
+                    hids.add(node.hid)
+            elif node.kind == 'Processor':
+                processors = True
+
+        if processors:
+            self.first_processor = min(
+                (node for node in self.namespace.nodes.values() if node.kind == 'Processor'),
+                key=self.order_key, default=None)
+        self.device_children = None
+        return {role for role, role_names, steps in rules
+                if not names.isdisjoint(role_names)
+                or any((step == 'hid' and arg in hids) or (step == 'processor' and processors)
+                       for step, arg in steps)}
+
+    def detect(self, rules=DETECTION_RULES, previous=None, roles=None):
+        """Resolve every role to a dotted path (or None)
+
+        Given the previous paths and the roles returned by update(), only
+        those roles are evaluated again, plus roles whose 'child' parent
+        role now resolves to a different path.
+        """
+        paths = {}
+        for role, names, steps in rules:
+            if roles is not None and role not in roles and not any(
+                    step == 'child' and paths.get(arg, arg) != previous.get(arg, arg)
+                    for step, arg in steps):
+                paths[role] = previous.get(role)
+                continue
+            node = None
+            for step, arg in steps:
+                if step == 'child':
+                    parent = paths.get(arg, arg)
+                    if parent:
+                        node = self.child(parent, names)
+                elif step == 'hid':
+                    node = self.by_hid(arg)
+                elif step == 'name':
+                    node = self.by_name(names)
+                elif step == 'processor':
+                    node = self.first_processor
+                if node is not None:
+                    break
+            paths[role] = node.dotted_path if node is not None else None
+        return paths
+
+    def _insert(self, index, key, node):
+        """Add node to index[key], keeping the list in declaration order"""
+        nodes = index.setdefault(key, [])
+        order_key = self.order_key
+        nodes.insert(bisect_right([order_key(other) for other in nodes], order_key(node)), node)
+
+
+def _discard(index, key, node):
+    """Remove node from index[key] if it is there"""
+    nodes = index.get(key)
+    if nodes and node in nodes:
+        nodes.remove(node)
+        if not nodes:
+            del index[key]
@@ -0,0 +1,93 @@
+"""Hash indexes over device records for constant-time lookups"""
+
+
+# Longest name fragment indexed for substring lookups (one NameSeg)
+FRAGMENT_LENGTH = 4
+
+# Record fields with an exact-match index
+INDEXED_FIELDS = ('hid', 'cid', 'name', 'adr')
+
+# Fields that a Name() can set after the record was added
+VALUE_FIELDS = ('hid', 'cid', 'adr')
+
+
+class DeviceIndex:
+    """HID, CID, name and _ADR multimaps over device records
+
+    Built as the parser declares devices: add() indexes a new record and
+    set() a _HID/_CID/_ADR value found later in its body. Every map lists
+    records in declaration order, like a scan of the record list would.
+    Names are also indexed by their fragments of up to FRAGMENT_LENGTH
+    characters and HIDs by their prefixes, for "contains BAT" and vendor
+    lookups. Records without a value are not indexed; looking up None
+    scans devices, the list the index was built over.
+    """
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.fields = {field: {} for field in INDEXED_FIELDS}
+        self.name_parts = {}
+        self.hid_prefixes = {}
+        # id(record) -> declaration number, to keep late values in order
+        self._order = {}
+
+        for device in devices:
+            self.add(device)
+
+    def add(self, device):
+        """Index a record with the values it has now"""
+        self._order[id(device)] = len(self._order)
+
+        name = device.get('name') or ''
+        self.fields['name'].setdefault(device.get('name'), []).append(device)
+        parts = {name[start:start + size]
+                 for size in range(FRAGMENT_LENGTH + 1)
+                 for start in range(len(name) - size + 1)}
+        for part in parts:
+            self.name_parts.setdefault(part, []).append(device)
+
+        for field in VALUE_FIELDS:
+            value = device.get(field)
+            if value is not None:
+                self.set(device, field, value)
+
+    def set(self, device, field, value):
+        """Index a _HID/_CID/_ADR value of an added record that had none"""
+        self._insert(self.fields[field].setdefault(value, []), device)
+        if field == 'hid':
+            for size in range(len(value) + 1):
+                self._insert(self.hid_prefixes.setdefault(value[:size], []), device)
+
+    def _insert(self, bucket, device):
+        """Add device to bucket in declaration order
+
+        Values usually arrive in declaration order; a device whose _HID
+        follows a nested device's is moved back past it.
+        """
+        order = self._order
+        number = order[id(device)]
+        position = len(bucket)
+        while position and order[id(bucket[position - 1])] > number:
+            position -= 1
+        bucket.insert(position, device)
+
+    def find(self, field, value):
+        """Records whose field ('hid', 'cid', 'name' or 'adr') equals value"""
+        if value is None:
+            return [device for device in self.devices if device.get(field) is None]
+        return list(self.fields[field].get(value, ()))
+
+    def find_hid_prefix(self, prefix):
+        """Records whose HID starts with prefix"""
+        return list(self.hid_prefixes.get(prefix, ()))
+
+    def find_name_part(self, part):
+        """Records whose name contains part
+
+        Longer parts are looked up by their first FRAGMENT_LENGTH
+        characters and the few candidates checked.
+        """
+        candidates = self.name_parts.get(part[:FRAGMENT_LENGTH], ())
+        if len(part) <= FRAGMENT_LENGTH:
+            return list(candidates)
+        return [device for device in candidates if part in device['name']]
@@ -5,5 +5,17 @@ from .hardware_generators import HardwareGenerators
 from .laptop_generators import LaptopGenerators
 from .usb_generators import USBGenerators
 from .advanced_generators import AdvancedGenerators
+from .template_repository import TemplateRepository, TEMPLATES
+from .output import write_ssdt, write_ssdt_atomic, write_bundle
+from .registry import (RENDERERS, REGISTRY, RegisteredPatch, RegistryError,
+                       build_registry, generate_patch, render_patch)
+from .manifest import GenerationManifest, MANIFEST_NAME
+from .parallel import GenerationSummary, generate_patches
 
-__all__ = ['EssentialGenerators', 'HardwareGenerators', 'LaptopGenerators', 'USBGenerators', 'AdvancedGenerators']
+
+__all__ = ['EssentialGenerators', 'HardwareGenerators', 'LaptopGenerators', 'USBGenerators', 'AdvancedGenerators',
+           'RENDERERS', 'REGISTRY', 'RegisteredPatch', 'RegistryError', 'build_registry',
+           'generate_patch', 'render_patch', 'write_ssdt',
+           'write_ssdt_atomic', 'write_bundle', 'GenerationSummary', 'generate_patches',
+           'GenerationManifest', 'MANIFEST_NAME',
+           'TemplateRepository', 'TEMPLATES']
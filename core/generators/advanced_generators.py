@@ -1,123 +1,194 @@
 """Advanced SSDT generators using Dortania templates"""
 
-from pathlib import Path
+from .output import write_ssdt
+from .template_repository import TEMPLATES, TEMPLATE_DIR
 
 
 class AdvancedGenerators:
     """Generate advanced SSDTs from templates"""
     
-    TEMPLATE_DIR = Path(__file__).parent / "templates"
+    TEMPLATE_DIR = TEMPLATE_DIR
     
     @staticmethod
     def _load_template(template_name):
-        """Load template file content"""
-        template_path = AdvancedGenerators.TEMPLATE_DIR / template_name
-        if template_path.exists():
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        return None
+        """Load template file content (memoized by the template repository)"""
+        return TEMPLATES.get(template_name)
     
     @staticmethod
-    def _write_template(template_name, output_path):
-        """Load and write template to output"""
-        content = AdvancedGenerators._load_template(template_name)
-        if content:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        return False
+    def render_xosi(dsdt_context=None):
+        """Render SSDT-XOSI as text"""
+        return AdvancedGenerators.render_template("SSDT-XOSI.dsl", dsdt_context)
     
     @staticmethod
-    def generate_xosi(output_path):
+    def generate_xosi(output_path, dsdt_context=None):
         """Generate SSDT-XOSI for OS compatibility"""
-        return AdvancedGenerators._write_template("SSDT-XOSI.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_xosi(dsdt_context))
+    
+    @staticmethod
+    def render_gpu_disable(dsdt_context=None):
+        """Render SSDT-GPU-DISABLE as text"""
+        return AdvancedGenerators.render_template("SSDT-GPU-DISABLE.dsl", dsdt_context)
     
     @staticmethod
-    def generate_gpu_disable(output_path):
+    def generate_gpu_disable(output_path, dsdt_context=None):
         """Generate SSDT-GPU-DISABLE to disable discrete GPU"""
-        return AdvancedGenerators._write_template("SSDT-GPU-DISABLE.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_gpu_disable(dsdt_context))
     
     @staticmethod
-    def generate_gpu_spoof(output_path):
+    def render_gpu_spoof(dsdt_context=None):
+        """Render SSDT-GPU-SPOOF as text"""
+        return AdvancedGenerators.render_template("SSDT-GPU-SPOOF.dsl", dsdt_context)
+    
+    @staticmethod
+    def generate_gpu_spoof(output_path, dsdt_context=None):
         """Generate SSDT-GPU-SPOOF to spoof GPU device ID"""
-        return AdvancedGenerators._write_template("SSDT-GPU-SPOOF.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_gpu_spoof(dsdt_context))
     
     @staticmethod
-    def generate_dgpu_off(output_path):
+    def render_dgpu_off(dsdt_context=None):
+        """Render SSDT-dGPU-Off as text"""
+        return AdvancedGenerators.render_template("SSDT-dGPU-Off.dsl", dsdt_context)
+    
+    @staticmethod
+    def generate_dgpu_off(output_path, dsdt_context=None):
         """Generate SSDT-dGPU-Off alternative discrete GPU disable"""
-        return AdvancedGenerators._write_template("SSDT-dGPU-Off.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_dgpu_off(dsdt_context))
+    
+    @staticmethod
+    def render_nohybgfx(dsdt_context=None):
+        """Render SSDT-NoHybGfx as text"""
+        return AdvancedGenerators.render_template("SSDT-NoHybGfx.dsl", dsdt_context)
     
     @staticmethod
-    def generate_nohybgfx(output_path):
+    def generate_nohybgfx(output_path, dsdt_context=None):
         """Generate SSDT-NoHybGfx to disable hybrid graphics"""
-        return AdvancedGenerators._write_template("SSDT-NoHybGfx.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_nohybgfx(dsdt_context))
+    
+    @staticmethod
+    def render_rhub(dsdt_context=None):
+        """Render SSDT-RHUB as text"""
+        return AdvancedGenerators.render_template("SSDT-RHUB.dsl", dsdt_context)
     
     @staticmethod
-    def generate_rhub(output_path):
+    def generate_rhub(output_path, dsdt_context=None):
         """Generate SSDT-RHUB for USB reset"""
-        return AdvancedGenerators._write_template("SSDT-RHUB.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_rhub(dsdt_context))
     
     @staticmethod
-    def generate_rhub_prebuilt(output_path):
+    def render_rhub_prebuilt(dsdt_context=None):
+        """Render SSDT-RHUB-prebuilt as text"""
+        return AdvancedGenerators.render_template("SSDT-RHUB-prebuilt.dsl", dsdt_context)
+    
+    @staticmethod
+    def generate_rhub_prebuilt(output_path, dsdt_context=None):
         """Generate SSDT-RHUB-prebuilt alternative"""
-        return AdvancedGenerators._write_template("SSDT-RHUB-prebuilt.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_rhub_prebuilt(dsdt_context))
     
     @staticmethod
-    def generate_rtc0_range(output_path):
+    def render_rtc0_range(dsdt_context=None):
+        """Render SSDT-RTC0-RANGE as text"""
+        return AdvancedGenerators.render_template("SSDT-RTC0-RANGE-HEDT.dsl", dsdt_context)
+    
+    @staticmethod
+    def generate_rtc0_range(output_path, dsdt_context=None):
         """Generate SSDT-RTC0-RANGE for HEDT systems"""
-        return AdvancedGenerators._write_template("SSDT-RTC0-RANGE-HEDT.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_rtc0_range(dsdt_context))
+    
+    @staticmethod
+    def render_unc(dsdt_context=None):
+        """Render SSDT-UNC as text"""
+        return AdvancedGenerators.render_template("SSDT-UNC.dsl", dsdt_context)
     
     @staticmethod
-    def generate_unc(output_path):
+    def generate_unc(output_path, dsdt_context=None):
         """Generate SSDT-UNC for HEDT uncore bridge"""
-        return AdvancedGenerators._write_template("SSDT-UNC.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_unc(dsdt_context))
+    
+    @staticmethod
+    def render_cpur(dsdt_context=None):
+        """Render SSDT-CPUR as text"""
+        return AdvancedGenerators.render_template("SSDT-CPUR.dsl", dsdt_context)
     
     @staticmethod
-    def generate_cpur(output_path):
+    def generate_cpur(output_path, dsdt_context=None):
         """Generate SSDT-CPUR for CPU renaming"""
-        return AdvancedGenerators._write_template("SSDT-CPUR.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_cpur(dsdt_context))
+    
+    @staticmethod
+    def render_imei(dsdt_context=None):
+        """Render SSDT-IMEI-S as text"""
+        return AdvancedGenerators.render_template("SSDT-IMEI-S.dsl", dsdt_context)
     
     @staticmethod
-    def generate_imei(output_path):
+    def generate_imei(output_path, dsdt_context=None):
         """Generate SSDT-IMEI-S for IMEI device"""
-        return AdvancedGenerators._write_template("SSDT-IMEI-S.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_imei(dsdt_context))
     
     @staticmethod
-    def generate_ec_usbx_desktop(output_path):
+    def render_ec_usbx_desktop(dsdt_context=None):
+        """Render combined SSDT-EC-USBX for desktop as text"""
+        return AdvancedGenerators.render_template("SSDT-EC-USBX-DESKTOP.dsl", dsdt_context)
+    
+    @staticmethod
+    def generate_ec_usbx_desktop(output_path, dsdt_context=None):
         """Generate combined SSDT-EC-USBX for desktop"""
-        return AdvancedGenerators._write_template("SSDT-EC-USBX-DESKTOP.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_ec_usbx_desktop(dsdt_context))
+    
+    @staticmethod
+    def render_ec_usbx_laptop(dsdt_context=None):
+        """Render combined SSDT-EC-USBX for laptop as text"""
+        return AdvancedGenerators.render_template("SSDT-EC-USBX-LAPTOP.dsl", dsdt_context)
     
     @staticmethod
-    def generate_ec_usbx_laptop(output_path):
+    def generate_ec_usbx_laptop(output_path, dsdt_context=None):
         """Generate combined SSDT-EC-USBX for laptop"""
-        return AdvancedGenerators._write_template("SSDT-EC-USBX-LAPTOP.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_ec_usbx_laptop(dsdt_context))
+    
+    @staticmethod
+    def render_plug_drtnia(dsdt_context=None):
+        """Render SSDT-PLUG-DRTNIA as text"""
+        return AdvancedGenerators.render_template("SSDT-PLUG-DRTNIA.dsl", dsdt_context)
     
     @staticmethod
-    def generate_plug_drtnia(output_path):
+    def generate_plug_drtnia(output_path, dsdt_context=None):
         """Generate SSDT-PLUG-DRTNIA alternative"""
-        return AdvancedGenerators._write_template("SSDT-PLUG-DRTNIA.dsl", output_path)
+        return write_ssdt(output_path, AdvancedGenerators.render_plug_drtnia(dsdt_context))
     
     @staticmethod
-    def generate_from_template(patch_name, output_path):
-        """Generic generator that finds and uses template files"""
-        # Try exact match first
-        template_file = f"{patch_name}.dsl"
-        if AdvancedGenerators._write_template(template_file, output_path):
-            return True
-        
-        # Try to find similar template
-        import os
-        template_dir = AdvancedGenerators.TEMPLATE_DIR
-        if template_dir.exists():
-            # Look for files that start with the patch name
-            for file in os.listdir(template_dir):
-                if file.startswith(patch_name) and file.endswith('.dsl'):
-                    if AdvancedGenerators._write_template(file, output_path):
-                        return True
+    def get_template_content(patch_name):
+        """Find a patch's template content, or a placeholder if there is none"""
+        # Exact match first, then the first template starting with the name
+        template_name, content = TEMPLATES.find(patch_name)
+        if content:
+            return content
         
         # If no template found, create a basic placeholder
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"/*\n * {patch_name}\n * Template not found - Please customize\n */\n")
-            f.write(f"DefinitionBlock (\"\", \"SSDT\", 2, \"ACPI\", \"{patch_name.replace('SSDT-', '')}\", 0x00000000)\n")
-            f.write("{\n    // Add your ACPI code here\n}\n")
-        return True
+        return AdvancedGenerators.render_placeholder(patch_name)
+    
+    @staticmethod
+    def render_template(template_name, dsdt_context=None):
+        """Render a template file with detected device paths substituted"""
+        compiled = TEMPLATES.compiled(template_name)
+        if compiled is None:
+            return None
+        return compiled.render(dsdt_context)
+    
+    @staticmethod
+    def render_placeholder(patch_name, dsdt_context=None):
+        """Render an empty, customizable SSDT for a patch without a template"""
+        return (f"/*\n * {patch_name}\n * Template not found - Please customize\n */\n"
+                f"DefinitionBlock (\"\", \"SSDT\", 2, \"ACPI\", \"{patch_name.replace('SSDT-', '')}\", 0x00000000)\n"
+                "{\n    // Add your ACPI code here\n}\n")
+    
+    @staticmethod
+    def render_from_template(patch_name, dsdt_context=None):
+        """Render a patch from its template (or a placeholder) as text"""
+        template_name, content = TEMPLATES.find(patch_name)
+        if content:
+            return TEMPLATES.compiled(template_name).render(dsdt_context)
+        return AdvancedGenerators.render_placeholder(patch_name)
+    
+    @staticmethod
+    def generate_from_template(patch_name, output_path):
+        """Generic generator that finds and uses template files"""
+        return write_ssdt(output_path, AdvancedGenerators.render_from_template(patch_name))
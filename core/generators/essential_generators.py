@@ -1,11 +1,14 @@
 """Essential SSDT generators"""
 
+from .output import write_ssdt
+
+
 class EssentialGenerators:
     """Generate essential SSDTs"""
     
     @staticmethod
-    def generate_ec(output_path, dsdt_context=None):
-        """Generate SSDT-EC"""
+    def render_ec(dsdt_context=None):
+        """Render SSDT-EC as text"""
         # Get LPC bridge path
         if dsdt_context and dsdt_context.lpc_bridge:
             lpc_path = dsdt_context.lpc_bridge
@@ -52,13 +55,16 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "EC", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
     
     @staticmethod
-    def generate_plug(output_path, dsdt_context=None):
-        """Generate SSDT-PLUG"""
+    def generate_ec(output_path, dsdt_context=None):
+        """Generate SSDT-EC"""
+        return write_ssdt(output_path, EssentialGenerators.render_ec(dsdt_context))
+    
+    @staticmethod
+    def render_plug(dsdt_context=None):
+        """Render SSDT-PLUG as text"""
         # Get CPU path
         if dsdt_context and dsdt_context.cpu_path:
             cpu_path = dsdt_context.cpu_path
@@ -102,13 +108,16 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "PLUG", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
     
     @staticmethod
-    def generate_awac(output_path, dsdt_context=None):
-        """Generate SSDT-AWAC"""
+    def generate_plug(output_path, dsdt_context=None):
+        """Generate SSDT-PLUG"""
+        return write_ssdt(output_path, EssentialGenerators.render_plug(dsdt_context))
+    
+    @staticmethod
+    def render_awac(dsdt_context=None):
+        """Render SSDT-AWAC as text"""
         # AWAC patch is generic, but we can note if system was analyzed
         if dsdt_context and dsdt_context.analyzed:
             status_comment = " * Status: Generic patch (no device-specific paths needed)"
@@ -138,6 +147,9 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "AWAC", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
+    
+    @staticmethod
+    def generate_awac(output_path, dsdt_context=None):
+        """Generate SSDT-AWAC"""
+        return write_ssdt(output_path, EssentialGenerators.render_awac(dsdt_context))
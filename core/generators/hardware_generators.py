@@ -1,11 +1,14 @@
 """Hardware SSDT generators"""
 
+from .output import write_ssdt
+
+
 class HardwareGenerators:
     """Generate hardware-related SSDTs"""
     
     @staticmethod
-    def generate_hpet(output_path, dsdt_context=None):
-        """Generate SSDT-HPET"""
+    def render_hpet(dsdt_context=None):
+        """Render SSDT-HPET as text"""
         # Get HPET path
         if dsdt_context and dsdt_context.hpet_device:
             hpet_path = dsdt_context.hpet_device
@@ -45,13 +48,16 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "HPET", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
     
     @staticmethod
-    def generate_pmc(output_path, dsdt_context=None):
-        """Generate SSDT-PMC"""
+    def generate_hpet(output_path, dsdt_context=None):
+        """Generate SSDT-HPET"""
+        return write_ssdt(output_path, HardwareGenerators.render_hpet(dsdt_context))
+    
+    @staticmethod
+    def render_pmc(dsdt_context=None):
+        """Render SSDT-PMC as text"""
         # Get LPC bridge path
         if dsdt_context and dsdt_context.lpc_bridge:
             lpc_path = dsdt_context.lpc_bridge
@@ -105,13 +111,16 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "PMC", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
     
     @staticmethod
-    def generate_sbus(output_path, dsdt_context=None):
-        """Generate SSDT-SBUS"""
+    def generate_pmc(output_path, dsdt_context=None):
+        """Generate SSDT-PMC"""
+        return write_ssdt(output_path, HardwareGenerators.render_pmc(dsdt_context))
+    
+    @staticmethod
+    def render_sbus(dsdt_context=None):
+        """Render SSDT-SBUS as text"""
         # Get SMBus path
         if dsdt_context and dsdt_context.smbus:
             sbus_path = dsdt_context.smbus
@@ -164,6 +173,9 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "SBUS", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
+    
+    @staticmethod
+    def generate_sbus(output_path, dsdt_context=None):
+        """Generate SSDT-SBUS"""
+        return write_ssdt(output_path, HardwareGenerators.render_sbus(dsdt_context))
@@ -1,11 +1,14 @@
 """Laptop-specific SSDT generators"""
 
+from .output import write_ssdt
+
+
 class LaptopGenerators:
     """Generate laptop-specific SSDTs"""
     
     @staticmethod
-    def generate_pnlf(output_path, dsdt_context=None):
-        """Generate SSDT-PNLF for backlight control"""
+    def render_pnlf(dsdt_context=None):
+        """Render SSDT-PNLF as text"""
         # Get GPU path
         if dsdt_context and dsdt_context.gpu_device:
             gpu_path = dsdt_context.gpu_device
@@ -54,13 +57,16 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "PNLF", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
     
     @staticmethod
-    def generate_als0(output_path, dsdt_context=None):
-        """Generate SSDT-ALS0 for ambient light sensor"""
+    def generate_pnlf(output_path, dsdt_context=None):
+        """Generate SSDT-PNLF for backlight control"""
+        return write_ssdt(output_path, LaptopGenerators.render_pnlf(dsdt_context))
+    
+    @staticmethod
+    def render_als0(dsdt_context=None):
+        """Render SSDT-ALS0 as text"""
         # Get LPC bridge path
         if dsdt_context and dsdt_context.lpc_bridge:
             lpc_path = dsdt_context.lpc_bridge
@@ -117,13 +123,16 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "ALS0", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
     
     @staticmethod
-    def generate_gpi0(output_path, dsdt_context=None):
-        """Generate SSDT-GPI0 for GPIO"""
+    def generate_als0(output_path, dsdt_context=None):
+        """Generate SSDT-ALS0 for ambient light sensor"""
+        return write_ssdt(output_path, LaptopGenerators.render_als0(dsdt_context))
+    
+    @staticmethod
+    def render_gpi0(dsdt_context=None):
+        """Render SSDT-GPI0 as text"""
         # Get GPIO path
         if dsdt_context and dsdt_context.gpio_device:
             gpio_path = dsdt_context.gpio_device
@@ -166,6 +175,9 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "GPI0", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
+    
+    @staticmethod
+    def generate_gpi0(output_path, dsdt_context=None):
+        """Generate SSDT-GPI0 for GPIO"""
+        return write_ssdt(output_path, LaptopGenerators.render_gpi0(dsdt_context))
@@ -0,0 +1,137 @@
+"""Manifest of generated SSDTs for incremental regeneration"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+from .output import write_ssdt_atomic
+from .registry import REGISTRY
+from .template_repository import TEMPLATES
+
+
+MANIFEST_NAME = '.ssdt-manifest.json'
+MANIFEST_FORMAT = 1
+
+def content_hash(content):
+    """SHA-256 of rendered SSDT text as it is written (UTF-8)"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def patch_inputs(patch_name, dsdt_context=None):
+    """Describe what a patch was rendered from: context paths and template"""
+    entry = REGISTRY.get(patch_name)
+    if entry is None:
+        template_name = TEMPLATES.find(patch_name)[0]
+        roles = ()
+    elif entry.context_inputs:
+        template_name = None
+        roles = entry.context_inputs
+    else:
+        template_name = entry.template
+        roles = ()
+    
+    inputs = {}
+    if template_name:
+        compiled = TEMPLATES.compiled(template_name)
+        roles = sorted(compiled.roles) if compiled else ()
+        inputs['template'] = template_name
+        inputs['template_sha256'] = content_hash(TEMPLATES.get(template_name) or '')
+    if roles:
+        inputs['context'] = {
+            role: getattr(dsdt_context, role, None) if dsdt_context else None
+            for role in roles
+        }
+    return inputs
+
+
+class GenerationManifest:
+    """Content hashes of the SSDTs generated into one output directory
+
+    A patch is skipped when its rendered content hashes to the recorded
+    value and the file on disk still has the recorded size and mtime, so
+    unchanged files keep their mtime. Files whose stat does not match are
+    compared by content instead.
+    """
+    
+    def __init__(self, output_dir):
+        self.path = Path(output_dir) / MANIFEST_NAME
+        self.entries = {}
+        self.changed = False
+        self._lock = threading.Lock()
+    
+    def load(self):
+        """Read the manifest; a missing or unreadable one counts as empty"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == MANIFEST_FORMAT:
+                self.entries = data.get('patches', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable manifest {self.path}: {e}", file=sys.stderr)
+        return self
+    
+    def is_current(self, patch_name, digest, output_path, inputs=None):
+        """Check whether output_path already holds content with this hash
+
+        Files from before the manifest existed are compared by content once
+        and then adopted into the manifest.
+        """
+        entry = self.entries.get(patch_name)
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        
+        if entry and stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns'):
+            if entry.get('sha256') != digest:
+                return False
+            if inputs and any(entry.get(key) != value for key, value in inputs.items()):
+                self.record(patch_name, digest, output_path, inputs)
+            return True
+        
+        # Unknown or externally modified file: compare its content
+        try:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                current = f.read()
+        except (OSError, UnicodeDecodeError):
+            return False
+        if content_hash(current) != digest:
+            return False
+        self.record(patch_name, digest, output_path, inputs)
+        return True
+    
+    def record(self, patch_name, digest, output_path, inputs=None):
+        """Remember the hash and on-disk stat of a freshly written patch"""
+        stat = os.stat(output_path)
+        entry = {
+            'sha256': digest,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'file': Path(output_path).name
+        }
+        if inputs:
+            entry.update(inputs)
+        with self._lock:
+            self.entries[patch_name] = entry
+            self.changed = True
+    
+    def save(self):
+        """Write the manifest atomically if anything was recorded"""
+        with self._lock:
+            if not self.changed:
+                return False
+            data = {'format': MANIFEST_FORMAT, 'patches': dict(sorted(self.entries.items()))}
+            self.changed = False
+        try:
+            write_ssdt_atomic(self.path, json.dumps(data, indent=1))
+        except OSError as e:
+            print(f"Error writing manifest {self.path}: {e}", file=sys.stderr)
+            return False
+        return True
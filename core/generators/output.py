@@ -0,0 +1,54 @@
+"""Output sinks for rendered SSDT text"""
+
+import os
+import threading
+import zipfile
+
+
+def write_ssdt(output_path, content):
+    """Write rendered SSDT text (or bytes) to output_path
+
+    Returns False when there is nothing to write (content is None).
+    """
+    if content is None:
+        return False
+    
+    if isinstance(content, bytes):
+        with open(output_path, 'wb') as f:
+            f.write(content)
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return True
+
+
+def write_ssdt_atomic(output_path, content):
+    """Write SSDT content to a temporary name next to output_path, then rename
+
+    Readers never see a partially written file, and a failed write leaves
+    any previous version in place.
+    """
+    if content is None:
+        return False
+    
+    output_path = os.fspath(output_path)
+    directory, name = os.path.split(output_path)
+    temp_path = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write_ssdt(temp_path, content)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def write_bundle(output_path, rendered):
+    """Write {patch name: content} into a single zip archive of .dsl files"""
+    with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+        for patch_name, content in rendered.items():
+            bundle.writestr(f"{patch_name}.dsl", content)
+    return len(rendered)
@@ -0,0 +1,131 @@
+"""Parallel, atomic generation of SSDT files on a thread pool"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .manifest import GenerationManifest, content_hash, patch_inputs
+from .output import write_ssdt_atomic
+from .registry import render_patch
+
+
+# Generation is mostly file I/O, so threads beyond the CPU count still help
+DEFAULT_WORKERS = 8
+
+
+def generate_one(patch_name, output_dir, dsdt_context=None, manifest=None):
+    """Render one patch and write it atomically, timing both steps
+
+    With a manifest, the file is left untouched when its content is
+    unchanged and the result is marked as skipped.
+    """
+    result = {'patch': patch_name, 'ok': False}
+    start = time.perf_counter()
+    try:
+        content = render_patch(patch_name, dsdt_context)
+        rendered = time.perf_counter()
+        result['render_ms'] = round((rendered - start) * 1000, 3)
+        if not content:
+            result['error'] = 'template not found'
+            return result
+        
+        output_path = Path(output_dir) / f"{patch_name}.dsl"
+        result.update({'path': str(output_path), 'size': len(content), 'skipped': False})
+        if manifest is not None:
+            digest = content_hash(content)
+            inputs = patch_inputs(patch_name, dsdt_context)
+            if manifest.is_current(patch_name, digest, output_path, inputs):
+                result.update({'ok': True, 'skipped': True})
+                return result
+        
+        write_ssdt_atomic(output_path, content)
+        if manifest is not None:
+            manifest.record(patch_name, digest, output_path, inputs)
+        result['write_ms'] = round((time.perf_counter() - rendered) * 1000, 3)
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        result['ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+class GenerationSummary:
+    """Per-patch results and timings for a generation run"""
+    
+    def __init__(self):
+        self.results = []
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+    
+    def add(self, result):
+        self.results.append(result)
+        self.elapsed = time.perf_counter() - self.start
+    
+    @property
+    def generated(self):
+        return [result['patch'] for result in self.results if result['ok']]
+    
+    @property
+    def written(self):
+        return [result['patch'] for result in self.results if result['ok'] and not result.get('skipped')]
+    
+    @property
+    def skipped(self):
+        return [result['patch'] for result in self.results if result.get('skipped')]
+    
+    @property
+    def failed(self):
+        return [result for result in self.results if not result['ok']]
+    
+    def slowest(self, count=5):
+        """The count slowest patches as (name, total ms), slowest first"""
+        ranked = sorted(self.results, key=lambda result: result['ms'], reverse=True)
+        return [(result['patch'], result['ms']) for result in ranked[:count]]
+    
+    def summary(self):
+        """Totals, per-step time and the slowest patches as a dict"""
+        return {
+            'generated': len(self.generated),
+            'written': len(self.written),
+            'skipped': len(self.skipped),
+            'failed': len(self.failed),
+            'seconds': round(self.elapsed, 3),
+            'render_ms': round(sum(r.get('render_ms', 0) for r in self.results), 3),
+            'write_ms': round(sum(r.get('write_ms', 0) for r in self.results), 3),
+            'slowest': [{'patch': name, 'ms': ms} for name, ms in self.slowest()]
+        }
+
+
+def generate_patches(patch_names, output_dir, dsdt_context=None, workers=None, summary=None,
+                     incremental=True):
+    """Generate patches on a thread pool, yielding results as they complete
+
+    Duplicate names are generated once. When incremental, unchanged files
+    are skipped using the manifest in output_dir, which is updated at the
+    end. Closing the generator early (e.g. on cancel) drops the patches
+    that have not started yet.
+    """
+    patch_names = list(dict.fromkeys(patch_names))
+    if not patch_names:
+        return
+    workers = min(workers or DEFAULT_WORKERS, len(patch_names))
+    manifest = GenerationManifest(output_dir).load() if incremental else None
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(generate_one, name, output_dir, dsdt_context, manifest)
+                       for name in patch_names]
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    if summary is not None:
+                        summary.add(result)
+                    yield result
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        # Record whatever was written, even if the run was cancelled
+        if manifest is not None:
+            manifest.save()
@@ -0,0 +1,172 @@
+"""Registry mapping every known patch to its renderer, built once at import"""
+
+from functools import partial
+
+from ..patch_info import PatchManager
+from .essential_generators import EssentialGenerators
+from .hardware_generators import HardwareGenerators
+from .laptop_generators import LaptopGenerators
+from .usb_generators import USBGenerators
+from .advanced_generators import AdvancedGenerators
+from .output import write_ssdt
+from .template_repository import TEMPLATES
+
+
+# Patches with a dedicated renderer; all others use their template
+RENDERERS = {
+    'SSDT-EC': EssentialGenerators.render_ec,
+    'SSDT-PLUG': EssentialGenerators.render_plug,
+    'SSDT-AWAC': EssentialGenerators.render_awac,
+    'SSDT-HPET': HardwareGenerators.render_hpet,
+    'SSDT-PMC': HardwareGenerators.render_pmc,
+    'SSDT-SBUS': HardwareGenerators.render_sbus,
+    'SSDT-PNLF': LaptopGenerators.render_pnlf,
+    'SSDT-ALS0': LaptopGenerators.render_als0,
+    'SSDT-GPI0': LaptopGenerators.render_gpi0,
+    'SSDT-USBX': USBGenerators.render_usbx,
+    'SSDT-USB-Reset': USBGenerators.render_usb_reset,
+    'SSDT-XOSI': AdvancedGenerators.render_xosi,
+    'SSDT-GPU-DISABLE': AdvancedGenerators.render_gpu_disable,
+    'SSDT-GPU-SPOOF': AdvancedGenerators.render_gpu_spoof,
+    'SSDT-dGPU-Off': AdvancedGenerators.render_dgpu_off,
+    'SSDT-NoHybGfx': AdvancedGenerators.render_nohybgfx,
+    'SSDT-RHUB': AdvancedGenerators.render_rhub,
+    'SSDT-RHUB-prebuilt': AdvancedGenerators.render_rhub_prebuilt,
+    'SSDT-UNC': AdvancedGenerators.render_unc,
+    'SSDT-RTC0-RANGE': AdvancedGenerators.render_rtc0_range,
+    'SSDT-CPUR': AdvancedGenerators.render_cpur,
+    'SSDT-IMEI': AdvancedGenerators.render_imei,
+    'SSDT-EC-USBX-DESKTOP': AdvancedGenerators.render_ec_usbx_desktop,
+    'SSDT-EC-USBX-LAPTOP': AdvancedGenerators.render_ec_usbx_laptop,
+    'SSDT-PLUG-DRTNIA': AdvancedGenerators.render_plug_drtnia,
+}
+
+# DSDTContext attributes each DSDT-aware renderer reads
+CONTEXT_INPUTS = {
+    'SSDT-EC': ('lpc_bridge',),
+    'SSDT-PLUG': ('cpu_path',),
+    'SSDT-AWAC': ('analyzed',),
+    'SSDT-HPET': ('hpet_device',),
+    'SSDT-PMC': ('lpc_bridge',),
+    'SSDT-SBUS': ('smbus',),
+    'SSDT-PNLF': ('gpu_device',),
+    'SSDT-ALS0': ('lpc_bridge',),
+    'SSDT-GPI0': ('gpio_device',),
+    'SSDT-USBX': ('usb_controller',),
+    'SSDT-USB-Reset': ('usb_controller',),
+}
+
+# Template files whose name differs from the patch name
+TEMPLATE_OVERRIDES = {
+    'SSDT-RTC0-RANGE': 'SSDT-RTC0-RANGE-HEDT.dsl',
+    'SSDT-IMEI': 'SSDT-IMEI-S.dsl',
+}
+
+
+class RegistryError(Exception):
+    """The generator registry does not match the known patches"""
+
+
+class RegisteredPatch:
+    """Renderer and inputs of one patch, resolved once"""
+    
+    __slots__ = ('name', 'render', 'template', 'context_inputs')
+    
+    def __init__(self, name, render, template=None, context_inputs=()):
+        self.name = name
+        self.render = render
+        self.template = template
+        self.context_inputs = context_inputs
+    
+    def generate(self, output_path, dsdt_context=None):
+        """Render and write this patch to output_path"""
+        return write_ssdt(output_path, self.render(dsdt_context))
+    
+    def __repr__(self):
+        return f"RegisteredPatch({self.name}, template={self.template})"
+
+
+def build_registry(patches=None):
+    """Resolve a renderer for every patch; each takes (dsdt_context=None)
+
+    DSDT-aware patches use their generator class. All other patches are
+    bound to their template file here, so dispatch never searches the
+    template directory; patches without a template get a placeholder.
+    """
+    if patches is None:
+        patches = PatchManager().patches
+    
+    registry = {}
+    for patch in patches:
+        name = patch.name
+        if name in registry:
+            continue
+        template = None
+        if name not in CONTEXT_INPUTS:
+            template = TEMPLATE_OVERRIDES.get(name) or TEMPLATES.resolve(name)
+        
+        render = RENDERERS.get(name)
+        if render is None:
+            if template:
+                render = partial(AdvancedGenerators.render_template, template)
+            else:
+                render = partial(AdvancedGenerators.render_placeholder, name)
+        registry[name] = RegisteredPatch(name, render, template, CONTEXT_INPUTS.get(name, ()))
+    
+    validate_registry(registry, patches)
+    return registry
+
+
+def validate_registry(registry, patches):
+    """Raise RegistryError if the registry and the patch list disagree"""
+    names = {patch.name for patch in patches}
+    problems = []
+    
+    missing = names - set(registry)
+    if missing:
+        problems.append(f"no renderer for {', '.join(sorted(missing))}")
+    
+    unknown = (set(RENDERERS) | set(CONTEXT_INPUTS)) - names
+    if unknown:
+        problems.append(f"renderers for unknown patches {', '.join(sorted(unknown))}")
+    
+    for name, entry in registry.items():
+        if not _takes_one_argument(entry.render):
+            problems.append(f"{name} renderer does not accept (dsdt_context)")
+    
+    if problems:
+        raise RegistryError("; ".join(problems))
+
+
+def _takes_one_argument(render):
+    """Check that render can be called as render(dsdt_context)"""
+    bound = 0
+    if isinstance(render, partial):
+        bound = len(render.args)
+        render = render.func
+    code = getattr(render, '__code__', None)
+    if code is None:
+        return callable(render)
+    required = code.co_argcount - len(render.__defaults__ or ())
+    return required - bound <= 1 <= code.co_argcount - bound
+
+
+REGISTRY = build_registry()
+
+
+def render_patch(patch_name, dsdt_context=None):
+    """Render a single patch as SSDT text without touching disk"""
+    entry = REGISTRY.get(patch_name)
+    if entry:
+        return entry.render(dsdt_context)
+    else:
+        # Names outside the patch list (e.g. custom ones) search the templates
+        return AdvancedGenerators.render_from_template(patch_name, dsdt_context)
+
+
+def generate_patch(patch_name, output_path, dsdt_context=None):
+    """Generate a single patch file"""
+    entry = REGISTRY.get(patch_name)
+    if entry:
+        return entry.generate(output_path, dsdt_context)
+    return write_ssdt(output_path, render_patch(patch_name, dsdt_context))
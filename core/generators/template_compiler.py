@@ -0,0 +1,150 @@
+"""Compile SSDT templates into placeholders bound to detected device paths
+
+Templates hard-code generic paths such as _SB.PCI0.LPCB or _SB_.PCI0.XHC_.
+A template is scanned once for ACPI path literals. Each literal that starts
+with the generic path of one or more DSDTContext roles is recorded as a
+placeholder, and rendering for a machine only joins the text with the
+detected paths, taking the longest generic prefix whose role was detected.
+"""
+
+import re
+
+
+# Role attribute on DSDTContext and the generic path templates assume for it.
+# Longer paths are listed first so the longest detected prefix wins.
+ROLE_DEFAULTS = (
+    ('hpet_device', ('_SB', 'PCI0', 'LPCB', 'HPET')),
+    ('lpc_bridge', ('_SB', 'PCI0', 'LPCB')),
+    ('gpu_device', ('_SB', 'PCI0', 'GFX0')),
+    ('usb_controller', ('_SB', 'PCI0', 'XHC')),
+    ('smbus', ('_SB', 'PCI0', 'SBUS')),
+    ('gpio_device', ('_SB', 'PCI0', 'GPI0')),
+    ('pci_root', ('_SB', 'PCI0')),
+    ('cpu_path', ('_PR', 'CPU0')),
+)
+
+# Absolute-style path from \_SB or \_PR with at least one more segment
+PATH_RE = re.compile(
+    r'(?<![A-Za-z0-9_.\\])(\\?)(_(?:SB|PR)_?(?:\.[A-Z_][A-Z0-9_]{0,3})+)(?![A-Za-z0-9_.])'
+)
+
+
+def split_path(path):
+    """Split a dotted ACPI path into segments without root or padding"""
+    return tuple(segment.rstrip('_') or '_' for segment in path.lstrip('\\').split('.'))
+
+
+class Placeholder:
+    """A path literal whose leading segments are a role's generic path
+
+    roles lists (role, generic path length) for every role whose generic
+    path starts the literal, longest first. Rendering uses the first one
+    that was detected and keeps the literal's remaining segments, so
+    _SB.PCI0.LPCB.HPET still follows a detected LPC bridge when no HPET
+    was found.
+    """
+
+    __slots__ = ('roles', 'original', 'path', 'backslash', 'padded', 'raw_segments')
+
+    def __init__(self, roles, original, path, backslash, padded, raw_segments):
+        self.roles = roles
+        self.original = original
+        self.path = path
+        self.backslash = backslash
+        self.padded = padded
+        self.raw_segments = raw_segments
+
+    def format(self, path, length):
+        """Write a detected path in place of the first length segments, in this literal's style"""
+        segments = split_path(path)
+        padded = self.padded[:length]
+        segments = [
+            segment.ljust(4, '_') if (padded[i] if i < len(padded) else padded[-1]) else segment
+            for i, segment in enumerate(segments)
+        ]
+        suffix = ''.join('.' + raw for raw in self.raw_segments[length:])
+        return self.backslash + '.'.join(segments) + suffix
+
+
+class CompiledTemplate:
+    """Template text split into literal parts and role placeholders"""
+
+    __slots__ = ('parts', 'roles', 'fixed_paths')
+
+    def __init__(self, parts, roles, fixed_paths):
+        self.parts = parts
+        self.roles = roles
+        self.fixed_paths = fixed_paths
+
+    def render(self, dsdt_context=None):
+        """Join the template with paths from dsdt_context
+
+        Literals none of whose roles were detected keep the template's own
+        text. So do literals whose new path would collide with another path
+        in the template, as in templates that list several alternative names.
+        """
+        if not self.roles or dsdt_context is None:
+            return ''.join(part if type(part) is str else part.original for part in self.parts)
+
+        detected = {}
+        for role in self.roles:
+            path = getattr(dsdt_context, role, None)
+            detected[role] = '.'.join(split_path(path)) if path else None
+
+        replacements = {}
+        sources = {}
+        for part in self.parts:
+            if type(part) is str:
+                continue
+            for role, length in part.roles:
+                if detected[role] is not None:
+                    rendered = part.format(detected[role], length)
+                    target = split_path(rendered)
+                    replacements[part] = (rendered, target)
+                    sources.setdefault(target, set()).add(part.path)
+                    break
+
+        output = []
+        for part in self.parts:
+            if type(part) is str:
+                output.append(part)
+                continue
+            replacement = replacements.get(part)
+            if replacement is None:
+                output.append(part.original)
+                continue
+            rendered, target = replacement
+            if len(sources[target]) > 1 or (target in self.fixed_paths and target != part.path):
+                output.append(part.original)
+            else:
+                output.append(rendered)
+        return ''.join(output)
+
+
+def compile_template(content):
+    """Scan template content once and return a CompiledTemplate"""
+    parts = []
+    roles = set()
+    fixed_paths = set()
+    position = 0
+    for match in PATH_RE.finditer(content):
+        backslash, path = match.groups()
+        raw_segments = path.split('.')
+        segments = split_path(path)
+
+        matches = tuple((role, len(default)) for role, default in ROLE_DEFAULTS
+                        if segments[:len(default)] == default)
+        if not matches:
+            fixed_paths.add(segments)
+            continue
+
+        # Per segment: was it padded to four characters?
+        padded = tuple(len(raw) == 4 and raw.endswith('_') for raw in raw_segments)
+        parts.append(content[position:match.start()])
+        parts.append(Placeholder(matches, match.group(0), segments, backslash, padded,
+                                 tuple(raw_segments)))
+        roles.update(role for role, _ in matches)
+        position = match.end()
+
+    parts.append(content[position:])
+    return CompiledTemplate(parts, frozenset(roles), frozenset(fixed_paths))
@@ -0,0 +1,131 @@
+"""In-memory repository of SSDT templates"""
+
+import os
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+from .template_compiler import compile_template
+
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+TEMPLATE_SUFFIX = '.dsl'
+
+
+class TemplateRepository:
+    """Template store with a sorted name index and memoized contents
+
+    The template directory is listed once, on first use; each template
+    file is read at most once and then served from memory, and compiled
+    at most once for path substitution.
+    """
+
+    def __init__(self, directory=TEMPLATE_DIR):
+        self.directory = Path(directory)
+        self._names = None
+        self._name_set = None
+        self._contents = {}
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def names(self):
+        """Sorted list of template file names"""
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    try:
+                        with os.scandir(self.directory) as entries:
+                            names = sorted(entry.name for entry in entries
+                                           if entry.name.endswith(TEMPLATE_SUFFIX) and entry.is_file())
+                    except OSError:
+                        names = []
+                    self._name_set = frozenset(names)
+                    self._names = names
+        return self._names
+
+    def __contains__(self, name):
+        self.names()
+        return self._normalize(name) in self._name_set
+
+    def __len__(self):
+        return len(self.names())
+
+    def get(self, name):
+        """Get template content by name (with or without .dsl), or None"""
+        name = self._normalize(name)
+        content = self._contents.get(name)
+        if content is not None or name not in self:
+            return content
+
+        with self._lock:
+            content = self._contents.get(name)
+            if content is None:
+                try:
+                    with open(self.directory / name, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except OSError:
+                    return None
+                self._contents[name] = content
+        return content
+
+    def compiled(self, name):
+        """Get the CompiledTemplate for a template name, or None"""
+        name = self._normalize(name)
+        compiled = self._compiled.get(name)
+        if compiled is None:
+            content = self.get(name)
+            if content is None:
+                return None
+            compiled = compile_template(content)
+            with self._lock:
+                compiled = self._compiled.setdefault(name, compiled)
+        return compiled
+    
+    def with_prefix(self, prefix):
+        """Template names starting with prefix, in sorted order"""
+        names = self.names()
+        matches = []
+        for i in range(bisect_left(names, prefix), len(names)):
+            if not names[i].startswith(prefix):
+                break
+            matches.append(names[i])
+        return matches
+
+    def resolve(self, patch_name):
+        """Template name for a patch without reading it: exact, then by prefix"""
+        exact = self._normalize(patch_name)
+        if exact in self:
+            return exact
+        matches = self.with_prefix(patch_name)
+        return matches[0] if matches else None
+    
+    def find(self, patch_name):
+        """Find the template for a patch: exact name first, then by prefix
+
+        Returns (template name, content), or (None, None) if none exists.
+        """
+        exact = self._normalize(patch_name)
+        if exact in self:
+            content = self.get(exact)
+            if content:
+                return exact, content
+
+        for name in self.with_prefix(patch_name):
+            content = self.get(name)
+            if content:
+                return name, content
+        return None, None
+
+    def load_all(self):
+        """Read every template into memory"""
+        for name in self.names():
+            self.get(name)
+        return len(self._contents)
+
+    @staticmethod
+    def _normalize(name):
+        return name if name.endswith(TEMPLATE_SUFFIX) else name + TEMPLATE_SUFFIX
+
+
+# Shared repository used by the generators and the manual editor
+TEMPLATES = TemplateRepository()
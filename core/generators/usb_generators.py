@@ -1,11 +1,14 @@
 """USB-related SSDT generators"""
 
+from .output import write_ssdt
+
+
 class USBGenerators:
     """Generate USB-related SSDTs"""
     
     @staticmethod
-    def generate_usbx(output_path, dsdt_context=None):
-        """Generate SSDT-USBX for USB power properties"""
+    def render_usbx(dsdt_context=None):
+        """Render SSDT-USBX as text"""
         # Get USB controller path
         if dsdt_context and dsdt_context.usb_controller:
             usb_path = dsdt_context.usb_controller
@@ -71,13 +74,16 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "USBX", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
     
     @staticmethod
-    def generate_usb_reset(output_path, dsdt_context=None):
-        """Generate SSDT-USB-Reset"""
+    def generate_usbx(output_path, dsdt_context=None):
+        """Generate SSDT-USBX for USB power properties"""
+        return write_ssdt(output_path, USBGenerators.render_usbx(dsdt_context))
+    
+    @staticmethod
+    def render_usb_reset(dsdt_context=None):
+        """Render SSDT-USB-Reset as text"""
         # Get USB controller path
         if dsdt_context and dsdt_context.usb_controller:
             usb_path = dsdt_context.usb_controller
@@ -121,6 +127,9 @@ DefinitionBlock ("", "SSDT", 2, "ACPI", "USBRST", 0x00000000)
     }}
 }}
 """
-        with open(output_path, 'w') as f:
-            f.write(content)
-        return True
+        return content
+    
+    @staticmethod
+    def generate_usb_reset(output_path, dsdt_context=None):
+        """Generate SSDT-USB-Reset"""
+        return write_ssdt(output_path, USBGenerators.render_usb_reset(dsdt_context))
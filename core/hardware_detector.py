@@ -15,6 +15,13 @@ class HardwareDetector:
 
     def detect(self):
         """Detect hardware and return information"""
+        if self.acpi_parser is None:
+            return self._detect()
+        with self.acpi_parser.stats.phase('recommend', 'analyze'):
+            return self._detect()
+
+    def _detect(self):
+        """Run every detection step"""
         self.detect_cpu()
         self.detect_platform()
         self.detect_chipset()
@@ -0,0 +1,467 @@
+"""Incremental re-parsing of a DSL file that changed on disk
+
+A text parse splits the file into top-level blocks: every declaration at
+the root of the namespace starts one, and it runs until the next. Each
+block keeps its byte range, a hash of its text and a journal of what it
+declared. When the file changes, only the blocks whose text changed are
+parsed again: their old declarations are undone, the new ones are
+spliced into the namespace and records, and only the detection roles
+that involve the touched nodes are resolved again.
+"""
+
+import re
+from bisect import bisect_right
+
+from .acpi_lexer import tokenize, match_braces
+from .namespace import Journal, SCOPE_KINDS, PREDEFINED_SCOPES
+
+
+# Characters compared per step when looking for the changed region
+COMPARE_CHUNK = 4096
+
+# Record lists of ACPIParser, in the order of SourceBlock.counts
+RECORD_LISTS = ('devices', 'methods', 'scopes', 'processors')
+
+# Kinds of references that do not declare an object themselves
+PLACEHOLDER_KINDS = (None, 'Scope', 'External')
+
+_BRACE_RE = re.compile(r'[{}]')
+
+
+class SourceBlock:
+    """A top-level block of a DSL file and what it declared
+
+    digest is the hash of the block's text, computed when first compared.
+    created lists the nodes it created, upgrades the (node, kind)
+    placeholders it turned into real objects, refs the (node, kind, offset)
+    references it made (see Namespace.journal), values the (node,
+    attribute, value, offset) of every _HID/_CID/_ADR Name() in it, whether
+    or not it set the value, and counts its number of device, method,
+    scope and processor records.
+    """
+
+    __slots__ = ('start', 'end', 'digest', 'created', 'upgrades', 'refs', 'values', 'counts')
+
+    def __init__(self, start, end, created, upgrades, refs, values, counts):
+        self.start = start
+        self.end = end
+        self.digest = None
+        self.created = created
+        self.upgrades = upgrades
+        self.refs = refs
+        self.values = values
+        self.counts = counts
+
+    def __repr__(self):
+        return f"SourceBlock({self.start}-{self.end})"
+
+
+class BlockTracker:
+    """Cut one declaration pass into SourceBlocks
+
+    The parser calls split() at every top-level token, value() at every
+    _HID/_CID/_ADR Name(), and finish() at the end of the pass. hids keeps
+    the _HID each of those nodes had before the pass.
+    """
+
+    def __init__(self, parser, start=0):
+        self.parser = parser
+        self.start = start
+        self.blocks = []
+        self.values = []
+        self.hids = {}
+        self.journal = parser.namespace.journal = Journal()
+        self.counts = self._counts()
+
+    def split(self, offset):
+        """Start a new block at a top-level token"""
+        if offset > self.start:
+            self._close(offset)
+
+    def value(self, node, attribute, value, offset):
+        """Note a _HID/_CID/_ADR value named in node's scope"""
+        if node not in self.hids:
+            self.hids[node] = node.hid
+        self.values.append((node, attribute, value, offset))
+
+    def finish(self, end):
+        """Close the last block and stop journaling; returns the blocks"""
+        if end > self.start or self.journal or self.values:
+            self._close(end)
+        self.parser.namespace.journal = None
+        return self.blocks
+
+    def _counts(self):
+        parser = self.parser
+        return (len(parser.devices), len(parser.methods), len(parser.scopes),
+                len(parser.processors))
+
+    def _close(self, end):
+        journal = self.journal
+        counts = self._counts()
+        self.blocks.append(SourceBlock(
+            self.start, end, journal.created, journal.upgrades, journal.refs, self.values,
+            tuple(now - before for now, before in zip(counts, self.counts))
+        ))
+        journal.created = []
+        journal.upgrades = []
+        journal.refs = []
+        self.values = []
+        self.counts = counts
+        self.start = end
+
+
+def common_prefix(a, b):
+    """Length of the common prefix of two strings"""
+    limit = min(len(a), len(b))
+    low = 0
+    while low < limit and a[low:low + COMPARE_CHUNK] == b[low:low + COMPARE_CHUNK]:
+        low += COMPARE_CHUNK
+    high = min(low + COMPARE_CHUNK, limit)
+    while low < high and a[low] == b[low]:
+        low += 1
+    return min(low, limit)
+
+
+def common_suffix(a, b, limit):
+    """Length of the common suffix of two strings, at most limit"""
+    size_a = len(a)
+    size_b = len(b)
+    low = 0
+    while (low + COMPARE_CHUNK <= limit
+           and a[size_a - low - COMPARE_CHUNK:size_a - low] == b[size_b - low - COMPARE_CHUNK:size_b - low]):
+        low += COMPARE_CHUNK
+    while low < limit and a[size_a - low - 1] == b[size_b - low - 1]:
+        low += 1
+    return low
+
+
+def unpaired_braces(text):
+    """(unmatched '}', unmatched '{') counts of text"""
+    depth = 0
+    closes = 0
+    for match in _BRACE_RE.finditer(text):
+        if match.group() == '{':
+            depth += 1
+        elif depth:
+            depth -= 1
+        else:
+            closes += 1
+    return closes, depth
+
+
+def reparse(parser, content):
+    """Splice the top-level blocks of content that changed into parser
+
+    parser must hold the text parse (with blocks) of the previous
+    content. Returns a summary dict, or None if the change cannot be
+    spliced (braces of the changed blocks no longer pair up among
+    themselves) and the file must be parsed again in full.
+    """
+    old = parser.content
+    blocks = parser.blocks
+    if not blocks:
+        return None
+
+    start = common_prefix(old, content)
+    if start == len(old) == len(content):
+        return {'blocks': 0, 'removed': 0, 'nodes': 0, 'roles': [], 'paths': {}}
+    old_end = len(old) - common_suffix(old, content, min(len(old), len(content)) - start)
+    delta = len(content) - len(old)
+
+    # Blocks holding the changed lines; the tokenizer looks at whole lines
+    starts = [block.start for block in blocks]
+    first = bisect_right(starts, max(old.rfind('\n', 0, start), 0)) - 1
+    line_end = old.find('\n', old_end)
+    last = bisect_right(starts, min(line_end if line_end >= 0 else len(old), len(old) - 1)) - 1
+    window_start = blocks[first].start
+    window_end = blocks[last].end
+
+    text = content[window_start:window_end + delta]
+    if unpaired_braces(old[window_start:window_end]) != unpaired_braces(text):
+        return None
+    braces = match_braces(text)
+    parser.stats.count('regex_scans', 2)
+
+    # Tokens of the window in file offsets; every scope must close inside it
+    tokens = []
+    top_close = -1
+    splits = [window_start]
+    for kind, name, offset, value in tokenize(text, parser.stats.counters, braces):
+        if kind == 'Field':
+            continue
+        close = None
+        if kind in SCOPE_KINDS:
+            close = braces.close_after(offset)
+            if close is None or close >= len(text):
+                return None
+            close += window_start
+        offset += window_start
+        if offset > top_close:
+            if offset > window_start:
+                splits.append(offset)
+            if close is not None:
+                top_close = close
+        tokens.append((kind, name, offset, value, close))
+
+    # Keep the blocks at either end of the window whose text is unchanged
+    ends = splits[1:] + [window_end + delta]
+    pieces = [(piece_start, piece_end, hash(content[piece_start:piece_end]))
+              for piece_start, piece_end in zip(splits, ends) if piece_end > piece_start]
+    old_pieces = blocks[first:last + 1]
+    for block in old_pieces:
+        if block.digest is None:
+            block.digest = hash(old[block.start:block.end])
+    keep_head = 0
+    while (keep_head < min(len(pieces), len(old_pieces))
+           and _same(old_pieces[keep_head], pieces[keep_head])):
+        keep_head += 1
+    keep_tail = 0
+    while (keep_tail < min(len(pieces), len(old_pieces)) - keep_head
+           and _same(old_pieces[-1 - keep_tail], pieces[-1 - keep_tail])):
+        keep_tail += 1
+
+    removed = old_pieces[keep_head:len(old_pieces) - keep_tail]
+    changed_start = removed[0].start if removed else pieces[keep_head][0]
+    changed_end = removed[-1].end if removed else changed_start
+    tail_start = first + keep_head + len(removed)
+
+    # Undo the old blocks, move everything after them, declare the new ones
+    changes = {}
+    head = blocks[:first + keep_head]
+    tail = blocks[tail_start:]
+    record_starts = _record_starts(blocks, first + keep_head)
+    if removed:
+        _undo(parser.namespace, removed, head + tail, changes)
+    if delta:
+        _shift(parser, tail, changed_end, delta)
+    new_blocks, records, hids = _declare(parser, content, changed_start, changed_end + delta,
+                                         [token for token in tokens
+                                          if changed_start <= token[2] < changed_end + delta])
+    _splice_records(parser, record_starts, removed, records, delta)
+    digests = {(piece_start, piece_end): digest for piece_start, piece_end, digest in pieces}
+    for block in new_blocks:
+        block.digest = digests.get((block.start, block.end))
+    parser.blocks = head + new_blocks + tail
+
+    referenced = []
+    for block in new_blocks:
+        for node in block.created:
+            changes.setdefault(node, None)
+        for node, kind in block.upgrades:
+            changes.setdefault(node, (kind, None))
+        for node, _, _, _ in block.values:
+            changes.setdefault(node, (node.kind, hids[node]))
+        referenced.extend(node for node, _, _ in block.refs)
+    # New references may come before the declaration that made a node
+    _settle(parser.namespace, referenced, parser.blocks, changes)
+    # Repeated Device declarations add or take away records of a node
+    touched = set(changes)
+    for block in removed + new_blocks:
+        touched.update(node for node, kind, _ in block.refs if kind == 'Device')
+    _settle_values(parser, touched, changes)
+
+    summary = {'blocks': len(new_blocks), 'removed': len(removed), 'nodes': len(changes),
+               'roles': [], 'paths': {}}
+    index = parser.detection_index
+    if index is not None:
+        roles = index.update(changes)
+        summary['roles'] = sorted(roles)
+        previous = parser.device_paths
+        if previous is not None:
+            parser.device_paths = index.detect(previous=previous, roles=roles)
+            summary['paths'] = {role: path for role, path in parser.device_paths.items()
+                                if previous.get(role) != path}
+    return summary
+
+
+def _same(block, piece):
+    start, end, digest = piece
+    return block.end - block.start == end - start and block.digest == digest
+
+
+def _record_starts(blocks, count):
+    """Index of the first record of blocks[count] in each record list"""
+    starts = [0] * len(RECORD_LISTS)
+    for block in blocks[:count]:
+        for i, value in enumerate(block.counts):
+            starts[i] += value
+    return starts
+
+
+def _undo(namespace, removed, survivors, changes):
+    """Take back what the removed blocks declared
+
+    changes records the state of every node touched before it changed.
+    """
+    candidates = []
+    for block in reversed(removed):
+        for node, _, _, _ in block.values:
+            changes.setdefault(node, (node.kind, node.hid))
+        candidates.extend(node for node, _ in block.upgrades)
+        candidates.extend(node for node, _, _ in block.refs)
+        candidates.extend(reversed(block.created))
+    _settle(namespace, candidates, survivors, changes, removed[0].start, removed[-1].end)
+
+
+def _settle(namespace, candidates, blocks, changes, start=0, end=0):
+    """Give candidate nodes the state a full parse of blocks would give them
+
+    The first declaration of a node wins: a real one if there is any,
+    else the first Scope/External reference. Nodes whose declaration lies
+    in the removed range start-end and that nothing else declares become
+    Scope placeholders while they have children, and are removed after.
+    """
+    nodes = namespace.nodes
+    root = namespace.root
+    references = None
+    for node in candidates:
+        if (nodes.get(node.path) is not node or node is root
+                or (node.parent is root and node.name in PREDEFINED_SCOPES)):
+            continue
+        if references is None:
+            references = _references(blocks)
+        found = references.get(node, ())
+        real = [reference for reference in found if reference[0] not in PLACEHOLDER_KINDS]
+        first = min(real or found, key=_reference_offset, default=None)
+
+        if node.kind not in PLACEHOLDER_KINDS and not start <= node.offset < end:
+            # Still declared; only an earlier repeated declaration takes over
+            if not real or first[1] >= node.offset:
+                continue
+            changes.setdefault(node, (node.kind, node.hid))
+            _owner(blocks, node.offset).refs.append((node, node.kind, node.offset))
+            references[node].append((node.kind, node.offset))
+            node.kind, node.offset = first
+            continue
+
+        changes.setdefault(node, (node.kind, node.hid))
+        if first is not None:
+            kind, offset = first
+            node.kind = kind or 'Scope'
+            node.offset = offset if kind else None
+        elif node.children:
+            node.kind = 'Scope'
+            node.offset = None
+        else:
+            namespace.remove(node)
+            candidates.append(node.parent)
+        if node.kind in PLACEHOLDER_KINDS:
+            node.hid = node.cid = node.adr = None
+
+
+def _owner(blocks, offset):
+    """The block holding offset"""
+    return blocks[bisect_right([block.start for block in blocks], offset) - 1]
+
+
+def _references(blocks):
+    """Map nodes to the (kind, offset) references that blocks make to them"""
+    references = {}
+    for block in blocks:
+        for node, kind, offset in block.refs:
+            references.setdefault(node, []).append((kind, offset))
+    return references
+
+
+def _reference_offset(reference):
+    return reference[1]
+
+
+def _settle_values(parser, nodes, changes):
+    """Give nodes the _HID/_CID/_ADR values a full parse would give them
+
+    The first value named in a node's scope after the node was declared
+    as a Device wins. It is kept on the record of the Device declaration
+    before it; the node's other records have none. Nodes whose _HID
+    changes are added to changes.
+    """
+    if not nodes:
+        return
+    namespace = parser.namespace
+    winners = {}
+    for block in parser.blocks:
+        for node, attribute, value, offset in block.values:
+            if (node in nodes and node.kind == 'Device' and offset > node.offset
+                    and (node, attribute) not in winners):
+                winners[node, attribute] = (value, offset)
+
+    paths = {node.path: node for node in nodes if namespace.nodes.get(node.path) is node}
+    records = {}
+    for record in parser.devices:
+        node = paths.get(record['path'])
+        if node is not None:
+            records.setdefault(node, []).append(record)
+
+    for node in paths.values():
+        for attribute in ('hid', 'cid', 'adr'):
+            value, offset = winners.get((node, attribute), (None, None))
+            if attribute == 'hid' and value != node.hid:
+                changes.setdefault(node, (node.kind, node.hid))
+            setattr(node, attribute, value)
+            owner = None
+            for record in records.get(node, ()):
+                record[attribute] = None
+                if offset is not None and record['position'] < offset:
+                    owner = record
+            if owner is not None:
+                owner[attribute] = value
+
+
+def _shift(parser, tail, threshold, delta):
+    """Move offsets at or after threshold, and the tail blocks, by delta"""
+    for node in parser.namespace.nodes.values():
+        if node.offset is not None and node.offset >= threshold:
+            node.offset += delta
+    for block in tail:
+        block.start += delta
+        block.end += delta
+        if block.refs:
+            block.refs = [(node, kind, offset + delta) for node, kind, offset in block.refs]
+        if block.values:
+            block.values = [(node, attribute, value, offset + delta)
+                            for node, attribute, value, offset in block.values]
+
+
+def _declare(parser, content, start, end, tokens):
+    """Declare the tokens of the changed blocks
+
+    Returns the new blocks, their record lists and the _HID of every node
+    they name a value for, from before they were declared.
+    """
+    saved = [getattr(parser, name) for name in RECORD_LISTS]
+    device_records = {}
+    for record in parser.devices:
+        node = parser.namespace.get(record['path'])
+        if node is not None:
+            device_records[node] = record
+    for name in RECORD_LISTS:
+        setattr(parser, name, [])
+
+    try:
+        tracker = BlockTracker(parser, start)
+        closes = {offset: close for _, _, offset, _, close in tokens if close is not None}
+        parser._declare(((kind, name, offset, value) for kind, name, offset, value, _ in tokens),
+                        closes.get, len(content), tracker=tracker,
+                        device_records=device_records)
+        blocks = tracker.finish(end)
+        records = [getattr(parser, name) for name in RECORD_LISTS]
+        hids = tracker.hids
+    finally:
+        parser.namespace.journal = None
+        for name, value in zip(RECORD_LISTS, saved):
+            setattr(parser, name, value)
+    return blocks, records, hids
+
+
+def _splice_records(parser, starts, removed, records, delta):
+    """Replace the records of the removed blocks with the new ones"""
+    for i, name in enumerate(RECORD_LISTS):
+        current = getattr(parser, name)
+        first = starts[i]
+        last = first + sum(block.counts[i] for block in removed)
+        tail = current[last:]
+        if delta:
+            for record in tail:
+                record['position'] += delta
+        setattr(parser, name, current[:first] + records[i] + tail)
@@ -0,0 +1,166 @@
+"""Per-phase timings and counters for parse, analyze and generate runs
+
+A RunStats is attached to every ACPIParser as parser.stats. Each parse
+starts a new one; detection, recommendations and patch generation on
+the parse's results add their phases to it. Every phase records wall
+time, CPU time and the process's peak RSS when it ended; counters hold
+bytes scanned, regex work and parse cache hits/misses. The whole run can
+be saved as a Chrome trace-event file (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Windows: peak memory is not reported
+    resource = None
+
+
+# Keys of a phase entry that are not extra phase arguments
+_ENTRY_KEYS = frozenset(('name', 'category', 'depth', 'thread', 'start', 'wall', 'cpu',
+                         'peak_rss_mb'))
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class RunStats:
+    """Phases and counters of one parse and the work done on its results
+
+    Phases are dicts with name, category, start/wall/cpu (seconds), the
+    nesting depth, the thread they ran on, the peak RSS at their end and
+    any extra arguments (such as bytes) given to phase().
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.counters = {}
+        self.depth = 0
+
+    @contextmanager
+    def phase(self, name, category='parse', **args):
+        """Time the body of a with block as one phase"""
+        entry = dict(args, name=name, category=category, depth=self.depth,
+                     thread=threading.get_ident())
+        self.depth += 1
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield entry
+        finally:
+            entry['cpu'] = time.process_time() - cpu_start
+            entry['wall'] = time.perf_counter() - start
+            entry['start'] = start
+            entry['peak_rss_mb'] = peak_rss_mb()
+            self.depth -= 1
+            self.phases.append(entry)
+
+    def count(self, name, amount=1):
+        """Add amount to a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def extend(self, other):
+        """Add the phases and counters of another RunStats to this one"""
+        self.phases.extend(other.phases)
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+
+    def origin(self):
+        """perf_counter value of the earliest phase start"""
+        return min((entry['start'] for entry in self.phases), default=0.0)
+
+    def ordered(self):
+        """Phases sorted by start time, outer phases before nested ones"""
+        return sorted(self.phases, key=lambda entry: (entry['start'], entry['depth']))
+
+    def peak_rss(self):
+        """Highest peak RSS in MB seen at the end of any phase, or None"""
+        peaks = [entry['peak_rss_mb'] for entry in self.phases
+                 if entry['peak_rss_mb'] is not None]
+        return max(peaks, default=None)
+
+    def to_dict(self):
+        """Phases (times in ms from the first phase), counters and peak RSS"""
+        origin = self.origin()
+        phases = []
+        for entry in self.ordered():
+            phase = {
+                'name': entry['name'],
+                'category': entry['category'],
+                'depth': entry['depth'],
+                'start_ms': round((entry['start'] - origin) * 1000, 3),
+                'wall_ms': round(entry['wall'] * 1000, 3),
+                'cpu_ms': round(entry['cpu'] * 1000, 3),
+                'peak_rss_mb': (round(entry['peak_rss_mb'], 1)
+                                if entry['peak_rss_mb'] is not None else None)
+            }
+            phase.update((key, value) for key, value in entry.items()
+                         if key not in _ENTRY_KEYS)
+            phases.append(phase)
+        peak = self.peak_rss()
+        return {
+            'phases': phases,
+            'counters': dict(self.counters),
+            'peak_rss_mb': round(peak, 1) if peak is not None else None
+        }
+
+    def to_chrome_trace(self):
+        """The run as a Chrome trace-event dict (complete and counter events)"""
+        origin = self.origin()
+        pid = os.getpid()
+        events = []
+        for entry in self.ordered():
+            start_us = (entry['start'] - origin) * 1e6
+            end_us = start_us + entry['wall'] * 1e6
+            args = {key: value for key, value in entry.items() if key not in _ENTRY_KEYS}
+            args['cpu_ms'] = round(entry['cpu'] * 1000, 3)
+            events.append({
+                'name': entry['name'], 'cat': entry['category'], 'ph': 'X',
+                'ts': round(start_us, 1), 'dur': round(end_us - start_us, 1),
+                'pid': pid, 'tid': entry['thread'], 'args': args
+            })
+            if entry['peak_rss_mb'] is not None:
+                events.append({
+                    'name': 'peak_rss_mb', 'ph': 'C', 'ts': round(end_us, 1),
+                    'pid': pid, 'args': {'peak_rss_mb': round(entry['peak_rss_mb'], 1)}
+                })
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'counters': dict(self.counters)}
+        }
+
+    def write_chrome_trace(self, filepath):
+        """Save the run as a Chrome trace-event JSON file"""
+        with open(filepath, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def format_lines(self):
+        """Human-readable phase and counter lines, for dialogs and logs"""
+        lines = []
+        for entry in self.ordered():
+            label = '  ' * entry['depth'] + f"{entry['category']}/{entry['name']}"
+            line = f"{label}: {entry['wall'] * 1000:.1f} ms wall, {entry['cpu'] * 1000:.1f} ms CPU"
+            if entry.get('bytes'):
+                line += f", {entry['bytes'] / (1024 * 1024):.2f} MB"
+            lines.append(line)
+        for name, amount in sorted(self.counters.items()):
+            lines.append(f"{name}: {amount}")
+        peak = self.peak_rss()
+        if peak is not None:
+            lines.append(f"peak RSS: {peak:.1f} MB")
+        return lines
@@ -0,0 +1,263 @@
+"""ACPI namespace tree built while parsing"""
+
+
+# Object kinds whose body ({ ... }) opens a new namespace scope
+SCOPE_KINDS = ('Scope', 'Device', 'Method', 'Processor', 'ThermalZone', 'PowerResource')
+
+# Predefined root scopes (ACPI spec 5.3.1)
+PREDEFINED_SCOPES = ('_SB', '_PR', '_GPE', '_SI', '_TZ')
+
+
+def normalize_segment(segment):
+    """Strip NameSeg padding (_SB_ -> _SB) so both spellings share a node"""
+    if segment.endswith('_'):
+        return segment.rstrip('_') or segment
+    return segment
+
+
+class NamespaceNode:
+    """A single object in the ACPI namespace"""
+
+    __slots__ = ('name', 'kind', 'path', 'parent', 'children', 'offset', 'hid', 'cid', 'adr',
+                 'table')
+
+    def __init__(self, name, kind, path, parent=None, offset=None):
+        self.name = name
+        self.kind = kind
+        self.path = path
+        self.parent = parent
+        self.children = {}
+        self.offset = offset
+        self.hid = None
+        self.cid = None
+        self.adr = None
+        self.table = None
+
+    @property
+    def dotted_path(self):
+        """Path without the root prefix (_SB.PCI0.LPCB), as used in SSDTs"""
+        return self.path.lstrip('\\')
+
+    def walk(self):
+        """Iterate over this node and all of its descendants (pre-order)"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(list(node.children.values())))
+
+    def __repr__(self):
+        return f"NamespaceNode({self.path}, {self.kind})"
+
+
+class Journal:
+    """What Namespace.declare() did while journaling, by kind of change
+
+    created lists new nodes, upgrades the (node, kind) placeholders turned
+    into real objects, and refs the (node, kind, offset) of every other
+    declaration naming a node: Scope/External, the leading segments of a
+    path (kind None) and repeated declarations.
+    """
+
+    __slots__ = ('created', 'upgrades', 'refs')
+
+    def __init__(self):
+        self.created = []
+        self.upgrades = []
+        self.refs = []
+
+    def __bool__(self):
+        return bool(self.created or self.upgrades or self.refs)
+
+
+class Namespace:
+    """ACPI namespace tree with an O(1) absolute path index"""
+
+    def __init__(self):
+        self.root = NamespaceNode('\\', 'Scope', '\\')
+        self.nodes = {'\\': self.root}
+        # When a Journal, declare() records what it does there
+        self.journal = None
+        for name in PREDEFINED_SCOPES:
+            self._create(self.root, name, 'Scope', None)
+
+    def get(self, path):
+        """Get node by absolute path (\\_SB.PCI0 or _SB_.PCI0), or None"""
+        if not path.startswith('\\'):
+            path = '\\' + path
+        node = self.nodes.get(path)
+        if node is None and '_' in path:
+            node = self.nodes.get(self._join(self.root, path[1:].split('.')))
+        return node
+
+    def __contains__(self, path):
+        return self.get(path) is not None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def declare(self, kind, name, scope, offset=None):
+        """Declare an object of the given kind relative to scope
+
+        Scope() and External() refer to objects that may already exist, so
+        they follow the ACPI search rules; every other kind creates its
+        final name segment in the resolved parent.
+        """
+        search = kind == 'Scope' or kind == 'External'
+        if not search and '.' not in name and name[:1] not in ('\\', '^'):
+            # Fast path: a plain NameSeg declared in the current scope
+            parent = scope
+            last = normalize_segment(name) if name[-1:] == '_' else name
+        else:
+            parent, segments = self._resolve(name, scope, search)
+            if not segments:
+                return parent
+            journal = self.journal
+            for segment in segments[:-1]:
+                child = parent.children.get(segment)
+                if child is None:
+                    child = self._create(parent, segment, 'Scope', None)
+                if journal is not None:
+                    journal.refs.append((child, None, offset))
+                parent = child
+            last = segments[-1]
+
+        node = parent.children.get(last)
+        if node is None:
+            node = self._create(parent, last, kind, offset)
+            if not search:
+                return node
+        elif not search and node.kind in ('Scope', 'External'):
+            # A real declaration replaces a placeholder from External/Scope
+            if self.journal is not None:
+                self.journal.upgrades.append((node, node.kind))
+            node.kind = kind
+            node.offset = offset
+            return node
+        if self.journal is not None:
+            self.journal.refs.append((node, kind, offset))
+        return node
+
+    def to_rows(self):
+        """Flatten the tree to (parent index, name, kind, offset, hid, cid, adr) rows"""
+        index = {}
+        rows = []
+        for node in self.root.walk():
+            parent = index[node.parent] if node.parent is not None else -1
+            index[node] = len(rows)
+            rows.append((parent, node.name, node.kind, node.offset, node.hid, node.cid, node.adr))
+        return rows
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Rebuild a namespace from the rows produced by to_rows()"""
+        namespace = cls.__new__(cls)
+        nodes = []
+        for parent, name, kind, offset, hid, cid, adr in rows:
+            if parent < 0:
+                node = NamespaceNode(name, kind, name)
+                namespace.root = node
+                namespace.nodes = {name: node}
+                namespace.journal = None
+            else:
+                node = namespace._create(nodes[parent], name, kind, offset)
+            node.hid = hid
+            node.cid = cid
+            node.adr = adr
+            nodes.append(node)
+        return namespace
+
+    def merge_rows(self, rows, table):
+        """Merge another table's namespace (rows from to_rows()) into this one
+
+        Objects new to this namespace, and real declarations of objects
+        that were only Scope/External placeholders, record table as their
+        provenance. Placeholders keep an empty provenance until a table
+        declares them. Returns the nodes declared by this table, in row
+        order.
+        """
+        nodes = []
+        declared = []
+        for parent, name, kind, offset, hid, cid, adr in rows:
+            if parent < 0:
+                nodes.append(self.root)
+                continue
+            parent_node = nodes[parent]
+            node = parent_node.children.get(name)
+            if node is None:
+                node = self._create(parent_node, name, kind, offset)
+            elif (offset is not None and kind not in ('Scope', 'External')
+                  and node.kind in ('Scope', 'External')):
+                node.kind = kind
+                node.offset = offset
+            else:
+                nodes.append(node)
+                continue
+            if offset is not None and kind not in ('Scope', 'External'):
+                node.table = table
+                node.hid = hid
+                node.cid = cid
+                node.adr = adr
+                declared.append(node)
+            nodes.append(node)
+        return declared
+
+    def iter_nodes(self, kind=None):
+        """Iterate over all nodes in path order, optionally filtered by kind"""
+        for node in self.root.walk():
+            if kind is None or node.kind == kind:
+                yield node
+
+    def remove(self, node):
+        """Remove a childless node and its index entry"""
+        del node.parent.children[node.name]
+        del self.nodes[node.path]
+
+    def _create(self, parent, name, kind, offset):
+        """Create a child node and index it"""
+        if parent is self.root:
+            path = '\\' + name
+        else:
+            path = parent.path + '.' + name
+        node = NamespaceNode(name, kind, path, parent, offset)
+        parent.children[name] = node
+        self.nodes[path] = node
+        if self.journal is not None:
+            self.journal.created.append(node)
+        return node
+
+    def _join(self, parent, segments):
+        """Build an absolute path from a parent node and name segments"""
+        segments = [normalize_segment(s) for s in segments if s]
+        if parent is self.root:
+            return '\\' + '.'.join(segments)
+        return '.'.join([parent.path] + segments)
+
+    def _resolve(self, name, scope, search):
+        """Resolve a NamePath to (parent node, remaining segments)"""
+        relative = True
+        if name.startswith('\\'):
+            node = self.root
+            name = name.lstrip('\\')
+            relative = False
+        else:
+            node = scope
+            while name.startswith('^'):
+                node = node.parent or node
+                name = name[1:]
+                relative = False
+
+        segments = [normalize_segment(s) for s in name.split('.') if s]
+        if not segments:
+            return node, segments
+
+        # Search rules: look for the first segment in the enclosing scopes.
+        # Multi-segment paths (_SB.PCI0 inside a nested block) always start
+        # from an existing object, single names only for Scope/External.
+        if relative and (search or len(segments) > 1):
+            probe = node
+            while probe is not None and segments[0] not in probe.children:
+                probe = probe.parent
+            if probe is not None:
+                node = probe
+        return node, segments
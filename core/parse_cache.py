@@ -0,0 +1,226 @@
+"""Persistent on-disk cache of parse results, keyed by file content"""
+
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+
+from .acpi_parser import PARSER_VERSION
+from .instrumentation import RunStats
+from .namespace import Namespace
+from .records import DeviceRecord, MethodRecord, ScopeRecord, ProcessorRecord
+
+
+# Layout of the cached payload; bump when it changes
+CACHE_FORMAT = 3
+
+# Default upper bound for the whole cache directory
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def user_cache_dir(app_name="acpi-analyzer"):
+    """Per-user cache directory for this platform"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+        return Path(base) / app_name / 'Cache'
+    if sys.platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches' / app_name
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / app_name
+
+
+class ParseCache:
+    """Size-bounded LRU cache of ACPIParser results on disk
+
+    Entries are marshal files named after a streaming hash of the source
+    bytes, the parser version and the interpreter's marshal tag. A hit
+    restores the parser's records, namespace and detected paths without
+    running the tokenizer.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory else user_cache_dir() / 'parse'
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, filepath):
+        """Hash file contents in chunks together with the parser version"""
+        digest = hashlib.sha256()
+        digest.update(f"{PARSER_VERSION}:{CACHE_FORMAT}:{sys.implementation.cache_tag}:".encode())
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def parse_file(self, parser, filepath, progress=None, cancel=None):
+        """Fill parser from the cache, or parse filepath and cache the result
+
+        parser.stats gets the lookup as a 'cache' phase and a cache_hits
+        or cache_misses count, ahead of the parse's own phases.
+        """
+        stats = RunStats()
+        try:
+            with stats.phase('lookup', 'cache', bytes=os.path.getsize(filepath)) as phase:
+                key = self.key_for(filepath)
+                hit = phase['hit'] = self.load(key, parser, filepath)
+        except OSError as e:
+            print(f"Error hashing {filepath}: {e}", file=sys.stderr)
+            return parser.parse_file(filepath, progress=progress, cancel=cancel)
+
+        if hit:
+            stats.count('cache_hits')
+            parser.stats = stats
+            return True
+
+        stats.count('cache_misses')
+        ok = parser.parse_file(filepath, progress=progress, cancel=cancel)
+        stats.extend(parser.stats)
+        parser.stats = stats
+        if not ok:
+            return False
+        with stats.phase('store', 'cache'):
+            self.store(key, parser)
+        return True
+
+    def load(self, key, parser, filepath=None):
+        """Restore a cached parse into parser; returns False on a miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = marshal.loads(f.read())
+            self._restore(parser, payload, filepath)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {path.name}: {e}", file=sys.stderr)
+            self._remove(path)
+            self.misses += 1
+            return False
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return True
+
+    def store(self, key, parser):
+        """Write parser results to the cache and evict old entries"""
+        path = self._entry_path(key)
+        temp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(marshal.dumps(self._snapshot(parser)))
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Error writing parse cache: {e}", file=sys.stderr)
+            self._remove(temp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """Delete least recently used entries until under max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+        return total
+
+    def clear(self):
+        """Delete every cache entry; returns (files removed, bytes freed)"""
+        removed = 0
+        freed = 0
+        for path, size, _ in self._entries():
+            if self._remove(path):
+                removed += 1
+                freed += size
+        return removed, freed
+
+    def get_size(self):
+        """Get (entry count, total bytes) of the cache"""
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def _entry_path(self, key):
+        return self.directory / f"{key}.cache"
+
+    def _entries(self):
+        """List (path, size, mtime) for all cache entries"""
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for path in self.directory.glob('*.cache'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _snapshot(parser):
+        """Flatten parser results to marshal-friendly tuples (columnar records)"""
+        devices = tuple(
+            (d['name'], d['hid'], d['cid'], d['adr'], d['position'], d['path'])
+            for d in parser.devices
+        )
+        methods = list(parser.methods)
+        scopes = list(parser.scopes)
+        processors = tuple(
+            (p['name'], p['position'], p['path']) for p in parser.processors
+        )
+        return (
+            CACHE_FORMAT,
+            tuple(parser.namespace.to_rows()),
+            devices,
+            tuple(m['name'] for m in methods),
+            tuple(m['position'] for m in methods),
+            tuple(s['path'] for s in scopes),
+            tuple(s['position'] for s in scopes),
+            processors,
+            parser.get_device_paths(),
+            tuple(parser.tables),
+        )
+
+    @staticmethod
+    def _restore(parser, payload, filepath):
+        """Load a snapshot into parser, replacing any previous results"""
+        if payload[0] != CACHE_FORMAT:
+            raise ValueError(f"unsupported cache format {payload[0]}")
+        (cache_format, rows, devices, method_names, method_positions,
+         scope_paths, scope_positions, processors, device_paths, tables) = payload
+
+        parser.close()
+        parser.current_file = filepath
+        parser.namespace = Namespace.from_rows(rows)
+        parser.devices = [DeviceRecord(*device) for device in devices]
+        parser.methods = [MethodRecord(name, position)
+                          for name, position in zip(method_names, method_positions)]
+        parser.scopes = [ScopeRecord(path, position)
+                         for path, position in zip(scope_paths, scope_positions)]
+        parser.processors = [ProcessorRecord(*processor) for processor in processors]
+        parser.tables = list(tables)
+        parser.aml_errors = []
+        parser.detection_index = None
+        parser.device_index = None
+        parser.device_paths = device_paths
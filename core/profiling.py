@@ -0,0 +1,219 @@
+"""Profile one operation into a pstats dump and collapsed flamegraph stacks
+
+A Profiler wraps an operation (opening a DSDT, analyzing hardware,
+generating patches, a batch run) in cProfile and, at the same time,
+samples the running stacks from a background thread. On exit it writes
+
+    <operation>-<input hash>.pstats     for pstats / snakeviz
+    <operation>-<input hash>.collapsed  "frame;frame;frame count" lines
+                                        for flamegraph.pl, speedscope, ...
+
+The input hash is the first INPUT_HASH_LENGTH hex digits of the SHA-256
+of the input file, so profiles of the same table are easy to match up.
+Running the same operation on the same input again overwrites them.
+"""
+
+import cProfile
+import hashlib
+import os
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .parse_cache import HASH_CHUNK_SIZE, user_cache_dir
+
+
+# Hex digits of the input's SHA-256 used in file names
+INPUT_HASH_LENGTH = 12
+
+# Seconds between stack samples; a busy thread is in practice sampled at
+# the interpreter's switch interval (5 ms) at most
+SAMPLE_INTERVAL = 0.001
+
+# Seconds to wait, in total, for threads started in a profiled block to
+# finish before their profiles are merged
+THREAD_JOIN_TIMEOUT = 1.0
+
+# Frames from files under this directory are labelled with relative paths
+PACKAGE_ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def default_profile_dir():
+    """Where the GUI saves profiles"""
+    return user_cache_dir() / 'profiles'
+
+
+def input_hash(source):
+    """Short hash identifying an operation's input
+
+    Files are hashed by content. Directories (table sets, batch corpora)
+    are hashed by the relative path and size of every file in them, so a
+    large corpus is not read twice. Without an input the hash is 'none'.
+    """
+    if source is None:
+        return 'none'
+    digest = hashlib.sha256()
+    path = Path(source)
+    if path.is_dir():
+        for child in sorted(path.rglob('*')):
+            if child.is_file():
+                digest.update(f"{child.relative_to(path).as_posix()}:{child.stat().st_size}\n".encode())
+    else:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:INPUT_HASH_LENGTH]
+
+
+def frame_label(code):
+    """Flamegraph frame name: source path (relative to the package) and function"""
+    filename = code.co_filename
+    if filename.startswith(PACKAGE_ROOT):
+        filename = os.path.relpath(filename, PACKAGE_ROOT).replace(os.sep, '/')
+    else:
+        filename = os.path.basename(filename)
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{filename}:{name}".replace(';', ':').replace(' ', '_')
+
+
+class StackSampler:
+    """Count the stacks of the profiled thread and threads it starts
+
+    Threads that already ran when sampling started (such as the Tk main
+    loop) are skipped, except the profiled one. Each stack is rooted at
+    its thread's name.
+    """
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self.labels = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.skip = set()
+
+    def start(self):
+        self.skip = set(sys._current_frames()) - {self.thread_id}
+        self.thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def _run(self):
+        self.skip.add(threading.get_ident())
+        labels = self.labels
+        while not self.stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in self.skip:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def collapsed(self):
+        """Sampled stacks in collapsed format, most frequent first"""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return ''.join(f"{stack} {count}\n" for stack, count in ranked)
+
+
+class Profiler:
+    """Context manager profiling the with block on the current thread
+
+    Threads started inside the block (e.g. the patch generation pool) get
+    their own cProfile, merged into the same pstats dump. A thread's
+    profiler stops when its thread ends, so only finished threads are
+    merged: after the block they get THREAD_JOIN_TIMEOUT seconds to end,
+    and threads still running are left out with a warning. On Python
+    3.12+ the block's own profiler sees every thread. After the block,
+    paths holds the written files; they are also written if it raised.
+    """
+
+    def __init__(self, operation, source=None, directory=None):
+        self.operation = operation
+        self.source = source
+        self.directory = Path(directory) if directory else default_profile_dir()
+        self.profile = cProfile.Profile()
+        self.thread_profiles = []
+        self.sampler = None
+        self.paths = []
+
+    def __enter__(self):
+        self.sampler = StackSampler(threading.get_ident())
+        self.sampler.start()
+        threading.setprofile(self._profile_thread)
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.profile.disable()
+        threading.setprofile(None)
+        self.sampler.stop()
+        try:
+            self.paths = self.save()
+        except OSError as e:
+            print(f"Error writing profile for {self.operation}: {e}", file=sys.stderr)
+        return False
+
+    def _profile_thread(self, frame, event, arg):
+        """First profile event of a new thread: give it its own cProfile"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ profiles every thread from one global hook
+            sys.setprofile(None)
+            return
+        self.thread_profiles.append((threading.current_thread(), profile))
+
+    def finished_thread_profiles(self):
+        """(thread, profile) of the block's threads that have ended
+
+        A running thread's profiler can only be stopped from that thread,
+        and reading it while it records is a race, so threads that do not
+        end within THREAD_JOIN_TIMEOUT are skipped.
+        """
+        deadline = time.monotonic() + THREAD_JOIN_TIMEOUT
+        finished = []
+        for thread, profile in self.thread_profiles:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                print(f"Profile of {self.operation}: skipped thread {thread.name}, "
+                      f"still running", file=sys.stderr)
+            else:
+                finished.append((thread, profile))
+        return finished
+
+    def name(self):
+        """File name stem: operation and input hash"""
+        return f"{self.operation}-{input_hash(self.source)}"
+
+    def save(self):
+        """Write the pstats dump and the collapsed stacks; returns their paths"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = self.directory / self.name()
+        stats = pstats.Stats(self.profile)
+        for _, profile in self.finished_thread_profiles():
+            # The thread is gone, so its profiler gets no more events;
+            # Stats only closes the calls it left open
+            stats.add(profile)
+        stats_path = stem.with_suffix('.pstats')
+        stats.dump_stats(str(stats_path))
+
+        collapsed_path = stem.with_suffix('.collapsed')
+        with open(collapsed_path, 'w') as f:
+            f.write(self.sampler.collapsed())
+        return [stats_path, collapsed_path]
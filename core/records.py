@@ -0,0 +1,125 @@
+"""Compact records and record lists for parsed declarations"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+
+
+class Record(Mapping):
+    """A parsed declaration with fixed fields, read and written like a dict
+
+    Fields live in __slots__ instead of a per-record dict, which takes
+    about a third of the memory. table is only set on records of merged
+    table sets; while it is None it is not one of the keys. dict(record)
+    gives the plain dict, e.g. for JSON.
+    """
+
+    __slots__ = ('table',)
+    FIELDS = ()
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if key == 'table' and self.table is not None:
+            return self.table
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS and key != 'table':
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __iter__(self):
+        yield from self.FIELDS
+        if self.table is not None:
+            yield 'table'
+
+    def __len__(self):
+        return len(self.FIELDS) + (self.table is not None)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class DeviceRecord(Record):
+    """A Device() declaration"""
+
+    __slots__ = ('name', 'hid', 'cid', 'adr', 'position', 'path')
+    FIELDS = __slots__
+
+    def __init__(self, name, hid, cid, adr, position, path, table=None):
+        self.name = name
+        self.hid = hid
+        self.cid = cid
+        self.adr = adr
+        self.position = position
+        self.path = path
+        self.table = table
+
+
+class MethodRecord(Record):
+    """A Method() declaration"""
+
+    __slots__ = ('name', 'position')
+    FIELDS = __slots__
+
+    def __init__(self, name, position, table=None):
+        self.name = name
+        self.position = position
+        self.table = table
+
+
+class ScopeRecord(Record):
+    """A Scope() declaration, with the path as written"""
+
+    __slots__ = ('path', 'position')
+    FIELDS = __slots__
+
+    def __init__(self, path, position, table=None):
+        self.path = path
+        self.position = position
+        self.table = table
+
+
+class ProcessorRecord(Record):
+    """A Processor() declaration"""
+
+    __slots__ = ('name', 'position', 'path')
+    FIELDS = __slots__
+
+    def __init__(self, name, position, path, table=None):
+        self.name = name
+        self.position = position
+        self.path = path
+        self.table = table
+
+
+class LazyRecords(Sequence):
+    """Read-only list of records kept as compact keys, built on access
+
+    Each item is stored as a single key (an offset into the source buffer
+    or a namespace node) and turned into a Record only when it is read,
+    so large files do not hold one object per declaration.
+    """
+
+    def __init__(self, build, offsets=False):
+        self.build = build
+        self.items = array('q') if offsets else []
+
+    def append(self, item):
+        self.items.append(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.build(item) for item in self.items[index]]
+        return self.build(self.items[index])
+
+    def __iter__(self):
+        build = self.build
+        for item in self.items:
+            yield build(item)
+
+    def __repr__(self):
+        return f"LazyRecords({len(self.items)} items)"
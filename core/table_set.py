@@ -0,0 +1,299 @@
+"""Load all ACPI tables of a machine and merge them into one namespace
+
+A table set is a directory of tables (a copy of /sys/firmware/acpi/tables,
+acpidump -b output, or iasl -d output) or an acpidump text dump. The
+DSDT and every SSDT are parsed on a process pool and merged, DSDT first,
+into one ACPIParser whose namespace records which table declared each
+object. Detection then sees devices that only SSDTs declare.
+"""
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+from .acpi_parser import ACPIParser, ParseCancelled
+from .aml_reader import AML_SIGNATURES, TABLE_HEADER_SIZE, is_aml, read_table_header
+from .instrumentation import RunStats
+from .records import DeviceRecord, MethodRecord, ScopeRecord, ProcessorRecord
+
+
+# Table file extensions; files without one (sysfs names) are checked by header
+DSL_EXTENSIONS = ('.dsl',)
+AML_EXTENSIONS = ('.aml', '.dat', '')
+
+# Below this many bytes in total, starting worker processes costs more
+# than parsing the tables in this process
+PARALLEL_MIN_BYTES = 1024 * 1024
+
+# "SSDT @ 0x00000000BFEB0000" heads each table in acpidump text output
+ACPIDUMP_HEADER_RE = re.compile(r'^([A-Z0-9_]{4}) @ 0x[0-9A-Fa-f]+\s*$', re.MULTILINE)
+ACPIDUMP_LINE_RE = re.compile(r'^\s*([0-9A-Fa-f]+):((?: [0-9A-Fa-f]{2}){1,16})')
+
+
+def is_acpidump(filepath):
+    """Check whether filepath is an acpidump text dump"""
+    try:
+        with open(filepath, 'r', encoding='ascii', errors='ignore') as f:
+            head = f.read(4096)
+    except OSError:
+        return False
+    return ACPIDUMP_HEADER_RE.search(head) is not None
+
+
+def is_table_set(path):
+    """Check whether path should be loaded as a TableSet rather than one table"""
+    return os.path.isdir(path) or is_acpidump(path)
+
+
+def read_acpidump(filepath):
+    """Read the AML tables of an acpidump text dump as [(name, bytes)]
+
+    Tables are named like the sysfs files: DSDT, then SSDT1, SSDT2, ...
+    Other tables (FACP, APIC, ...) are skipped.
+    """
+    tables = []
+    counts = {}
+    signature = None
+    data = bytearray()
+
+    def finish():
+        if signature is None or signature.encode('ascii') not in AML_SIGNATURES:
+            return
+        if len(data) >= TABLE_HEADER_SIZE:
+            length = read_table_header(data)['length']
+            del data[length:]
+        counts[signature] = counts.get(signature, 0) + 1
+        name = signature if signature == 'DSDT' else f"{signature}{counts[signature]}"
+        tables.append((name, bytes(data)))
+
+    with open(filepath, 'r', encoding='ascii', errors='ignore') as f:
+        for line in f:
+            header = ACPIDUMP_HEADER_RE.match(line)
+            if header:
+                finish()
+                signature = header.group(1)
+                data = bytearray()
+                continue
+            match = ACPIDUMP_LINE_RE.match(line)
+            if match and signature is not None:
+                data += bytes.fromhex(match.group(2))
+    finish()
+    return tables
+
+
+def find_table_files(directory):
+    """Table files in a directory as [(name, path)], one per table name
+
+    Only DSDT/SSDT/PSDT files are used, judged by the file name or, for
+    files without an extension (sysfs), by the table header. Binary tables
+    are preferred over their disassembly when both exist.
+    """
+    found = {}
+    for path in sorted(Path(directory).iterdir()):
+        suffix = path.suffix.lower()
+        if not path.is_file() or suffix not in DSL_EXTENSIONS + AML_EXTENSIONS:
+            continue
+        if suffix == '':
+            try:
+                with open(path, 'rb') as f:
+                    if not is_aml(f.read(TABLE_HEADER_SIZE)):
+                        continue
+            except OSError:
+                continue
+        elif not _is_aml_signature(path.stem):
+            continue
+
+        key = path.stem.upper()
+        if key not in found or suffix in AML_EXTENSIONS:
+            found[key] = path
+    ordered = sorted(found.values(), key=lambda path: table_order(path.stem))
+    return [(path.stem, path) for path in ordered]
+
+
+def table_order(name):
+    """Sort key: DSDT first, then by signature and natural number (SSDT2 < SSDT10)"""
+    name = name.upper()
+    return (not name.startswith('DSDT'),
+            [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)])
+
+
+def _is_aml_signature(stem):
+    return stem[:4].upper().encode('ascii', 'ignore') in AML_SIGNATURES
+
+
+def parse_table(name, filepath=None, data=None, use_cache=True):
+    """Parse one table (runs in a worker); returns a picklable result dict"""
+    start = time.perf_counter()
+    result = {'name': name, 'file': str(filepath) if filepath else None, 'ok': False}
+    try:
+        parser = ACPIParser()
+        if data is not None:
+            result['size'] = len(data)
+            ok = parser.parse_bytes(data, name)
+        elif use_cache:
+            from .parse_cache import ParseCache
+            result['size'] = os.path.getsize(filepath)
+            ok = ParseCache().parse_file(parser, filepath)
+        else:
+            result['size'] = os.path.getsize(filepath)
+            ok = parser.parse_file(filepath)
+        if not ok:
+            result['error'] = 'parse failed'
+            return result
+
+        result.update({
+            'ok': True,
+            'header': parser.tables[0] if parser.tables else None,
+            'rows': parser.namespace.to_rows(),
+            'scopes': [(s['path'], s['position']) for s in parser.scopes],
+            'errors': len(parser.aml_errors),
+            'counters': parser.stats.counters
+        })
+        parser.close()
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        result['seconds'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+class TableSet:
+    """Parse a machine's DSDT and SSDTs in parallel and merge them
+
+    After load(), parser is an ACPIParser over the merged namespace and
+    results holds one summary dict per table. Devices, methods and scopes
+    carry a 'table' key; namespace nodes carry it as node.table.
+    """
+
+    def __init__(self, workers=None, use_cache=True):
+        self.workers = workers
+        self.use_cache = use_cache
+        self.parser = None
+        self.results = []
+
+    def load(self, source, progress=None, cancel=None):
+        """Load a table directory or acpidump file; returns the merged parser or None
+
+        progress(done, total, name) is called as each table finishes;
+        setting the cancel event stops with ParseCancelled. The merged
+        parser's stats hold the load and merge phases and the summed
+        counters of every table's parse.
+        """
+        jobs = self._jobs(source)
+        if not jobs:
+            print(f"No DSDT/SSDT tables found in {source}", file=sys.stderr)
+            return None
+
+        stats = RunStats()
+        by_name = {}
+        with stats.phase('tables', tables=len(jobs)):
+            for result in self._run(jobs, progress, cancel):
+                by_name[result['name']] = result
+                for name, amount in result.get('counters', {}).items():
+                    stats.count(name, amount)
+                if not result['ok']:
+                    print(f"Error parsing {result['file'] or result['name']}: {result.get('error')}",
+                          file=sys.stderr)
+
+        self.results = [by_name[name] for name, _, _ in jobs]
+        if not any(result['ok'] for result in self.results):
+            return None
+        with stats.phase('merge'):
+            self.parser = self._merge(source, self.results)
+        self.parser.stats = stats
+        return self.parser
+
+    def _jobs(self, source):
+        """(name, path, data) for every table in source"""
+        if os.path.isdir(source):
+            return [(name, str(path), None) for name, path in find_table_files(source)]
+        tables = sorted(read_acpidump(source), key=lambda table: table_order(table[0]))
+        return [(name, None, data) for name, data in tables]
+
+    def _run(self, jobs, progress, cancel):
+        """Parse jobs, in a process pool if they are big enough; yield results"""
+        total = len(jobs)
+        size = sum(len(data) if data is not None else _file_size(path) for _, path, data in jobs)
+        workers = min(self.workers or os.cpu_count() or 1, total)
+
+        if workers <= 1 or size < PARALLEL_MIN_BYTES:
+            for done, (name, path, data) in enumerate(jobs, 1):
+                if cancel is not None and cancel.is_set():
+                    raise ParseCancelled()
+                result = parse_table(name, path, data, self.use_cache)
+                if progress is not None:
+                    progress(done, total, name)
+                yield result
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(parse_table, name, path, data, self.use_cache): name
+                       for name, path, data in jobs}
+            done_count = 0
+            try:
+                while pending:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    if cancel is not None and cancel.is_set():
+                        raise ParseCancelled()
+                    for future in done:
+                        name = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {'name': name, 'file': None, 'ok': False,
+                                      'error': f"worker failed: {e}"}
+                        done_count += 1
+                        if progress is not None:
+                            progress(done_count, total, name)
+                        yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _merge(source, results):
+        """Merge per-table results, in table order, into one parser"""
+        parser = ACPIParser()
+        parser.current_file = source
+        namespace = parser.namespace
+        for result in results:
+            if not result['ok']:
+                parser.tables.append(_table_summary(result))
+                continue
+            name = result['name']
+            for node in namespace.merge_rows(result['rows'], name):
+                if node.kind == 'Device':
+                    parser.devices.append(DeviceRecord(node.name, node.hid, node.cid, node.adr,
+                                                       node.offset, node.path, name))
+                elif node.kind == 'Method':
+                    parser.methods.append(MethodRecord(node.name, node.offset, name))
+                elif node.kind == 'Processor':
+                    parser.processors.append(ProcessorRecord(node.name, node.offset, node.path, name))
+            parser.scopes.extend(ScopeRecord(path, position, name)
+                                 for path, position in result['scopes'])
+            parser.tables.append(_table_summary(result))
+        return parser
+
+
+def _table_summary(result):
+    """Per-table entry for parser.tables: the AML header if any, plus load info"""
+    summary = dict(result.get('header') or {})
+    summary.update({
+        'table': result['name'],
+        'file': result['file'],
+        'ok': result['ok'],
+        'seconds': result.get('seconds')
+    })
+    if not result['ok']:
+        summary['error'] = result.get('error')
+    return summary
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -1,19 +1,29 @@
 """Main application window"""
 
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 
 from core.patch_info import PatchManager
 from core.acpi_parser import ACPIParser
+from core.parse_cache import ParseCache
+from core.table_set import TableSet, is_acpidump
 from core.hardware_detector import HardwareDetector
+from core.profiling import Profiler
 
+from gui.worker import BackgroundWorker
 from gui.tabs.analysis_tab import AnalysisTab
 from gui.tabs.autopatch_tab import AutoPatchTab
 from gui.tabs.manual_tab import ManualTab
 from gui.tabs.info_tab import InfoTab
 
 
+# How often the loaded file is checked for changes made by other programs
+WATCH_INTERVAL_MS = 1000
+
+
 class AcpiAnalyzerApp:
     """Main application class"""
     
@@ -24,6 +34,7 @@ class AcpiAnalyzerApp:
         # Initialize managers
         self.patch_manager = PatchManager()
         self.acpi_parser = ACPIParser()
+        self.parse_cache = ParseCache()
         self.hardware_detector = HardwareDetector(self.acpi_parser)
         
         # Application state
@@ -31,11 +42,28 @@ class AcpiAnalyzerApp:
         self.output_directory = None
         self.acpi_entries = []
         self.dsdt_context = None
+        self.watched_stat = None
+        
+        # Held while the worker updates the current parse in place (see
+        # watch_file); the UI takes it before reading the parser or context
+        self.parser_lock = threading.RLock()
+        
+        # Bumped by reset_all(); parses started before it are not installed
+        self.generation = 0
+        
+        # Tools -> Profile Operations: run background tasks under the profiler
+        self.profile_var = tk.BooleanVar(value=False)
+        
+        # Long-running jobs run here so the UI stays responsive
+        self.worker = BackgroundWorker(self.root)
+        self.worker.on_busy_changed = self.on_busy_changed
         
         # Setup UI
         self.create_menu()
         self.create_main_ui()
         self.create_status_bar()
+        
+        self.root.after(WATCH_INTERVAL_MS, self.watch_file)
     
     def create_menu(self):
         """Create menu bar"""
@@ -46,9 +74,11 @@ class AcpiAnalyzerApp:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Open DSDT/ACPI File", command=self.open_file)
+        file_menu.add_command(label="Open ACPI Table Folder", command=self.open_folder)
         file_menu.add_command(label="Set Output Directory", command=self.set_output_directory)
         file_menu.add_separator()
         file_menu.add_command(label="Reset", command=self.reset_all)
+        file_menu.add_command(label="Clear Parse Cache", command=self.clear_parse_cache)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
@@ -57,6 +87,8 @@ class AcpiAnalyzerApp:
         menubar.add_cascade(label="Tools", menu=tools_menu)
         tools_menu.add_command(label="Reset All Patches", command=self.reset_patches)
         tools_menu.add_command(label="Refresh All", command=self.refresh_all)
+        tools_menu.add_separator()
+        tools_menu.add_checkbutton(label="Profile Operations", variable=self.profile_var)
         
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -101,6 +133,10 @@ class AcpiAnalyzerApp:
         self.status_label = ttk.Label(self.status_frame, text="Ready")
         self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
+        self.cancel_button = ttk.Button(self.status_frame, text="Cancel",
+                                        command=self.worker.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT)
+        
         self.progress = ttk.Progressbar(self.status_frame, mode='determinate')
         self.progress.pack(side=tk.RIGHT)
     
@@ -108,21 +144,202 @@ class AcpiAnalyzerApp:
         """Open DSDT or ACPI folder"""
         filepath = filedialog.askopenfilename(
             title="Select DSDT File",
-            filetypes=[("DSL Files", "*.dsl"), ("All Files", "*.*")]
+            filetypes=[("ACPI Tables", "*.dsl *.aml *.dat"), ("DSL Files", "*.dsl"),
+                       ("AML Tables", "*.aml *.dat"), ("All Files", "*.*")]
         )
         
-        if filepath:
-            self.current_file = Path(filepath)
-            self.update_status(f"Loaded: {self.current_file.name}")
+        if not filepath:
+            return
+        
+        if is_acpidump(filepath):
+            self.load_table_set(Path(filepath))
+            return
+        
+        self.load_file(Path(filepath))
+    
+    def load_file(self, path, quiet=False):
+        """Parse a single table file; the file is then watched for changes"""
+        stat = file_stat(path)
+        
+        def job(context):
+            # Parse into a fresh parser; the current one stays usable until done.
+            # Its top-level blocks let watch_file() refresh only what changed
+            parser = ACPIParser(track_blocks=True)
+            progress = lambda offset, total: context.progress(
+                offset * 100 / max(total, 1), f"Parsing: {path.name} ({offset // 1024} / {total // 1024} KB)")
+            if not self.parse_cache.parse_file(parser, str(path), progress, context.cancel_event):
+                return None
+            parser.get_device_paths()
+            return parser
+        
+        self.run_load(job, path, stat, quiet, operation='open-dsdt')
+    
+    def open_folder(self):
+        """Open a directory of ACPI tables (DSDT and SSDTs)"""
+        directory = filedialog.askdirectory(title="Select ACPI Table Folder")
+        if directory:
+            self.load_table_set(Path(directory))
+    
+    def load_table_set(self, path):
+        """Parse every DSDT/SSDT in a folder or acpidump file and merge them"""
+        def job(context):
+            progress = lambda done, total, name: context.progress(
+                done * 100 / max(total, 1), f"Parsing tables: {name} ({done} / {total})")
+            parser = TableSet(use_cache=True).load(str(path), progress, context.cancel_event)
+            if parser is not None:
+                parser.get_device_paths()
+            return parser
+        
+        self.run_load(job, path, operation='open-tables')
+    
+    def run_load(self, job, path, stat=None, quiet=False, operation='open-dsdt'):
+        """Run a parse job and make its parser current when it finishes
+        
+        stat (see file_stat) is the state of the file before parsing; it
+        is watched for changes from then on. quiet reloads skip the dialog.
+        operation names the job's profile when profiling is on.
+        """
+        generation = self.generation
+        
+        def on_done(parser):
+            if generation != self.generation:
+                # reset_all() ran while this parse was finishing
+                return
+            if parser is None:
+                self.update_status("Failed to parse ACPI file")
+                if quiet:
+                    # Keep the last good parse until the file changes again
+                    self.watched_stat = stat
+                else:
+                    messagebox.showerror("Error", "Failed to parse ACPI file")
+                return
             
-            # Parse file
-            if self.acpi_parser.parse_file(filepath):
-                self.acpi_entries = self.acpi_parser.get_all_devices()
+            self.current_file = path
+            self.watched_stat = stat
+            self.acpi_parser = parser
+            self.hardware_detector.acpi_parser = parser
+            self.dsdt_context = None
+            self.acpi_entries = parser.get_all_devices()
+            tables = f" in {len(parser.tables)} tables" if len(parser.tables) > 1 else ""
+            if quiet:
+                self.update_status(f"Reloaded: {path.name} changed on disk")
+            else:
+                self.update_status(f"Loaded: {path.name}")
                 messagebox.showinfo("Success", 
-                    f"Loaded {len(self.acpi_entries)} devices from {self.current_file.name}")
-                self.refresh_all()
+                    f"Loaded {len(self.acpi_entries)} devices{tables} from {path.name}")
+            self.refresh_all()
+        
+        def on_cancelled():
+            self.update_status(f"Cancelled parsing {path.name}")
+        
+        if self.run_task(job, on_done, on_cancelled=on_cancelled, title="Parse Error",
+                         profile=(operation, path)):
+            self.update_status(f"Parsing: {path.name}")
+    
+    def watch_file(self):
+        """Pick up changes other programs make to the loaded file
+        
+        Called every WATCH_INTERVAL_MS. When the file's mtime or size
+        changed, the parse is updated in place on the worker thread if
+        only some blocks changed; otherwise the file is reloaded in the
+        background.
+        """
+        self.root.after(WATCH_INTERVAL_MS, self.watch_file)
+        path = self.current_file
+        if path is None or self.watched_stat is None or self.worker.busy:
+            return
+        stat = file_stat(path)
+        if stat is None or stat == self.watched_stat:
+            return
+        
+        parser = self.acpi_parser
+        dsdt_context = self.dsdt_context
+        generation = self.generation
+        
+        def job(context):
+            # The tabs read this parser on the main thread; they wait for the
+            # lock, which is only held for an in-place update (no full parse)
+            with self.parser_lock:
+                summary = parser.refresh(full=False)
+                if summary is not None and dsdt_context is not None:
+                    dsdt_context.analyze()
+            return summary
+        
+        def on_done(summary):
+            if generation != self.generation or parser is not self.acpi_parser:
+                return
+            if summary is None:
+                self.load_file(path, quiet=True)
+                return
+            self.watched_stat = stat
+            self.acpi_entries = parser.get_all_devices()
+            self.refresh_all()
+            changed = ', '.join(f"{role} -> {found or 'not found'}"
+                                for role, found in summary['paths'].items())
+            self.update_status(f"Updated: {path.name} changed on disk, "
+                               f"{summary['blocks']} block(s) parsed again"
+                               + (f"; {changed}" if changed else ""))
+        
+        def on_error(error):
+            if generation != self.generation:
+                return
+            # Try again on the next change rather than on every poll
+            self.watched_stat = stat
+            self.update_status(f"Update of {path.name} failed: {error}")
+        
+        self.worker.submit(job, on_done, on_error)
+    
+    def run_task(self, job, on_done, on_cancelled=None, title="Error", on_item=None,
+                 profile=None):
+        """Run job(context) on the worker thread with progress in the status bar
+        
+        profile is (operation, input path) naming the profile written when
+        Tools -> Profile Operations is on.
+        """
+        if profile is not None and self.profile_var.get():
+            job, on_done = self.profiled(job, on_done, *profile)
+        
+        def on_progress(percent, message):
+            self.progress['value'] = percent
+            if message:
+                self.status_label.config(text=message)
+        
+        def on_error(error):
+            self.update_status(f"{title}: {error}")
+            messagebox.showerror(title, str(error))
+        
+        def cancelled():
+            if on_cancelled:
+                on_cancelled()
             else:
-                messagebox.showerror("Error", "Failed to parse ACPI file")
+                self.update_status("Cancelled")
+        
+        if not self.worker.submit(job, on_done, on_error, on_progress, cancelled, on_item):
+            messagebox.showwarning("Busy", "Please wait for the current task to finish or cancel it")
+            return False
+        return True
+    
+    def profiled(self, job, on_done, operation, source):
+        """Wrap a task to run under the Profiler; returns (job, on_done)"""
+        profiler = Profiler(operation, source)
+        
+        def run(context):
+            with profiler:
+                return job(context)
+        
+        def done(result):
+            on_done(result)
+            if profiler.paths:
+                self.update_status(f"Profile saved: {profiler.name()}.pstats and .collapsed "
+                                   f"in {profiler.directory}")
+        
+        return run, done
+    
+    def on_busy_changed(self, busy):
+        """Enable Cancel while a background task runs"""
+        self.cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+        if not busy:
+            self.progress['value'] = 0
     
     def set_output_directory(self):
         """Set output directory for generated files"""
@@ -136,8 +353,12 @@ class AcpiAnalyzerApp:
         """Reset everything - DSDT file, output directory, patches, and context"""
         # Reset DSDT file
         self.current_file = None
+        self.watched_stat = None
         self.acpi_entries = []
+        self.generation += 1
+        self.worker.cancel()
         self.acpi_parser = ACPIParser()
+        self.hardware_detector.acpi_parser = self.acpi_parser
         self.dsdt_context = None
         
         # Reset output directory
@@ -152,6 +373,14 @@ class AcpiAnalyzerApp:
         self.update_status("Reset complete - all data cleared")
         messagebox.showinfo("Reset Complete", "All data has been reset:\n\n- DSDT file closed\n- Output directory cleared\n- Patch selections cleared\n- Analysis data cleared")
     
+    def clear_parse_cache(self):
+        """Delete all cached parse results"""
+        removed, freed = self.parse_cache.clear()
+        self.update_status(f"Parse cache cleared: {removed} entries, {freed / 1024:.0f} KB")
+        messagebox.showinfo("Parse Cache",
+            f"Removed {removed} cached parse results ({freed / 1024:.0f} KB)\n\n"
+            f"Location: {self.parse_cache.directory}")
+    
     def reset_patches(self):
         """Reset all patch selections"""
         self.patch_manager.reset_all()
@@ -198,3 +427,12 @@ Built with Python & Tkinter
 Clean, modular, and extensible architecture"""
         
         messagebox.showinfo("About Acpi Analyzer", about)
+
+
+def file_stat(path):
+    """(mtime, size) of a file, to notice when it changes, or None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
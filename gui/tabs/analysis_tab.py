@@ -2,8 +2,13 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json
 
+from core.export import export_file
+
+
+# Dummy child that gives collapsed nodes an expand arrow
+PLACEHOLDER_SUFFIX = '#children'
+EMPTY_ITEM = '#empty'
 
 
 class AnalysisTab:
@@ -13,6 +18,12 @@ class AnalysisTab:
         self.parent = parent
         self.main_app = main_app
         self.frame = ttk.Frame(parent)
+        
+        # State of the rendered tree, used to apply refreshes as diffs
+        self.rendered_namespace = None
+        self.rendered_revision = None
+        self.row_values = {}
+        
         self.setup_tab()
     
     def setup_tab(self):
@@ -31,6 +42,8 @@ class AnalysisTab:
                   command=self.export_json).pack(side=tk.LEFT)
         ttk.Button(control_frame, text="Show Statistics", 
                   command=self.show_stats).pack(side=tk.LEFT)
+        ttk.Button(control_frame, text="Save Trace", 
+                  command=self.save_trace).pack(side=tk.LEFT)
         
         # Device list
         list_frame = ttk.LabelFrame(self.frame, text="Discovered Devices")
@@ -73,31 +86,101 @@ class AnalysisTab:
         self.info_text = tk.Text(info_frame, height=6, wrap=tk.WORD)
         self.info_text.pack(fill=tk.BOTH, expand=True)
         
-        # Bind selection
+        # Bind selection; children are inserted when a node is expanded
         self.tree.bind('<<TreeviewSelect>>', self.on_device_select)
+        self.tree.bind('<<TreeviewOpen>>', self.on_node_open)
     
     def refresh(self):
-        """Refresh device list"""
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add devices
-        if self.main_app.acpi_entries:
-            for device in self.main_app.acpi_entries:
-                self.tree.insert('', 'end', 
-                               text=f"Device: {device.get('name', 'Unknown')}",
-                               values=(
-                                   device.get('name', ''),
-                                   device.get('hid', ''),
-                                   device.get('adr', ''),
-                                   'Device'
-                               ))
+        """Refresh device tree, updating only rows that changed"""
+        with self.main_app.parser_lock:
+            self.sync_tree(self.main_app.acpi_parser)
+    
+    def sync_tree(self, parser):
+        """Bring the rows in line with parser"""
+        if not parser.get_device_count():
+            if self.rendered_namespace is not None or not self.tree.exists(EMPTY_ITEM):
+                self.clear_tree()
+                self.tree.insert('', 'end', iid=EMPTY_ITEM, text='No ACPI data loaded',
+                               values=('', '', '', ''))
+            return
+        
+        if self.tree.exists(EMPTY_ITEM):
+            self.tree.delete(EMPTY_ITEM)
+        
+        # Same parse result as last time: nothing to do
+        if parser.namespace is not self.rendered_namespace or parser.revision != self.rendered_revision:
+            self.rendered_namespace = parser.namespace
+            self.rendered_revision = parser.revision
+            device_children = parser.get_detection_index().get_device_children()
+            with parser.stats.phase('populate_tree', 'gui'):
+                self.sync_children('', parser.namespace.root, device_children)
+        
+        self.main_app.update_status(f"Analysis: {parser.get_device_count()} devices found")
+    
+    def clear_tree(self):
+        """Remove all rows"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.rendered_namespace = None
+        self.row_values = {}
+    
+    def sync_children(self, parent_item, parent_node, device_children):
+        """Make the rows under parent_item match parent_node's device branches"""
+        desired = device_children.get(parent_node, [])
+        desired_ids = {node.path for node in desired}
+        
+        stale = [item for item in self.tree.get_children(parent_item) if item not in desired_ids]
+        if stale:
+            self.tree.delete(*stale)
+            self.forget_rows(stale)
+        
+        for position, node in enumerate(desired):
+            item = node.path
+            values = (node.name, node.hid or '', node.adr or '', node.kind)
+            
+            if not self.tree.exists(item):
+                self.tree.insert(parent_item, position, iid=item, text=node.name, values=values)
+                self.row_values[item] = values
+                if node in device_children:
+                    self.tree.insert(item, 'end', iid=item + PLACEHOLDER_SUFFIX)
+                continue
             
-            self.main_app.update_status(f"Analysis: {len(self.main_app.acpi_entries)} devices found")
-        else:
-            self.tree.insert('', 'end', text='No ACPI data loaded',
-                           values=('', '', '', ''))
+            if self.row_values.get(item) != values:
+                self.tree.item(item, values=values)
+                self.row_values[item] = values
+            if self.tree.index(item) != position:
+                self.tree.move(item, parent_item, position)
+            
+            # Rows that were expanded before are diffed too; others stay lazy
+            children = self.tree.get_children(item)
+            if children and children[0] != item + PLACEHOLDER_SUFFIX:
+                self.sync_children(item, node, device_children)
+            elif node not in device_children and children:
+                self.tree.delete(*children)
+            elif node in device_children and not children:
+                self.tree.insert(item, 'end', iid=item + PLACEHOLDER_SUFFIX)
+    
+    def forget_rows(self, items):
+        """Drop cached values of deleted rows and their descendants"""
+        deleted = set(items)
+        prefixes = tuple(item + '.' for item in items)
+        for key in [key for key in self.row_values if key in deleted or key.startswith(prefixes)]:
+            del self.row_values[key]
+    
+    def on_node_open(self, event):
+        """Insert the children of a node the first time it is expanded"""
+        item = self.tree.focus()
+        placeholder = item + PLACEHOLDER_SUFFIX
+        if not self.tree.exists(placeholder):
+            return
+        
+        self.tree.delete(placeholder)
+        with self.main_app.parser_lock:
+            parser = self.main_app.acpi_parser
+            node = parser.namespace.get(item)
+            if node is not None:
+                self.sync_children(item, node, parser.get_detection_index().get_device_children())
     
     def on_device_select(self, event):
         """Handle device selection"""
@@ -105,36 +188,53 @@ class AnalysisTab:
         if selection:
             item = self.tree.item(selection[0])
             values = item['values']
+            if not values or selection[0] == EMPTY_ITEM:
+                return
             
+            with self.main_app.parser_lock:
+                node = self.main_app.acpi_parser.namespace.get(selection[0])
+            table = node.table if node is not None and node.table else "the ACPI tables"
             info = f"""Device Information:
             
+Path: {selection[0]}
 Name: {values[0]}
 Hardware ID: {values[1]}
 Address: {values[2]}
 Type: {values[3]}
 
-This device was discovered in the ACPI tables.
+This device was discovered in {table}.
 """
             self.info_text.delete('1.0', tk.END)
             self.info_text.insert('1.0', info)
     
     def export_json(self):
-        """Export analysis to JSON"""
+        """Export analysis to JSON or NDJSON (optionally gzipped), streamed in the background"""
         if not self.main_app.acpi_entries:
             messagebox.showwarning("No Data", "No ACPI data to export")
             return
         
-        data = self.main_app.acpi_parser.export_to_dict()
-        
         filepath = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+            filetypes=[("JSON Files", "*.json"), ("NDJSON Files", "*.ndjson"),
+                       ("Gzipped JSON", "*.json.gz *.ndjson.gz"), ("All Files", "*.*")]
         )
+        if not filepath:
+            return
         
-        if filepath:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-            messagebox.showinfo("Success", f"Exported to {filepath}")
+        parser = self.main_app.acpi_parser
+        
+        def job(context):
+            return export_file(parser, filepath)
+        
+        def on_done(result):
+            fmt, compressed, _ = result
+            kind = fmt.upper() + (" (gzip)" if compressed else "")
+            self.main_app.update_status(f"Exported {kind} to {filepath}")
+            messagebox.showinfo("Success", f"Exported {kind} to {filepath}")
+        
+        self.main_app.update_status(f"Exporting to {filepath}...")
+        self.main_app.run_task(job, on_done, title="Export Error",
+                               profile=('export', self.main_app.current_file))
     
     def show_stats(self):
         """Show analysis statistics"""
@@ -142,8 +242,10 @@ This device was discovered in the ACPI tables.
             messagebox.showinfo("Statistics", "No ACPI data loaded")
             return
         
-        data = self.main_app.acpi_parser.export_to_dict()
-        stats = data.get('stats', {})
+        with self.main_app.parser_lock:
+            parser = self.main_app.acpi_parser
+            stats = parser.get_stats()
+            timings = "\n".join(parser.stats.format_lines()) or "No phases recorded"
         
         message = f"""ACPI Analysis Statistics:
 
@@ -152,5 +254,30 @@ Methods: {stats.get('method_count', 0)}
 Scopes: {stats.get('scope_count', 0)}
 
 File: {self.main_app.current_file.name if self.main_app.current_file else 'None'}
+
+Performance (this parse and the work done on it):
+{timings}
 """
         messagebox.showinfo("Statistics", message)
+    
+    def save_trace(self):
+        """Save the current run's phases as a Chrome trace-event file"""
+        if not self.main_app.acpi_entries:
+            messagebox.showwarning("No Data", "No ACPI data loaded")
+            return
+        
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            initialfile="trace.json",
+            filetypes=[("Trace Event JSON", "*.json"), ("All Files", "*.*")]
+        )
+        
+        if filepath:
+            try:
+                with self.main_app.parser_lock:
+                    self.main_app.acpi_parser.stats.write_chrome_trace(filepath)
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to save trace: {e}")
+                return
+            messagebox.showinfo("Success", 
+                f"Trace saved to {filepath}\n\nOpen it in chrome://tracing or ui.perfetto.dev")
@@ -4,7 +4,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from pathlib import Path
 
-from core.generators import EssentialGenerators, HardwareGenerators, LaptopGenerators, USBGenerators, AdvancedGenerators
+from core.generators import GenerationSummary, generate_patch, generate_patches
 
 
 class AutoPatchTab:
@@ -15,6 +15,7 @@ class AutoPatchTab:
         self.main_app = main_app
         self.frame = ttk.Frame(parent)
         self.patch_vars = {}
+        self.last_generation = None
         self.setup_tab()
     
     def setup_tab(self):
@@ -141,21 +142,36 @@ class AutoPatchTab:
         
         self.main_app.update_status("Analyzing DSDT file...")
         
-        # Create and analyze DSDT context
         from core.dsdt_context import DSDTContext
-        self.main_app.dsdt_context = DSDTContext(self.main_app.acpi_parser)
-        self.main_app.dsdt_context.analyze()
-        
-        # Get detected paths
-        paths = self.main_app.dsdt_context.get_detection_summary()
+        parser = self.main_app.acpi_parser
+        detector = self.main_app.hardware_detector
+        
+        def job(context):
+            # Create and analyze DSDT context
+            dsdt_context = DSDTContext(parser)
+            dsdt_context.analyze()
+            context.progress(50, "Detecting hardware...")
+            
+            # Detect hardware from DSDT
+            hw_info = detector.detect()
+            
+            # Analyze DSDT for additional info
+            has_battery = bool(parser.find_device_by_name_part('BAT'))
+            return dsdt_context, hw_info, has_battery
         
-        # Detect hardware from DSDT
-        hw_info = self.main_app.hardware_detector.detect()
+        def on_done(result):
+            dsdt_context, hw_info, has_battery = result
+            self.main_app.dsdt_context = dsdt_context
+            self.show_hardware_results(dsdt_context, hw_info, has_battery)
         
-        # Analyze DSDT for additional info
+        self.main_app.run_task(job, on_done, title="Analysis Error",
+                               profile=('analyze-hardware', self.main_app.current_file))
+    
+    def show_hardware_results(self, dsdt_context, hw_info, has_battery):
+        """Display hardware analysis results"""
+        # Get detected paths
+        paths = dsdt_context.get_detection_summary()
         device_count = len(self.main_app.acpi_entries)
-        has_ec = any('EC' in d.get('name', '') for d in self.main_app.acpi_entries)
-        has_battery = any('BAT' in d.get('name', '') for d in self.main_app.acpi_entries)
         
         # Determine platform from DSDT
         if has_battery:
@@ -229,7 +245,7 @@ Generic paths will be used with warnings if devices not found.
             messagebox.showwarning("No Selection", "Please select patches to generate")
             return
         
-        self.generate_patches(selected)
+        self.generate_patches(selected, operation='generate-selected')
     
     def generate_all(self):
         """Generate all patches"""
@@ -238,83 +254,90 @@ Generic paths will be used with warnings if devices not found.
                                  "Please set output directory first")
             return
         
-        self.generate_patches(self.main_app.patch_manager.patches)
+        self.generate_patches(self.main_app.patch_manager.patches, operation='generate-all')
     
-    def generate_patches(self, patches):
-        """Generate SSDT files"""
+    def generate_patches(self, patches, operation='generate'):
+        """Generate SSDT files in parallel on the background worker"""
         self.main_app.update_status("Generating patches...")
-        generated = []
-        failed = []
+        output_directory = self.main_app.output_directory
+        dsdt_context = getattr(self.main_app, 'dsdt_context', None)
+        patches_by_name = {}
+        for patch in patches:
+            patches_by_name.setdefault(patch.name, []).append(patch)
+        summary = GenerationSummary()
+        stats = self.main_app.acpi_parser.stats
+        
+        def job(context):
+            total = len(patches_by_name)
+            results = generate_patches(patches_by_name, output_directory, dsdt_context,
+                                       summary=summary)
+            try:
+                with stats.phase('generate', 'generate', patches=total):
+                    for done, result in enumerate(results, 1):
+                        context.report(result)
+                        context.progress(done / total * 100,
+                                         f"Generated {result['patch']} ({done}/{total})")
+                        context.check_cancelled()
+            finally:
+                results.close()
+                stats.count('patches_written', len(summary.written))
+                stats.count('patches_skipped', len(summary.skipped))
+                stats.count('patches_failed', len(summary.failed))
+            return summary
+        
+        def on_item(result):
+            # Called on the UI thread for each patch as soon as it finishes
+            if result['ok']:
+                for patch in patches_by_name[result['patch']]:
+                    patch.generated = True
+            else:
+                self.main_app.update_status(f"Failed {result['patch']}: {result.get('error')}")
         
-        total = len(patches)
-        for i, patch in enumerate(patches):
-            self.main_app.update_progress((i + 1) / total * 100)
+        def on_done(summary):
+            self.last_generation = summary
+            generated = summary.generated
+            failed = summary.failed
             
-            output_file = self.main_app.output_directory / f"{patch.name}.dsl"
+            # Show results
+            message = (f"Generated {len(generated)} patches in {summary.elapsed:.2f}s "
+                       f"({len(summary.written)} written, {len(summary.skipped)} unchanged)")
+            if failed:
+                message += f"\nFailed: {len(failed)}"
             
-            try:
-                success = self.generate_single_patch(patch.name, output_file)
-                if success:
-                    generated.append(patch.name)
-                    patch.generated = True
-                else:
-                    failed.append(patch.name)
-            except Exception as e:
-                failed.append(f"{patch.name} ({str(e)})")
-        
-        self.main_app.update_progress(0)
-        
-        # Show results
-        message = f"Generated {len(generated)} patches"
-        if failed:
-            message += f"\nFailed: {len(failed)}"
-        
-        self.main_app.update_status(message)
-        messagebox.showinfo("Generation Complete", 
-                          f"Successfully generated: {len(generated)}\n"
-                          f"Failed: {len(failed)}\n\n"
-                          f"Output: {self.main_app.output_directory}")
+            self.main_app.update_status(message)
+            
+            details = ""
+            if failed:
+                details += "\n\nFailed:\n" + "\n".join(
+                    f"  {result['patch']} ({result.get('error')})" for result in failed[:10])
+            slowest = summary.slowest(5)
+            if slowest:
+                details += "\n\nSlowest:\n" + "\n".join(
+                    f"  {name}: {ms:.1f} ms" for name, ms in slowest)
+            messagebox.showinfo("Generation Complete", 
+                              f"Successfully generated: {len(generated)}\n"
+                              f"  Written: {len(summary.written)}\n"
+                              f"  Unchanged (skipped): {len(summary.skipped)}\n"
+                              f"Failed: {len(failed)}\n"
+                              f"Time: {summary.elapsed:.2f}s\n\n"
+                              f"Output: {output_directory}{details}")
+        
+        def on_cancelled():
+            self.last_generation = summary
+            self.main_app.update_status(
+                f"Patch generation cancelled ({len(summary.generated)} written)")
+        
+        self.main_app.run_task(job, on_done, on_cancelled=on_cancelled,
+                               title="Generation Error", on_item=on_item,
+                               profile=(operation, self.main_app.current_file))
     
     def generate_single_patch(self, patch_name, output_path):
         """Generate a single patch file"""
         # Get DSDT context if available
         dsdt_context = getattr(self.main_app, 'dsdt_context', None)
         
-        generators = {
-            'SSDT-EC': EssentialGenerators.generate_ec,
-            'SSDT-PLUG': EssentialGenerators.generate_plug,
-            'SSDT-AWAC': EssentialGenerators.generate_awac,
-            'SSDT-HPET': HardwareGenerators.generate_hpet,
-            'SSDT-PMC': HardwareGenerators.generate_pmc,
-            'SSDT-SBUS': HardwareGenerators.generate_sbus,
-            'SSDT-PNLF': LaptopGenerators.generate_pnlf,
-            'SSDT-ALS0': LaptopGenerators.generate_als0,
-            'SSDT-GPI0': LaptopGenerators.generate_gpi0,
-            'SSDT-USBX': USBGenerators.generate_usbx,
-            'SSDT-USB-Reset': USBGenerators.generate_usb_reset,
-            'SSDT-XOSI': AdvancedGenerators.generate_xosi,
-            'SSDT-GPU-DISABLE': AdvancedGenerators.generate_gpu_disable,
-            'SSDT-GPU-SPOOF': AdvancedGenerators.generate_gpu_spoof,
-            'SSDT-dGPU-Off': AdvancedGenerators.generate_dgpu_off,
-            'SSDT-NoHybGfx': AdvancedGenerators.generate_nohybgfx,
-            'SSDT-RHUB': AdvancedGenerators.generate_rhub,
-            'SSDT-RHUB-prebuilt': AdvancedGenerators.generate_rhub_prebuilt,
-            'SSDT-UNC': AdvancedGenerators.generate_unc,
-            'SSDT-RTC0-RANGE': AdvancedGenerators.generate_rtc0_range,
-            'SSDT-CPUR': AdvancedGenerators.generate_cpur,
-            'SSDT-IMEI': AdvancedGenerators.generate_imei,
-            'SSDT-EC-USBX-DESKTOP': AdvancedGenerators.generate_ec_usbx_desktop,
-            'SSDT-EC-USBX-LAPTOP': AdvancedGenerators.generate_ec_usbx_laptop,
-            'SSDT-PLUG-DRTNIA': AdvancedGenerators.generate_plug_drtnia,
-        }
-        
-        generator = generators.get(patch_name)
-        if generator:
-            # Pass DSDT context to generator
-            return generator(output_path, dsdt_context)
-        else:
-            # Use generic template loader for patches without specific generators
-            return AdvancedGenerators.generate_from_template(patch_name, output_path)
+        with self.main_app.parser_lock:
+            return generate_patch(patch_name, output_path, dsdt_context)
     
     def clear_selection(self):
         """Clear all selections"""
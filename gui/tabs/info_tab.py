@@ -95,8 +95,9 @@ Getting Started:
 
 Step 1: Load DSDT File
 - Go to File -> Open DSDT/ACPI File
-- Select your decompiled DSDT.dsl file
+- Select your decompiled DSDT.dsl file, or the DSDT.aml table itself
 - The tool will parse and analyze the file
+- Edits saved to the file from another editor are picked up automatically
 - To close: File -> Close DSDT/ACPI File
 
 Step 2: Set Output Directory
@@ -3,8 +3,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
-import tempfile
-import os
 
 
 
@@ -116,24 +114,19 @@ class ManualTab:
         self.main_app.update_status(f"Loaded template: {template_name}")
     
     def get_template_content(self, template_name):
-        """Get template content"""
-        from core.generators import AdvancedGenerators
+        """Get the template file with detected device paths filled in
         
-        temp_file = tempfile.mktemp(suffix='.dsl')
+        Always the template, also for patches that Generate renders with a
+        dedicated generator (SSDT-EC, SSDT-IMEI), so the editor starts from
+        the same file as before templates were compiled.
+        """
+        from core.generators import AdvancedGenerators
         
         try:
-            result = AdvancedGenerators.generate_from_template(template_name, temp_file)
-            
-            if result and os.path.exists(temp_file):
-                with open(temp_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                os.remove(temp_file)
-                return content
-            else:
-                return f"// {template_name}\n// Template not found\n// Please add your ACPI code here\n"
+            with self.main_app.parser_lock:
+                return AdvancedGenerators.render_from_template(
+                    template_name, getattr(self.main_app, 'dsdt_context', None))
         except Exception as e:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
             return f"// {template_name}\n// Error loading template: {str(e)}\n// Please add your ACPI code here\n"
     
     def save_file(self):
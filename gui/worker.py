@@ -0,0 +1,134 @@
+"""Background worker thread for long-running jobs"""
+
+import queue
+import threading
+
+from core.acpi_parser import ParseCancelled
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when the user pressed Cancel"""
+
+
+class JobContext:
+    """Handle passed to a running job for progress reports and cancellation"""
+
+    def __init__(self, events, cancel_event):
+        self.events = events
+        self.cancel_event = cancel_event
+
+    def progress(self, percent, message=None):
+        """Report progress (0-100) and an optional status message"""
+        self.events.put(('progress', percent, message))
+    
+    def report(self, item):
+        """Hand one partial result to the UI; unlike progress, none are dropped"""
+        self.events.put(('item', item))
+
+    def check_cancelled(self):
+        """Raise JobCancelled if the job was cancelled"""
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class BackgroundWorker:
+    """Run one job at a time on a worker thread, reporting back through Tk
+
+    The job runs as job(context) on a daemon thread. Its progress, result
+    or error is put on a queue that the Tk main loop drains every poll_ms
+    via root.after, so callbacks always run on the main thread.
+    """
+
+    def __init__(self, root, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.callbacks = {}
+        self.on_busy_changed = None
+
+    @property
+    def busy(self):
+        return self.thread is not None
+
+    def submit(self, job, on_done, on_error=None, on_progress=None, on_cancelled=None,
+               on_item=None):
+        """Start job on the worker thread; returns False if one is running"""
+        if self.busy:
+            return False
+
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.callbacks = {
+            'done': on_done,
+            'error': on_error,
+            'progress': on_progress,
+            'cancelled': on_cancelled,
+            'item': on_item
+        }
+        context = JobContext(self.events, self.cancel_event)
+        self.thread = threading.Thread(target=self._run, args=(job, context), daemon=True)
+        self.thread.start()
+        self._set_busy(True)
+        self.root.after(self.poll_ms, self._poll)
+        return True
+
+    def cancel(self):
+        """Ask the running job to stop at its next cancellation check"""
+        if self.busy:
+            self.cancel_event.set()
+
+    def _run(self, job, context):
+        """Worker thread body"""
+        try:
+            result = job(context)
+        except (JobCancelled, ParseCancelled):
+            self.events.put(('cancelled',))
+        except Exception as e:
+            self.events.put(('error', e))
+        else:
+            self.events.put(('done', result))
+
+    def _poll(self):
+        """Drain queued events on the Tk main thread"""
+        latest_progress = None
+        items = []
+        finished = None
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == 'progress':
+                # Only the most recent progress update matters
+                latest_progress = event
+            elif event[0] == 'item':
+                items.append(event[1])
+            else:
+                finished = event
+        
+        if items and self.callbacks.get('item'):
+            for item in items:
+                self.callbacks['item'](item)
+
+        if latest_progress and self.callbacks.get('progress'):
+            self.callbacks['progress'](latest_progress[1], latest_progress[2])
+
+        if finished is None:
+            self.root.after(self.poll_ms, self._poll)
+            return
+
+        self.thread = None
+        self._set_busy(False)
+        callback = self.callbacks.get(finished[0])
+        if callback:
+            callback(*finished[1:])
+
+    def _set_busy(self, busy):
+        if self.on_busy_changed:
+            self.on_busy_changed(busy)
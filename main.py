@@ -2,14 +2,22 @@
 """
 Acpi Analyzer - Main Entry Point
 A comprehensive ACPI analysis and patching tool
+
+Run without arguments to start the GUI. With arguments, the headless CLI
+is used instead (same as python -m cli), e.g. main.py analyze dsdt.dsl
 """
 
 import sys
-import tkinter as tk
-from tkinter import messagebox
 
 def main():
     """Main application entry point"""
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    
+    import tkinter as tk
+    from tkinter import messagebox
+    
     try:
         from gui.main_window import AcpiAnalyzerApp
         
@@ -0,0 +1 @@
+"""Regression tests (python -m unittest discover tests, or pytest)"""
@@ -0,0 +1,144 @@
+"""The token parser against the original regex parser on the bundled DSDT"""
+
+import io
+import threading
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from benchmarks.legacy_parser import LegacyACPIParser
+from core.acpi_lexer import match_braces, tokenize
+from core.acpi_parser import ACPIParser, ParseCancelled
+
+
+DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+SNIPPET = ('    OperationRegion (GNVS, SystemMemory, 0x7FF00000, 0x0100)\n'
+           '    Field (GNVS, AnyAcc, NoLock, Preserve)\n'
+           '    {\n'
+           '        OSYS,   16\n'
+           '    }\n'
+           '    IndexField (INDX, DATA, ByteAcc, NoLock, Preserve)\n'
+           '    {\n'
+           '    }\n'
+           '    // Device (OLD0)\n'
+           '    Device (EC0)\n'
+           '    {\n'
+           '        Name (_HID, EisaId ("PNP0C09"))\n'
+           '        Name (_ADR, Zero)\n'
+           '        CreateDWordField (BUF0, 0x04, BAS0)\n'
+           '        Method (_STA, 0, NotSerialized)\n'
+           '        {\n'
+           '            Name (TEMP, One)\n'
+           '        }\n'
+           '    }\n')
+
+
+class TokenizeTest(unittest.TestCase):
+    """Token kinds, names and values of a small snippet"""
+
+    EXPECTED = [
+        ('OperationRegion', 'GNVS', 4, None),
+        ('Field', 'GNVS', 65, None),
+        ('Device', 'EC0', 227, None),
+        ('Name', '_HID', 254, 'PNP0C09'),
+        ('Name', '_ADR', 294, 'Zero'),
+        ('Method', '_STA', 364, None),
+    ]
+
+    def test_text(self):
+        # IndexField/CreateDWordField, comments and method bodies are skipped
+        self.assertEqual(list(tokenize(SNIPPET, None, match_braces(SNIPPET))), self.EXPECTED)
+
+    def test_bytes(self):
+        data = SNIPPET.encode('ascii')
+        self.assertEqual(list(tokenize(data, None, match_braces(data))), self.EXPECTED)
+
+
+class LegacyParityTest(unittest.TestCase):
+    """Records and detected paths of dsdt.dsl match the legacy parser"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.legacy = LegacyACPIParser()
+        cls.legacy.parse_file(str(DSDT))
+        cls.parser = ACPIParser()
+        cls.parser.parse_file(str(DSDT))
+
+    def test_devices(self):
+        self.assertEqual([(d['name'], d['position']) for d in self.legacy.devices],
+                         [(d['name'], d['position']) for d in self.parser.devices])
+
+    def test_scopes(self):
+        self.assertEqual([(s['path'], s['position']) for s in self.legacy.scopes],
+                         [(s['path'], s['position']) for s in self.parser.scopes])
+
+    def test_methods(self):
+        legacy = {(m['name'], m['position']) for m in self.legacy.methods}
+        current = {(m['name'], m['position']) for m in self.parser.methods}
+
+        # Method bodies are skipped, so methods declared inside one are not
+        # reported; the legacy regex found every Method( in the file
+        braces = match_braces(self.parser.content)
+        bodies = [(position, braces.close_after(position)) for _, position in current]
+        for name, position in legacy - current:
+            self.assertTrue(any(start < position < end for start, end in bodies),
+                            f"{name} at {position} is not inside a method body")
+
+        # The legacy regex cannot read prefixed names such as ^BN00
+        for name, position in current - legacy:
+            self.assertIn(name[0], '^\\', f"{name} at {position} missed by the legacy parser")
+
+    def test_device_paths(self):
+        # The legacy parser returned bare names for some roles (EC, BAT0)
+        legacy = self.legacy.get_device_paths()
+        for role, path in self.parser.get_device_paths().items():
+            if path is None or legacy[role] is None:
+                self.assertEqual(legacy[role], path, role)
+            else:
+                self.assertIn(legacy[role], (path, path.rsplit('.', 1)[-1]), role)
+
+
+class MmapParseTest(unittest.TestCase):
+    """Byte scans of a memory-mapped file"""
+
+    def test_matches_text_parse(self):
+        text = ACPIParser()
+        text.parse_file(str(DSDT), use_mmap=False)
+        mapped = ACPIParser()
+        mapped.parse_file(str(DSDT), use_mmap=True)
+        try:
+            self.assertEqual([dict(d) for d in mapped.devices], [dict(d) for d in text.devices])
+            self.assertEqual(mapped.get_device_paths(), text.get_device_paths())
+        finally:
+            mapped.close()
+
+    def test_failed_parse_unmaps(self):
+        parser = ACPIParser()
+        mapped = []
+
+        def fail(offset, total):
+            mapped.append(parser.content)
+            raise RuntimeError('read error')
+
+        with redirect_stderr(io.StringIO()):
+            self.assertFalse(parser.parse_file(str(DSDT), use_mmap=True, progress=fail))
+        self.assertTrue(mapped[0].closed)
+        self.assertIsNone(parser.content)
+
+    def test_cancelled_parse_unmaps(self):
+        parser = ACPIParser()
+        cancel = threading.Event()
+        mapped = []
+
+        def progress(offset, total):
+            mapped.append(parser.content)
+            cancel.set()
+
+        with self.assertRaises(ParseCancelled):
+            parser.parse_file(str(DSDT), use_mmap=True, progress=progress, cancel=cancel)
+        self.assertTrue(mapped[0].closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
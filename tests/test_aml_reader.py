@@ -0,0 +1,84 @@
+"""AMLReader on a compiled table against the DSL it was compiled from
+
+tests/data/DSDT.aml is tests/data/DSDT.dsl encoded as iasl encodes it
+(smallest integer constants, compressed EisaIds, minimal PkgLengths).
+"""
+
+import unittest
+from pathlib import Path
+
+from core.acpi_lexer import Token
+from core.acpi_parser import ACPIParser
+from core.aml_reader import AMLReader, AMLError, decode_eisa_id, is_aml, read_table_header
+
+
+DATA = Path(__file__).resolve().parent / "data"
+
+
+def declarations(parser):
+    """Namespace contents without the offsets, which differ between DSL and AML"""
+    return sorted((node.path, node.kind, node.hid, node.cid, node.adr)
+                  for node in parser.namespace.nodes.values())
+
+
+class AMLReaderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.aml = (DATA / "DSDT.aml").read_bytes()
+
+    def test_header(self):
+        self.assertTrue(is_aml(self.aml))
+        self.assertFalse(is_aml(b'DSDT'))
+        header = read_table_header(self.aml)
+        self.assertEqual((header['signature'], header['length'], header['oem_id'],
+                          header['oem_table_id'], header['creator_id']),
+                         ('DSDT', len(self.aml), 'TEST', 'FIXTURE', 'INTL'))
+        self.assertEqual(sum(self.aml) % 256, 0)
+        with self.assertRaises(AMLError):
+            read_table_header(self.aml[:20])
+
+    def test_tokens(self):
+        reader = AMLReader(self.aml)
+        tokens = reader.tokens()
+        self.assertEqual(tokens[:8], [
+            Token('Scope', '\\_PR', 36, None),
+            Token('Processor', 'CPU0', 43, None),
+            Token('Scope', '\\_SB', 56, None),
+            Token('Device', 'PCI0', 64, None),
+            Token('Name', '_HID', 72, 'PNP0A08'),
+            Token('Name', '_CID', 82, 'PNP0A03'),
+            Token('Name', '_ADR', 92, 'Zero'),
+            Token('Device', 'LPCB', 98, None),
+        ])
+        self.assertIn(Token('Name', '_HID', 284, 'INT34BB'), tokens)
+        self.assertIn(Token('Name', '_ADR', 244, '0x001F0004'), tokens)
+        # Device EC0 and its _STA both end at the last byte of EC0's body
+        self.assertEqual((reader.ends[143], reader.ends[160]), (185, 185))
+        self.assertEqual(reader.errors, [])
+
+        # Reading method bodies finds the same declarations here
+        reader = AMLReader(self.aml, method_bodies=True)
+        self.assertEqual(reader.tokens(), tokens)
+        self.assertEqual(reader.method_args(), {'\\_SB.PCI0.LPCB.EC0._STA': 0})
+
+    def test_eisa_id(self):
+        self.assertEqual(decode_eisa_id(0x080AD041), 'PNP0A08')
+        self.assertEqual(decode_eisa_id(0x090CD041), 'PNP0C09')
+        self.assertIsNone(decode_eisa_id(0))
+
+    def test_matches_dsl(self):
+        aml = ACPIParser()
+        self.assertTrue(aml.parse_file(DATA / "DSDT.aml"))
+        dsl = ACPIParser()
+        self.assertTrue(dsl.parse_file(DATA / "DSDT.dsl"))
+
+        self.assertEqual(declarations(aml), declarations(dsl))
+        self.assertEqual([d['path'] for d in aml.devices], [d['path'] for d in dsl.devices])
+        self.assertEqual(aml.get_device_paths(), dsl.get_device_paths())
+        self.assertEqual(aml.get_device_paths()['ec_device'], '_SB.PCI0.LPCB.EC0')
+        self.assertEqual(aml.aml_errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Batch runner results, NDJSON output and exit status"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from cli.commands import main
+from core.batch import BatchStats, run_batch
+
+
+TABLE = ('DefinitionBlock ("", "DSDT", 2, "TEST", "TEST", 0)\n'
+         '{\n'
+         '    Scope (\\_SB)\n'
+         '    {\n'
+         '        Device (PCI0)\n'
+         '        {\n'
+         '            Name (_HID, EisaId ("PNP0A08"))\n'
+         '            Device (GFX0)\n'
+         '            {\n'
+         '                Name (_ADR, 0x00020000)\n'
+         '            }\n'
+         '        }\n'
+         '    }\n'
+         '}\n')
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text=TABLE):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def run_cli(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(['batch', self.directory, '-j', '1', '--no-cache', *argv])
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_results_and_stats(self):
+        good = self.write('DSDT.dsl')
+        missing = os.path.join(self.directory, 'missing.dsl')
+        stats = BatchStats()
+        results = {r['file']: r for r in run_batch([good, missing], workers=1,
+                                                   use_cache=False, stats=stats)}
+
+        self.assertTrue(results[good]['ok'])
+        self.assertEqual(results[good]['devices'], 2)
+        self.assertEqual(results[good]['paths']['gpu_device'], '_SB.PCI0.GFX0')
+        self.assertFalse(results[missing]['ok'])
+        self.assertIn('error', results[missing])
+        summary = stats.summary()
+        self.assertEqual((summary['tables'], summary['failed']), (2, 1))
+
+    def test_ndjson_output(self):
+        self.write('DSDT.dsl')
+        self.write('sub/SSDT-1.dsl')
+        self.write('notes.txt', 'not a table')
+
+        code, stdout, stderr = self.run_cli()
+        self.assertEqual(code, 0)
+        lines = stdout.splitlines()
+        self.assertEqual(len(lines), 2)
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(sorted(os.path.basename(r['file']) for r in records),
+                         ['DSDT.dsl', 'SSDT-1.dsl'])
+        self.assertTrue(all(r['ok'] for r in records))
+        self.assertIn('2 tables (0 failed)', stderr)
+
+        code, stdout, _ = self.run_cli('--no-recursive')
+        self.assertEqual(len(stdout.splitlines()), 1)
+
+    def test_no_tables(self):
+        self.write('notes.txt', 'not a table')
+        code, stdout, stderr = self.run_cli()
+        self.assertEqual(code, 1)
+        self.assertEqual(stdout, '')
+        self.assertIn('No files matching', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Subcommand options and output of the CLI"""
+
+import io
+import json
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from cli.commands import build_parser, main
+
+
+DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+# Required arguments of each subcommand
+ARGUMENTS = {
+    'analyze': ['dsdt.dsl'],
+    'detect': ['dsdt.dsl'],
+    'generate': ['-o', 'out'],
+    'export': ['dsdt.dsl'],
+    'batch': ['tables'],
+}
+
+
+def accepts(command, *flags):
+    """Whether the subcommand parses with flags added"""
+    try:
+        with redirect_stderr(io.StringIO()):
+            build_parser().parse_args([command] + ARGUMENTS[command] + list(flags))
+    except SystemExit:
+        return False
+    return True
+
+
+class CommandOptionsTest(unittest.TestCase):
+
+    def test_flags_only_where_used(self):
+        for command in ('analyze', 'detect', 'generate', 'export'):
+            self.assertTrue(accepts(command, '--no-cache', '--compact', '--trace', 't.json'),
+                            command)
+        self.assertTrue(accepts('batch', '--no-cache'))
+        self.assertFalse(accepts('batch', '--compact'))
+        self.assertFalse(accepts('batch', '--trace', 't.json'))
+
+    def test_compact_output(self):
+        outputs = []
+        for extra in ([], ['--compact']):
+            with redirect_stdout(io.StringIO()) as stdout:
+                self.assertEqual(main(['detect', str(DSDT), '--no-cache'] + extra), 0)
+            outputs.append(stdout.getvalue())
+        self.assertGreater(outputs[0].count('\n'), 1)
+        self.assertEqual(outputs[1].count('\n'), 1)
+        self.assertEqual(json.loads(outputs[0]), json.loads(outputs[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Device role detection on small tables"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.acpi_parser import ACPIParser
+
+
+HEADER = 'DefinitionBlock ("", "{signature}", 2, "TEST", "TEST", 0)\n{{\n'
+
+
+def table(body, signature='DSDT'):
+    """DSL text of a table with the given body"""
+    return HEADER.format(signature=signature) + body + '}\n'
+
+
+class DetectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def parse(self, text):
+        parser = ACPIParser()
+        self.assertTrue(parser.parse_file(self.write('DSDT.dsl', text)))
+        return parser
+
+    def test_external_only_devices_are_not_detected(self):
+        # External() and Scope() only refer to objects another table may declare
+        parser = self.parse(table(
+            '    External (\\_SB.PCI0, DeviceObj)\n'
+            '    External (\\_SB.PCI0.GFX0, DeviceObj)\n'
+            '    External (\\_SB.PCI0.LPCB.HPET, DeviceObj)\n'
+            '    External (\\_SB.PCI0.XHC.RHUB, DeviceObj)\n'
+            '    Scope (\\_SB.PCI0.SBUS)\n'
+            '    {\n'
+            '        Name (BUSY, Zero)\n'
+            '    }\n'))
+        paths = parser.get_device_paths()
+        for role in ('pci_root', 'lpc_bridge', 'gpu_device', 'usb_controller', 'smbus',
+                     'hpet_device'):
+            self.assertIsNone(paths[role], role)
+
+    def test_external_placeholder_does_not_shadow_device(self):
+        parser = self.parse(table(
+            '    External (\\_SB.PCI0.GFX0, DeviceObj)\n'
+            '    Scope (\\_SB)\n'
+            '    {\n'
+            '        Device (PCI0)\n'
+            '        {\n'
+            '            Name (_HID, EisaId ("PNP0A08"))\n'
+            '            Device (IGPU)\n'
+            '            {\n'
+            '                Name (_ADR, 0x00020000)\n'
+            '            }\n'
+            '        }\n'
+            '    }\n'))
+        paths = parser.get_device_paths()
+        self.assertEqual(paths['pci_root'], '_SB.PCI0')
+        self.assertEqual(paths['gpu_device'], '_SB.PCI0.IGPU')
+
+    def test_ec_and_battery_are_full_paths(self):
+        # By _HID: the EC is H_EC, not one of the names tried later
+        parser = self.parse(table(
+            '    Scope (\\_SB)\n'
+            '    {\n'
+            '        Device (PCI0)\n'
+            '        {\n'
+            '            Device (LPCB)\n'
+            '            {\n'
+            '                Device (H_EC)\n'
+            '                {\n'
+            '                    Name (_HID, EisaId ("PNP0C09"))\n'
+            '                    Device (BAT1)\n'
+            '                    {\n'
+            '                        Name (_HID, EisaId ("PNP0C0A"))\n'
+            '                    }\n'
+            '                }\n'
+            '            }\n'
+            '        }\n'
+            '    }\n'))
+        self.assertEqual(parser.find_ec_device(), '_SB.PCI0.LPCB.H_EC')
+        self.assertEqual(parser.find_battery_device(), '_SB.PCI0.LPCB.H_EC.BAT1')
+        self.assertEqual(parser.find_battery_device().rsplit('.', 1)[-1], 'BAT1')
+
+        # By name, without a _HID
+        parser = self.parse(table(
+            '    Device (\\_SB.PCI0.SBRG.EC0)\n'
+            '    {\n'
+            '    }\n'
+            '    Device (\\_SB.BAT0)\n'
+            '    {\n'
+            '    }\n'))
+        paths = parser.get_device_paths()
+        self.assertEqual((paths['ec_device'], paths['battery_device']),
+                         ('_SB.PCI0.SBRG.EC0', '_SB.BAT0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Device lookups by HID, CID, name and _ADR against scans of the records"""
+
+import unittest
+from pathlib import Path
+
+from core.acpi_parser import ACPIParser
+from core.device_index import DeviceIndex
+
+
+DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+# BAT0's _HID follows its nested BAT1, so its value is indexed second
+TABLE = ('DefinitionBlock ("", "DSDT", 2, "TEST", "TEST", 0)\n'
+         '{\n'
+         '    Scope (\\_SB)\n'
+         '    {\n'
+         '        Device (PCI0)\n'
+         '        {\n'
+         '            Name (_HID, EisaId ("PNP0A08"))\n'
+         '            Name (_CID, EisaId ("PNP0A03"))\n'
+         '            Name (_ADR, Zero)\n'
+         '            Device (GFX0)\n'
+         '            {\n'
+         '                Name (_ADR, 0x00020000)\n'
+         '            }\n'
+         '        }\n'
+         '        Device (BAT0)\n'
+         '        {\n'
+         '            Device (BAT1)\n'
+         '            {\n'
+         '                Name (_HID, EisaId ("PNP0C0A"))\n'
+         '            }\n'
+         '            Name (_HID, EisaId ("PNP0C0A"))\n'
+         '        }\n'
+         '    }\n'
+         '    Scope (\\_SB.PCI0.GFX0)\n'
+         '    {\n'
+         '        Name (_HID, "ABCD0001")\n'
+         '    }\n'
+         '}\n')
+
+
+def scan(parser, field, value):
+    return [device['path'] for device in parser.devices if device[field] == value]
+
+
+def paths(devices):
+    return [device['path'] for device in devices]
+
+
+class DeviceIndexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = ACPIParser()
+        cls.parser.parse_bytes(TABLE.encode())
+
+    def test_built_while_declaring(self):
+        self.assertIsNotNone(self.parser.device_index)
+
+    def test_find(self):
+        parser = self.parser
+        self.assertEqual(paths(parser.find_device_by_hid('PNP0C0A')),
+                         ['\\_SB.BAT0', '\\_SB.BAT0.BAT1'])
+        self.assertEqual(paths(parser.find_device_by_hid('ABCD0001')), ['\\_SB.PCI0.GFX0'])
+        self.assertEqual(paths(parser.find_device_by_cid('PNP0A03')), ['\\_SB.PCI0'])
+        self.assertEqual(paths(parser.find_device_by_name('GFX0')), ['\\_SB.PCI0.GFX0'])
+        self.assertEqual(paths(parser.find_device_by_adr('0x00020000')), ['\\_SB.PCI0.GFX0'])
+        self.assertEqual(paths(parser.find_device_by_adr('Zero')), ['\\_SB.PCI0'])
+        self.assertEqual(parser.find_device_by_hid('PNP0C09'), [])
+        self.assertEqual(paths(parser.find_device_by_hid(None)), scan(parser, 'hid', None))
+
+    def test_partial_lookups(self):
+        parser = self.parser
+        self.assertEqual(paths(parser.find_device_by_hid_prefix('PNP0')),
+                         ['\\_SB.PCI0', '\\_SB.BAT0', '\\_SB.BAT0.BAT1'])
+        self.assertEqual(paths(parser.find_device_by_name_part('BAT')),
+                         ['\\_SB.BAT0', '\\_SB.BAT0.BAT1'])
+        self.assertEqual(paths(parser.find_device_by_name_part('GFX0X')), [])
+
+    def test_matches_scans_of_bundled_dsdt(self):
+        parser = ACPIParser()
+        parser.parse_file(str(DSDT))
+        rebuilt = DeviceIndex(parser.devices)
+        for field in ('hid', 'cid', 'name', 'adr'):
+            for value in {device[field] for device in parser.devices}:
+                found = paths(parser.get_device_index().find(field, value))
+                self.assertEqual(found, scan(parser, field, value), (field, value))
+                self.assertEqual(paths(rebuilt.find(field, value)), found, (field, value))
+
+
+if __name__ == '__main__':
+    unittest.main()
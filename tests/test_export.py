@@ -0,0 +1,86 @@
+"""Streaming JSON/NDJSON export against export_to_dict()"""
+
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from cli.commands import main
+from core.acpi_parser import ACPIParser
+from core.export import export_file, export_format, write_export
+
+
+DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+
+class ExportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = ACPIParser()
+        cls.parser.parse_file(str(DSDT))
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_format_from_name(self):
+        self.assertEqual(export_format('out.json'), ('json', False))
+        self.assertEqual(export_format('out.JSON.gz'), ('json', True))
+        self.assertEqual(export_format('out.ndjson.gz'), ('ndjson', True))
+        self.assertEqual(export_format('out.jsonl'), ('ndjson', False))
+
+    def test_gzip_json_round_trip(self):
+        path = os.path.join(self.directory, 'dsdt.json.gz')
+        self.assertEqual(export_file(self.parser, path)[:2], ('json', True))
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            exported = json.load(f)
+
+        # Only the timings differ: the export itself is one of the phases
+        expected = self.parser.export_to_dict()
+        del expected['instrumentation']
+        instrumentation = exported.pop('instrumentation')
+        self.assertEqual(exported.pop('paths'), self.parser.get_device_paths())
+        self.assertEqual(exported, expected)
+        self.assertIn('export', [phase['name'] for phase in instrumentation['phases']])
+
+    def test_ndjson_lines(self):
+        output = io.StringIO()
+        written = write_export(self.parser, output, 'ndjson')
+        text = output.getvalue()
+        self.assertEqual(written, len(text))
+
+        records = [json.loads(line) for line in text.splitlines()]
+        nodes = sum(1 for _ in self.parser.namespace.root.walk())
+        self.assertEqual(len(records), 1 + len(self.parser.devices) + len(self.parser.methods)
+                         + len(self.parser.scopes) + nodes + 1)
+        types = [record.pop('type') for record in records]
+        self.assertEqual((types[0], types[-1]), ('file', 'instrumentation'))
+        self.assertEqual(types.count('node'), nodes)
+        self.assertEqual([r for r, t in zip(records, types) if t == 'device'],
+                         [dict(d) for d in self.parser.devices])
+        self.assertEqual([r for r, t in zip(records, types) if t == 'method'],
+                         [dict(m) for m in self.parser.methods])
+
+    def test_cli_ndjson_gzip(self):
+        path = os.path.join(self.directory, 'dsdt.ndjson.gz')
+        with redirect_stdout(io.StringIO()) as stdout:
+            code = main(['export', str(DSDT), '-o', path, '--no-cache'])
+        self.assertEqual(code, 0)
+        summary = json.loads(stdout.getvalue())
+        self.assertEqual((summary['format'], summary['gzip']), ('ndjson', True))
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(sum(1 for line in lines if '"type": "device"' in line),
+                         len(self.parser.devices))
+
+
+if __name__ == '__main__':
+    unittest.main()
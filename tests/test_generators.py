@@ -0,0 +1,191 @@
+"""Template repository, in-memory rendering and the generator registry"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from types import SimpleNamespace
+
+from core.generators.essential_generators import EssentialGenerators
+from core.generators.manifest import MANIFEST_NAME
+from core.generators.output import write_bundle
+from core.generators.parallel import GenerationSummary, generate_patches
+from core.generators.registry import (REGISTRY, RENDERERS, RegistryError, build_registry,
+                                      generate_patch, render_patch)
+from core.generators.template_repository import TEMPLATES, TemplateRepository
+from core.patch_info import PatchManager
+
+
+def context(**paths):
+    """DSDTContext stand-in with the given detected paths"""
+    roles = ('pci_root', 'lpc_bridge', 'hpet_device', 'gpu_device', 'usb_controller',
+             'smbus', 'gpio_device', 'cpu_path', 'ec_device', 'battery_device')
+    return SimpleNamespace(analyzed=True, **dict(dict.fromkeys(roles), **paths))
+
+
+class TemplateRepositoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ('SSDT-PLUG.dsl', 'SSDT-PLUG-ALT.dsl', 'SSDT-RTC0-RANGE-HEDT.dsl', 'notes.txt'):
+            self.write(name, f'// {name}\n')
+        self.repository = TemplateRepository(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        with open(os.path.join(self.directory, name), 'w') as f:
+            f.write(text)
+
+    def test_index(self):
+        self.assertEqual(self.repository.names(),
+                         ['SSDT-PLUG-ALT.dsl', 'SSDT-PLUG.dsl', 'SSDT-RTC0-RANGE-HEDT.dsl'])
+        self.assertIn('SSDT-PLUG', self.repository)
+        self.assertIn('SSDT-PLUG.dsl', self.repository)
+        self.assertNotIn('notes.txt', self.repository)
+        self.assertEqual(self.repository.with_prefix('SSDT-PLUG'),
+                         ['SSDT-PLUG-ALT.dsl', 'SSDT-PLUG.dsl'])
+
+        # The directory is listed once; later files are not picked up
+        self.write('SSDT-NEW.dsl', '')
+        self.assertNotIn('SSDT-NEW', self.repository)
+        self.assertEqual(len(self.repository), 3)
+
+    def test_get_is_memoized(self):
+        self.assertEqual(self.repository.get('SSDT-PLUG'), '// SSDT-PLUG.dsl\n')
+        os.remove(os.path.join(self.directory, 'SSDT-PLUG.dsl'))
+        self.assertEqual(self.repository.get('SSDT-PLUG.dsl'), '// SSDT-PLUG.dsl\n')
+        self.assertIsNone(self.repository.get('SSDT-MISSING'))
+
+    def test_find_exact_then_prefix(self):
+        self.assertEqual(self.repository.find('SSDT-PLUG'), ('SSDT-PLUG.dsl', '// SSDT-PLUG.dsl\n'))
+        self.assertEqual(self.repository.find('SSDT-RTC0-RANGE')[0], 'SSDT-RTC0-RANGE-HEDT.dsl')
+        self.assertEqual(self.repository.resolve('SSDT-RTC0'), 'SSDT-RTC0-RANGE-HEDT.dsl')
+        self.assertEqual(self.repository.find('SSDT-XOSI'), (None, None))
+        self.assertIsNone(self.repository.resolve('SSDT-XOSI'))
+
+    def test_bundled_templates(self):
+        self.assertGreater(len(TEMPLATES), 100)
+        self.assertEqual(TEMPLATES.load_all(), len(TEMPLATES))
+        self.assertTrue(TEMPLATES.get('SSDT-XOSI').lstrip())
+
+
+class RenderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def test_render_touches_no_files(self):
+        generic = render_patch('SSDT-EC')
+        detected = render_patch('SSDT-EC', context(lpc_bridge='_SB.PC00.LPC0'))
+        self.assertIn('_SB.PCI0.LPCB (generic - not detected)', generic)
+        self.assertIn('_SB.PC00.LPC0 (detected from DSDT)', detected)
+        self.assertEqual(render_patch('SSDT-XOSI'), TEMPLATES.get('SSDT-XOSI'))
+        self.assertIn('Template not found', render_patch('SSDT-CUSTOM'))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_file_sinks_match_render(self):
+        ec = context(lpc_bridge='_SB.PC00.LPC0')
+        path = os.path.join(self.directory, 'SSDT-EC.dsl')
+        self.assertTrue(EssentialGenerators.generate_ec(path, ec))
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), EssentialGenerators.render_ec(ec))
+
+        rendered = {name: render_patch(name, ec) for name in ('SSDT-EC', 'SSDT-XOSI')}
+        bundle = os.path.join(self.directory, 'patches.zip')
+        self.assertEqual(write_bundle(bundle, rendered), 2)
+        with zipfile.ZipFile(bundle) as archive:
+            self.assertEqual({name: archive.read(name).decode() for name in archive.namelist()},
+                             {f'{name}.dsl': text for name, text in rendered.items()})
+
+
+class IncrementalGenerationTest(unittest.TestCase):
+
+    PATCHES = ['SSDT-EC', 'SSDT-HPET', 'SSDT-XOSI']
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def generate(self, dsdt_context):
+        summary = GenerationSummary()
+        for _ in generate_patches(self.PATCHES, self.directory, dsdt_context, workers=2,
+                                  summary=summary):
+            pass
+        return sorted(summary.written), sorted(summary.skipped)
+
+    def mtimes(self):
+        return {name: os.stat(os.path.join(self.directory, f'{name}.dsl')).st_mtime_ns
+                for name in self.PATCHES}
+
+    def test_skips_unchanged_outputs(self):
+        lpc = context(lpc_bridge='_SB.PCI0.LPCB', hpet_device='_SB.PCI0.LPCB.HPET')
+        self.assertEqual(self.generate(lpc), (self.PATCHES, []))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, MANIFEST_NAME)))
+        before = self.mtimes()
+
+        self.assertEqual(self.generate(lpc), ([], self.PATCHES))
+        self.assertEqual(self.mtimes(), before)
+
+        # A changed HPET path rewrites only SSDT-HPET
+        moved = context(lpc_bridge='_SB.PCI0.LPCB', hpet_device='_SB.PCI0.LPCB.HPE0')
+        self.assertEqual(self.generate(moved), (['SSDT-HPET'], ['SSDT-EC', 'SSDT-XOSI']))
+
+    def test_rewrites_modified_file(self):
+        self.generate(None)
+        with open(os.path.join(self.directory, 'SSDT-XOSI.dsl'), 'a') as f:
+            f.write('// edited\n')
+        self.assertEqual(self.generate(None), (['SSDT-XOSI'], ['SSDT-EC', 'SSDT-HPET']))
+        with open(os.path.join(self.directory, 'SSDT-XOSI.dsl'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), render_patch('SSDT-XOSI'))
+
+
+class RegistryTest(unittest.TestCase):
+
+    def test_covers_every_patch(self):
+        names = {patch.name for patch in PatchManager().patches}
+        self.assertEqual(set(REGISTRY), names)
+        for name, entry in REGISTRY.items():
+            self.assertTrue(entry.render(None), name)
+
+    def test_dispatch(self):
+        self.assertIs(REGISTRY['SSDT-EC'].render, RENDERERS['SSDT-EC'])
+        self.assertEqual(REGISTRY['SSDT-EC'].context_inputs, ('lpc_bridge',))
+        self.assertEqual(REGISTRY['SSDT-IMEI'].template, 'SSDT-IMEI-S.dsl')
+        self.assertEqual(REGISTRY['SSDT-RTC0-RANGE'].template, 'SSDT-RTC0-RANGE-HEDT.dsl')
+
+        # Template-only patches are bound to their file once, at import
+        template_only = [entry for name, entry in REGISTRY.items() if name not in RENDERERS]
+        self.assertTrue(template_only)
+        for entry in template_only:
+            if entry.template:
+                self.assertEqual(entry.render(None), TEMPLATES.compiled(entry.template).render(None))
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'SSDT-XOSI.dsl')
+            self.assertTrue(generate_patch('SSDT-XOSI', path, context()))
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), render_patch('SSDT-XOSI'))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_validation(self):
+        patches = PatchManager().patches
+        with self.assertRaises(RegistryError) as raised:
+            build_registry([patch for patch in patches if patch.name != 'SSDT-EC'])
+        self.assertIn('unknown patches SSDT-EC', str(raised.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
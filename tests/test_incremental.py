@@ -0,0 +1,117 @@
+"""refresh() after edits against a full parse of the edited file"""
+
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.acpi_parser import ACPIParser
+
+
+DSDT = Path(__file__).resolve().parent.parent / "dsdt.dsl"
+
+HEADER = 'DefinitionBlock ("", "DSDT", 2, "TEST", "TEST", 0)\n{\n'
+
+PCI0 = ('    Scope (\\_SB)\n'
+        '    {\n'
+        '        Device (PCI0)\n'
+        '        {\n'
+        '            Name (_HID, "PNP0A08")\n'
+        '        }\n'
+        '    }\n\n')
+
+
+def gfx0(*values):
+    """Top-level block declaring \\_SB.PCI0.GFX0 with Name() values"""
+    names = ''.join(f'            Name ({name}, {value})\n' for name, value in values)
+    return ('    Scope (\\_SB.PCI0)\n'
+            '    {\n'
+            '        Device (GFX0)\n'
+            '        {\n'
+            f'{names}'
+            '        }\n'
+            '    }\n\n')
+
+
+def parse_state(parser):
+    """Everything refresh() has to keep equal to a full parse"""
+    nodes = sorted((node.path, node.kind, node.offset, node.hid, node.cid, node.adr)
+                   for node in parser.namespace.nodes.values())
+    return (nodes, [dict(d) for d in parser.devices], [dict(m) for m in parser.methods],
+            [dict(s) for s in parser.scopes], parser.get_device_paths())
+
+
+class RefreshTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'DSDT.dsl')
+        self.parser = None
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def save(self, text):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def check(self, texts):
+        """Parse texts[0], then refresh() after saving each later text"""
+        self.save(texts[0])
+        self.parser = ACPIParser(track_blocks=True)
+        self.assertTrue(self.parser.parse_file(self.path))
+        self.parser.get_device_paths()
+        for number, text in enumerate(texts[1:], 1):
+            self.save(text)
+            summary = self.parser.refresh()
+            self.assertEqual(summary['mode'], 'incremental', f"edit {number}")
+            reference = ACPIParser()
+            reference.parse_file(self.path)
+            self.assertEqual(parse_state(self.parser), parse_state(reference), f"edit {number}")
+
+    def test_repeated_device_values(self):
+        # GFX0 declared twice: the first _ADR in file order wins
+        first = gfx0(('_ADR', '0x00020000'))
+        second = gfx0(('_ADR', '0x00020001'), ('_HID', '"ABCD0001"'))
+        self.check([
+            HEADER + PCI0 + first + second + '}\n',
+            HEADER + PCI0 + gfx0() + second + '}\n',
+            HEADER + PCI0 + second + '}\n',
+            HEADER + PCI0 + first + second + '}\n',
+            HEADER + PCI0 + gfx0(('_HID', '"PNP0A03"')) + second + '}\n',
+        ])
+
+    def test_values_named_in_a_scope(self):
+        # Scope(GFX0) values count only after GFX0 is declared as a Device
+        scope = ('    Scope (\\_SB.PCI0.GFX0)\n'
+                 '    {\n'
+                 '        Name (_ADR, 0x00020002)\n'
+                 '    }\n\n')
+        self.check([
+            HEADER + PCI0 + scope + gfx0() + '}\n',
+            HEADER + PCI0 + gfx0() + scope + '}\n',
+            HEADER + PCI0 + gfx0() + scope + gfx0(('_ADR', 'One')) + '}\n',
+            HEADER + PCI0 + scope + gfx0(('_ADR', 'One')) + '}\n',
+        ])
+
+    def test_bundled_dsdt(self):
+        with open(DSDT, encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        tops = [match.start() for match in re.finditer(r'(?m)^    Scope \(', content)]
+        duplicate = gfx0(('_ADR', '0x00020009'), ('_HID', '"ABCD0002"'))
+        texts = [content]
+        # Duplicate GFX0 blocks at the start, middle and end, then removed again
+        for position in reversed((tops[0], tops[len(tops) // 2], tops[-1])):
+            content = content[:position] + duplicate + content[position:]
+            texts.append(content)
+        while duplicate in content:
+            content = content.replace(duplicate, '', 1)
+            texts.append(content)
+        texts.append(content.replace('Name (_ADR, 0x00020000)', 'Name (_ADR, 0x00020001)', 1))
+        self.check(texts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Parse cache round trips and invalidation"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.acpi_parser import ACPIParser
+from core.parse_cache import ParseCache
+
+
+TABLE = ('DefinitionBlock ("", "DSDT", 2, "TEST", "TEST", 0)\n'
+         '{\n'
+         '    Scope (\\_SB)\n'
+         '    {\n'
+         '        Device (PCI0)\n'
+         '        {\n'
+         '            Name (_HID, EisaId ("PNP0A08"))\n'
+         '            Device (GFX0)\n'
+         '            {\n'
+         '                Name (_ADR, 0x00020000)\n'
+         '                Method (_DSM, 4, NotSerialized)\n'
+         '                {\n'
+         '                }\n'
+         '            }\n'
+         '        }\n'
+         '    }\n'
+         '    Scope (\\_PR)\n'
+         '    {\n'
+         '        Processor (CPU0, 0x01, 0x00001810, 0x06) {}\n'
+         '    }\n'
+         '}\n')
+
+
+def results(parser):
+    """Everything a cache hit has to restore"""
+    return ([dict(d) for d in parser.devices], [dict(m) for m in parser.methods],
+            [dict(s) for s in parser.scopes], [dict(p) for p in parser.processors],
+            parser.namespace.to_rows(), parser.get_device_paths())
+
+
+class ParseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'DSDT.dsl')
+        self.cache = ParseCache(os.path.join(self.directory, 'cache'))
+        self.save(TABLE)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def save(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def cached_parse(self):
+        parser = ACPIParser()
+        self.assertTrue(self.cache.parse_file(parser, self.path))
+        return parser
+
+    def test_round_trip(self):
+        reference = ACPIParser()
+        reference.parse_file(self.path)
+
+        first = self.cached_parse()
+        second = self.cached_parse()
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+        self.assertEqual(second.stats.counters.get('cache_hits'), 1)
+        self.assertEqual(results(first), results(reference))
+        self.assertEqual(results(second), results(reference))
+        self.assertEqual(second.get_device_paths()['gpu_device'], '_SB.PCI0.GFX0')
+
+    def test_changed_content_misses(self):
+        self.cached_parse()
+        self.save(TABLE.replace('GFX0', 'IGPU'))
+        parser = self.cached_parse()
+        self.assertEqual((self.cache.misses, self.cache.hits), (2, 0))
+        self.assertEqual(parser.get_device_paths()['gpu_device'], '_SB.PCI0.IGPU')
+        self.assertEqual(self.cache.get_size()[0], 2)
+
+        # The original content still hits its own entry
+        self.save(TABLE)
+        self.assertEqual(self.cached_parse().get_device_paths()['gpu_device'], '_SB.PCI0.GFX0')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_unreadable_entry_is_discarded(self):
+        self.cached_parse()
+        with open(self.cache._entry_path(self.cache.key_for(self.path)), 'wb') as f:
+            f.write(b'not marshal data')
+        parser = self.cached_parse()
+        self.assertEqual((self.cache.misses, self.cache.hits), (2, 0))
+        self.assertEqual(results(parser)[0], results(self.cached_parse())[0])
+        self.assertEqual(self.cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
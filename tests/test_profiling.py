@@ -0,0 +1,71 @@
+"""Profiles of a block and the threads it starts"""
+
+import io
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+from core import profiling
+from core.profiling import Profiler
+
+
+def threaded_work():
+    return sum(range(1000))
+
+
+def main_work():
+    return sorted(range(1000), reverse=True)
+
+
+def function_names(path):
+    return {name for _, _, name in pstats.Stats(str(path)).stats}
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_merges_finished_threads(self):
+        with Profiler('test', None, self.directory) as profiler:
+            main_work()
+            thread = threading.Thread(target=threaded_work)
+            thread.start()
+            thread.join()
+
+        stats_path, collapsed_path = profiler.paths
+        self.assertEqual(stats_path.name, 'test-none.pstats')
+        self.assertTrue(collapsed_path.exists())
+        names = function_names(stats_path)
+        self.assertIn('main_work', names)
+        self.assertIn('threaded_work', names)
+
+    @unittest.skipIf(sys.version_info >= (3, 12), "one profiler sees every thread")
+    def test_skips_running_threads(self):
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait, name='still-busy')
+        stderr = io.StringIO()
+        try:
+            with mock.patch.object(profiling, 'THREAD_JOIN_TIMEOUT', 0.05), \
+                    redirect_stderr(stderr):
+                with Profiler('test', None, self.directory) as profiler:
+                    main_work()
+                    thread.start()
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertIn('skipped thread still-busy', stderr.getvalue())
+        self.assertIn('main_work', function_names(profiler.paths[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Merging a DSDT and its SSDTs into one namespace"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.table_set import TableSet
+
+
+HEADER = 'DefinitionBlock ("", "{signature}", 2, "TEST", "TEST", 0)\n{{\n'
+
+
+def table(body, signature='DSDT'):
+    """DSL text of a table with the given body"""
+    return HEADER.format(signature=signature) + body + '}\n'
+
+
+class TableSetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def load(self):
+        return TableSet(workers=1, use_cache=False).load(self.directory)
+
+    def test_merge_and_provenance(self):
+        self.write('DSDT.dsl', table(
+            '    Scope (\\_SB)\n'
+            '    {\n'
+            '        Device (PCI0)\n'
+            '        {\n'
+            '            Name (_HID, EisaId ("PNP0A08"))\n'
+            '        }\n'
+            '    }\n'))
+        self.write('SSDT-1.dsl', table(
+            '    External (\\_SB.PCI0, DeviceObj)\n'
+            '    Scope (\\_SB.PCI0)\n'
+            '    {\n'
+            '        Device (GFX0)\n'
+            '        {\n'
+            '            Name (_ADR, 0x00020000)\n'
+            '            Method (_DSM, 4, NotSerialized)\n'
+            '            {\n'
+            '            }\n'
+            '        }\n'
+            '    }\n', 'SSDT'))
+        parser = self.load()
+
+        self.assertEqual([(d['path'], d['table']) for d in parser.devices],
+                         [('\\_SB.PCI0', 'DSDT'), ('\\_SB.PCI0.GFX0', 'SSDT-1')])
+        self.assertEqual([(m['name'], m['table']) for m in parser.methods], [('_DSM', 'SSDT-1')])
+        self.assertEqual([(s['path'], s['table']) for s in parser.scopes],
+                         [('\\_SB', 'DSDT'), ('\\_SB.PCI0', 'SSDT-1')])
+        self.assertEqual([t['table'] for t in parser.tables], ['DSDT', 'SSDT-1'])
+
+        # Each node names the table that declared it, not one that referenced it
+        self.assertEqual(parser.namespace.get('\\_SB.PCI0').table, 'DSDT')
+        self.assertEqual(parser.namespace.get('\\_SB.PCI0.GFX0').table, 'SSDT-1')
+        self.assertEqual(parser.namespace.get('\\_SB.PCI0.GFX0._DSM').table, 'SSDT-1')
+        self.assertEqual(parser.namespace.get('\\_SB.PCI0.GFX0').adr, '0x00020000')
+        self.assertEqual(parser.get_device_paths()['gpu_device'], '_SB.PCI0.GFX0')
+
+    def test_prefers_earlier_table(self):
+        # The SSDT's EC0 has the smaller offset, but the DSDT loads first
+        self.write('DSDT.dsl', table(
+            '    External (\\_SB.PCI0.XHC, DeviceObj)\n'
+            '    Name (PAD0, Zero)\n'
+            '    Name (PAD1, Zero)\n'
+            '    Name (PAD2, Zero)\n'
+            '    Name (PAD3, Zero)\n'
+            '    Device (\\_SB.ECX)\n'
+            '    {\n'
+            '        Name (_HID, EisaId ("PNP0C09"))\n'
+            '    }\n'))
+        self.write('SSDT-1.dsl', table(
+            '    Device (\\_SB.EC0)\n'
+            '    {\n'
+            '        Name (_HID, EisaId ("PNP0C09"))\n'
+            '    }\n', 'SSDT'))
+        parser = self.load()
+        self.assertEqual(parser.get_device_paths()['ec_device'], '_SB.ECX')
+
+        # Referencing a path does not make the table its provenance
+        self.assertIsNone(parser.namespace.get('\\_SB.PCI0.XHC').table)
+        self.assertEqual(parser.namespace.get('\\_SB.EC0').table, 'SSDT-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
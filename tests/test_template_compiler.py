@@ -0,0 +1,71 @@
+"""Template path placeholders and their fallback roles"""
+
+import threading
+import unittest
+from types import SimpleNamespace
+
+from core.generators.registry import render_patch
+from core.generators.template_compiler import compile_template
+from core.generators.template_repository import TEMPLATES
+from gui.tabs.manual_tab import ManualTab
+
+
+TEMPLATE = ('External (_SB_.PCI0.LPCB.HPET, DeviceObj)\n'
+            'If (CondRefOf (\\_SB.PCI0.LPCB.HPET))\n'
+            'Scope (_SB.PCI0.LPCB)\n')
+
+
+def context(**paths):
+    """DSDTContext stand-in with the given detected paths"""
+    roles = ('pci_root', 'lpc_bridge', 'hpet_device', 'gpu_device', 'usb_controller',
+             'smbus', 'gpio_device', 'cpu_path', 'ec_device', 'battery_device')
+    return SimpleNamespace(**dict(dict.fromkeys(roles), **paths))
+
+
+class TemplateCompilerTest(unittest.TestCase):
+
+    def test_detected_role(self):
+        text = compile_template(TEMPLATE).render(context(
+            pci_root='_SB.PC00', lpc_bridge='_SB.PC00.LPC0', hpet_device='_SB.PC00.LPC0.HPE0'))
+        self.assertEqual(text, 'External (_SB_.PC00.LPC0.HPE0, DeviceObj)\n'
+                               'If (CondRefOf (\\_SB.PC00.LPC0.HPE0))\n'
+                               'Scope (_SB.PC00.LPC0)\n')
+
+    def test_falls_back_to_longest_detected_prefix(self):
+        # No HPET: the LPC bridge path replaces the prefix, HPET is kept
+        text = compile_template(TEMPLATE).render(context(
+            pci_root='_SB.PC00', lpc_bridge='_SB.PC00.LPC0'))
+        self.assertEqual(text, 'External (_SB_.PC00.LPC0.HPET, DeviceObj)\n'
+                               'If (CondRefOf (\\_SB.PC00.LPC0.HPET))\n'
+                               'Scope (_SB.PC00.LPC0)\n')
+
+        text = compile_template(TEMPLATE).render(context(pci_root='_SB.PC00'))
+        self.assertIn('CondRefOf (\\_SB.PC00.LPCB.HPET)', text)
+
+    def test_nothing_detected(self):
+        self.assertEqual(compile_template(TEMPLATE).render(context()), TEMPLATE)
+
+
+class ManualTemplateTest(unittest.TestCase):
+    """The Manual tab shows compiled templates, not generator output"""
+
+    def content(self, name, dsdt_context=None):
+        tab = SimpleNamespace(main_app=SimpleNamespace(parser_lock=threading.RLock(),
+                                                       dsdt_context=dsdt_context))
+        return ManualTab.get_template_content(tab, name)
+
+    def test_generator_patches_show_their_template(self):
+        self.assertEqual(self.content('SSDT-EC'), TEMPLATES.get('SSDT-EC'))
+        self.assertNotEqual(self.content('SSDT-EC'), render_patch('SSDT-EC'))
+        self.assertEqual(self.content('SSDT-IMEI'), TEMPLATES.get('SSDT-IMEI'))
+
+    def test_detected_paths_filled_in(self):
+        detected = context(pci_root='_SB.PC00', lpc_bridge='_SB.PC00.LPC0')
+        self.assertEqual(self.content('SSDT-EC', detected),
+                         TEMPLATES.compiled('SSDT-EC').render(detected))
+        self.assertIn('_SB.PC00.LPC0', self.content('SSDT-EC', detected))
+        self.assertIn('Template not found', self.content('SSDT-CUSTOM'))
+
+
+if __name__ == '__main__':
+    unittest.main()